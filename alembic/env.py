@@ -3,6 +3,7 @@ from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from database.models import Base
+from config.config import Config
 from alembic import context
 
 # this is the Alembic Config object, which provides
@@ -14,6 +15,9 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# The bot and the migrations read the same DATABASE_URL
+config.set_main_option("sqlalchemy.url", Config.SQLALCHEMY_DATABASE_URL.replace("%", "%%"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
@@ -0,0 +1,126 @@
+"""initial schema
+
+Baseline of the tables as they existed before migrations were tracked.
+Existing databases should be stamped with `alembic stamp 0001` instead of
+running this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+        sa.Column('first_name', sa.String(length=100), nullable=False),
+        sa.Column('last_name', sa.String(length=100), nullable=True),
+        sa.Column('username', sa.String(length=100), nullable=True),
+        sa.Column('language_code', sa.String(length=10), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_activity', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_telegram_id', 'users', ['telegram_id'], unique=True)
+
+    op.create_table(
+        'words',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('word', sa.String(length=100), nullable=False),
+        sa.Column('translation', sa.String(length=100), nullable=False),
+        sa.Column('synonym', sa.String(length=100), nullable=True),
+        sa.Column('example_usage', sa.Text(), nullable=True),
+        sa.Column('added_at', sa.DateTime(), nullable=True),
+        sa.Column('last_practiced', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_words_id', 'words', ['id'], unique=False)
+
+    op.create_table(
+        'user_settings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('practice_interval', sa.Integer(), nullable=True),
+        sa.Column('last_practice_time', sa.DateTime(), nullable=True),
+        sa.Column('notifications_enabled', sa.Boolean(), nullable=True),
+        sa.Column('last_word_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['last_word_id'], ['words.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id')
+    )
+    op.create_index('ix_user_settings_id', 'user_settings', ['id'], unique=False)
+
+    op.create_table(
+        'practice_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('word_id', sa.Integer(), nullable=True),
+        sa.Column('user_sentence', sa.Text(), nullable=True),
+        sa.Column('ai_feedback', sa.Text(), nullable=True),
+        sa.Column('is_correct', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['word_id'], ['words.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_practice_sessions_id', 'practice_sessions', ['id'], unique=False)
+
+    op.create_table(
+        'user_statistics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('words_added', sa.Integer(), nullable=True),
+        sa.Column('correct_sentences', sa.Integer(), nullable=True),
+        sa.Column('total_sentences', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_statistics_id', 'user_statistics', ['id'], unique=False)
+
+    op.create_table(
+        'teacher_students',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['student_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['teacher_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_teacher_students_id', 'teacher_students', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_teacher_students_id', table_name='teacher_students')
+    op.drop_table('teacher_students')
+    op.drop_index('ix_user_statistics_id', table_name='user_statistics')
+    op.drop_table('user_statistics')
+    op.drop_index('ix_practice_sessions_id', table_name='practice_sessions')
+    op.drop_table('practice_sessions')
+    op.drop_index('ix_user_settings_id', table_name='user_settings')
+    op.drop_table('user_settings')
+    op.drop_index('ix_words_id', table_name='words')
+    op.drop_table('words')
+    op.drop_index('ix_users_telegram_id', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_table('users')
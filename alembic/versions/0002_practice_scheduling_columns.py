@@ -0,0 +1,42 @@
+"""spaced repetition, reminder and daily counter columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant/stable defaults: on Postgres 11+ these are metadata-only changes, no table rewrite
+    op.add_column('words', sa.Column('due_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.add_column('words', sa.Column('ease', sa.Float(), server_default='2.5', nullable=False))
+    op.add_column('words', sa.Column('interval_days', sa.Float(), server_default='0', nullable=False))
+    op.add_column('words', sa.Column('repetitions', sa.Integer(), server_default='0', nullable=False))
+
+    op.add_column('user_settings', sa.Column('next_reminder_at', sa.DateTime(), nullable=True))
+
+    # Nothing wrote user_statistics before the daily counters, so this is quick on existing databases
+    op.create_unique_constraint('uq_user_statistics_user_id_date', 'user_statistics', ['user_id', 'date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_user_statistics_user_id_date', 'user_statistics', type_='unique')
+    op.drop_column('user_settings', 'next_reminder_at')
+    op.drop_column('words', 'repetitions')
+    op.drop_column('words', 'interval_days')
+    op.drop_column('words', 'ease')
+    op.drop_column('words', 'due_at')
@@ -0,0 +1,66 @@
+"""indexes for hot queries
+
+All indexes are built with CREATE INDEX CONCURRENTLY so large tables keep
+serving reads and writes while they build. CONCURRENTLY cannot run inside a
+transaction, hence the autocommit block. If a build is interrupted Postgres
+leaves an INVALID index behind; drop it and run the upgrade again.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    # /my_words pages and the import de-duplication: (word, id) keyset order per user
+    ('ix_words_user_id_word', 'words', 'user_id, word, id', False),
+    # next due word for practice and reminders
+    ('ix_words_user_id_due_at', 'words', 'user_id, due_at', False),
+    # per-user history: recent sessions, exports, rollups
+    ('ix_practice_sessions_user_id_created_at', 'practice_sessions', 'user_id, created_at', False),
+    ('ix_users_username', 'users', 'username', False),
+    ('ix_user_settings_next_reminder_at', 'user_settings', 'next_reminder_at', False),
+    ('uq_teacher_students_teacher_id_student_id', 'teacher_students', 'teacher_id, student_id', True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # add_teacher never checked for existing links; keep the oldest row of each pair
+    op.execute(
+        "DELETE FROM teacher_students a USING teacher_students b "
+        "WHERE a.teacher_id = b.teacher_id AND a.student_id = b.student_id AND a.id > b.id"
+    )
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.execute(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} ({columns})"
+            )
+
+    # Promoting an existing unique index to a constraint only takes a brief lock
+    op.execute(
+        "ALTER TABLE teacher_students ADD CONSTRAINT uq_teacher_students_teacher_id_student_id "
+        "UNIQUE USING INDEX uq_teacher_students_teacher_id_student_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_teacher_students_teacher_id_student_id', 'teacher_students', type_='unique')
+    with op.get_context().autocommit_block():
+        for name, _, _, unique in INDEXES:
+            if not unique:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,121 @@
+"""partition practice_sessions by month
+
+Rebuilds practice_sessions as a table range-partitioned on created_at with one
+partition per month. The primary key becomes (id, created_at) because Postgres
+requires the partition key in every unique constraint; ids still come from the
+original sequence. Future partitions are created and
+old ones archived by bot/services/partitions.py. In offline (--sql) mode the
+existing rows can't be inspected, so everything before the current month goes
+into a single practice_sessions_history partition. Partition maintenance archives
+it like a monthly one once its newest row falls out of the retention window.
+
+Run this in a maintenance window with the bot stopped. All rows are copied in one
+statement inside the migration transaction, which holds a lock on
+practice_sessions and needs room for a second copy of the table until it commits.
+Practice writes would block for the whole copy, and the copy takes longer as the
+table grows.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    today = date.today()
+    current = date(today.year, today.month, 1)
+    if context.is_offline_mode():
+        # The data can't be inspected when generating SQL; older rows go to one catch-all partition
+        oldest = None
+    else:
+        oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM practice_sessions")).scalar()
+    month = min(date(oldest.year, oldest.month, 1), current) if oldest else current
+    last = add_months(current, MONTHS_AHEAD)
+
+    op.execute("ALTER SEQUENCE practice_sessions_id_seq OWNED BY NONE")
+    op.execute(
+        "CREATE TABLE practice_sessions_partitioned ("
+        "id INTEGER NOT NULL DEFAULT nextval('practice_sessions_id_seq'), "
+        "user_id INTEGER CONSTRAINT practice_sessions_user_id_fkey REFERENCES users (id), "
+        "word_id INTEGER CONSTRAINT practice_sessions_word_id_fkey REFERENCES words (id), "
+        "user_sentence TEXT, "
+        "ai_feedback TEXT, "
+        "is_correct BOOLEAN, "
+        "created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()"
+        ") PARTITION BY RANGE (created_at)"
+    )
+    if context.is_offline_mode():
+        op.execute(
+            "CREATE TABLE practice_sessions_history PARTITION OF practice_sessions_partitioned "
+            f"FOR VALUES FROM (MINVALUE) TO ('{current.isoformat()}')"
+        )
+    while month <= last:
+        upper = add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE practice_sessions_p{month:%Y_%m} PARTITION OF practice_sessions_partitioned "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+
+    # One long statement: see the module docstring about the maintenance window
+    op.execute(
+        "INSERT INTO practice_sessions_partitioned "
+        "SELECT id, user_id, word_id, user_sentence, ai_feedback, is_correct, COALESCE(created_at, now()) "
+        "FROM practice_sessions"
+    )
+    op.execute("DROP TABLE practice_sessions")
+    op.execute("ALTER TABLE practice_sessions_partitioned RENAME TO practice_sessions")
+    op.execute("ALTER SEQUENCE practice_sessions_id_seq OWNED BY practice_sessions.id")
+
+    # Declared on the parent, built on every partition and inherited by new ones
+    op.execute("ALTER TABLE practice_sessions ADD CONSTRAINT practice_sessions_pkey PRIMARY KEY (id, created_at)")
+    op.execute("CREATE INDEX ix_practice_sessions_user_id_created_at ON practice_sessions (user_id, created_at)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER SEQUENCE practice_sessions_id_seq OWNED BY NONE")
+    op.execute(
+        "CREATE TABLE practice_sessions_plain ("
+        "id INTEGER NOT NULL DEFAULT nextval('practice_sessions_id_seq'), "
+        "user_id INTEGER CONSTRAINT practice_sessions_user_id_fkey REFERENCES users (id), "
+        "word_id INTEGER CONSTRAINT practice_sessions_word_id_fkey REFERENCES words (id), "
+        "user_sentence TEXT, "
+        "ai_feedback TEXT, "
+        "is_correct BOOLEAN, "
+        "created_at TIMESTAMP WITHOUT TIME ZONE"
+        ")"
+    )
+    op.execute(
+        "INSERT INTO practice_sessions_plain "
+        "SELECT id, user_id, word_id, user_sentence, ai_feedback, is_correct, created_at FROM practice_sessions"
+    )
+    op.execute("DROP TABLE practice_sessions")
+    op.execute("ALTER TABLE practice_sessions_plain RENAME TO practice_sessions")
+    op.execute("ALTER SEQUENCE practice_sessions_id_seq OWNED BY practice_sessions.id")
+    op.execute("ALTER TABLE practice_sessions ADD CONSTRAINT practice_sessions_pkey PRIMARY KEY (id)")
+    op.create_index('ix_practice_sessions_id', 'practice_sessions', ['id'], unique=False)
+    op.create_index(
+        'ix_practice_sessions_user_id_created_at', 'practice_sessions', ['user_id', 'created_at'], unique=False
+    )
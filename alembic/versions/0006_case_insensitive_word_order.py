@@ -0,0 +1,41 @@
+"""case-insensitive word order
+
+/my_words pages, the A-Z jump and exports order words by (lower(word), id), so
+capitalized words sort among the lowercase ones whatever the database collation.
+The expression index replaces ix_words_user_id_word. Both are built and dropped
+CONCURRENTLY outside a transaction; if the build is interrupted, drop the
+INVALID index and run the upgrade again.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_words_user_id_lower_word "
+            "ON words (user_id, lower(word), id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_words_user_id_word")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_words_user_id_word ON words (user_id, word, id)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_words_user_id_lower_word")
@@ -0,0 +1,78 @@
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter, defaultdict, deque
+from telegram.request import BaseRequest, RequestData
+
+BOT_USER = {"id": 1000000001, "is_bot": True, "first_name": "Load Test Bot", "username": "load_test_bot"}
+
+# Bot API methods that return the Message they sent or edited
+MESSAGE_METHODS = {"sendMessage", "editMessageText", "editMessageReplyMarkup", "sendDocument", "sendPhoto"}
+
+
+class FakeTelegramRequest(BaseRequest):
+    """Offline Bot API transport: every call is answered locally after `latency` seconds.
+
+    Passed to `build_application(request=...)`, so handlers, the dispatcher and PTB's own
+    serialization run unchanged. Texts sent to each chat are kept (the last `history` of them)
+    for the load generator to read, and calls are counted per method.
+    """
+
+    def __init__(self, latency: float = 0.0, history: int = 20):
+        self.latency = latency
+        self.calls = Counter()
+        self.sent: dict[int, deque] = defaultdict(lambda: deque(maxlen=history))
+        self.sent_total = Counter()
+        self._message_ids = itertools.count(1)
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: RequestData = None,
+        read_timeout=None,
+        write_timeout=None,
+        connect_timeout=None,
+        pool_timeout=None
+    ) -> tuple[int, bytes]:
+        endpoint = url.rsplit("/", 1)[-1]
+        self.calls[endpoint] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        parameters = request_data.parameters if request_data else {}
+        result = self._result(endpoint, parameters)
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+    def _result(self, endpoint: str, parameters: dict):
+        if endpoint == "getMe":
+            return BOT_USER
+        if endpoint not in MESSAGE_METHODS or "chat_id" not in parameters:
+            return True
+
+        chat_id = int(parameters["chat_id"])
+        text = parameters.get("text") or parameters.get("caption") or ""
+        self.sent[chat_id].append(text)
+        self.sent_total[chat_id] += 1
+        return {
+            "message_id": int(parameters.get("message_id") or next(self._message_ids)),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+            "text": text
+        }
+
+    def last_text(self, chat_id: int) -> str:
+        sent = self.sent.get(chat_id)
+        return sent[-1] if sent else ""
+
+    def replies_since(self, chat_id: int, count: int) -> list[str]:
+        """Texts sent to `chat_id` after it had received `count` messages in total."""
+        new = self.sent_total[chat_id] - count
+        return list(self.sent[chat_id])[-new:] if new > 0 else []
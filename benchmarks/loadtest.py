@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from sqlalchemy import event
+from telegram import Update
+from config.config import Config
+from benchmarks.fake_telegram import FakeTelegramRequest
+from benchmarks.seed import delete_users
+from benchmarks.stub_openai import StubOpenAIServer
+
+logger = logging.getLogger(__name__)
+
+VOCABULARY = [
+    ("apple", "яблуко"), ("river", "річка"), ("mountain", "гора"), ("window", "вікно"), ("garden", "сад"),
+    ("teacher", "вчитель"), ("journey", "подорож"), ("market", "ринок"), ("bridge", "міст"), ("letter", "лист"),
+    ("weather", "погода"), ("kitchen", "кухня"), ("holiday", "відпустка"), ("island", "острів"), ("library", "бібліотека"),
+    ("friend", "друг"), ("morning", "ранок"), ("station", "станція"), ("picture", "малюнок"), ("forest", "ліс"),
+    ("answer", "відповідь"), ("question", "питання"), ("village", "село"), ("winter", "зима"), ("doctor", "лікар"),
+    ("breakfast", "сніданок"), ("umbrella", "парасолька"), ("ticket", "квиток"), ("language", "мова"), ("kettle", "чайник")
+]
+SENTENCES = [
+    "I saw the {word} on my way home yesterday.",
+    "My sister told me about the {word} last week.",
+    "We talked about the {word} during dinner.",
+    "There is a {word} near the old school.",
+    "She always remembers the {word} from her childhood."
+]
+PRACTICE_WORD_RE = re.compile(r"Practice word:\* (.+)")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class LoadTest:
+    """Virtual users driving the real Application through /start, /add_word, /my_words and
+    /practice + answer rounds, with per-handler latencies measured around process_update.
+
+    Only the bot's Postgres database is real: Telegram is replaced by FakeTelegramRequest and
+    OpenAI by StubOpenAIServer, so a run needs no network access.
+    """
+
+    def __init__(self, application, telegram: FakeTelegramRequest, args):
+        self.application = application
+        self.telegram = telegram
+        self.args = args
+        self.random = random.Random(args.seed)
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors = Counter()
+        self.updates = 0
+
+    def _update(self, user: dict, text: str) -> Update:
+        message = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": user["id"], "type": "private"},
+            "from": user,
+            "text": text
+        }
+        if text.startswith("/"):
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return Update.de_json({"update_id": next(self._update_ids), "message": message}, self.application.bot)
+
+    async def send(self, user: dict, action: str, text: str) -> list[str]:
+        """Process one update as Telegram would deliver it and return the bot's replies."""
+        before = self.telegram.sent_total[user["id"]]
+        start = time.perf_counter()
+        try:
+            await self.application.process_update(self._update(user, text))
+        except Exception as e:
+            self.errors[action] += 1
+            logger.error("%s failed: %s", action, str(e))
+        self.latencies[action].append(time.perf_counter() - start)
+        self.updates += 1
+
+        replies = self.telegram.replies_since(user["id"], before)
+        if any(reply.startswith("❌") for reply in replies):
+            self.errors[action] += 1
+        if self.args.think_time:
+            await asyncio.sleep(self.random.expovariate(1 / self.args.think_time))
+        return replies
+
+    async def virtual_user(self, index: int) -> None:
+        user = {
+            "id": self.args.user_id_base + index,
+            "is_bot": False,
+            "first_name": f"Load{index}",
+            "username": f"load_user_{index}",
+            "language_code": "en"
+        }
+        await self.send(user, "start", "/start")
+        for word, translation in self.random.sample(VOCABULARY, self.args.words):
+            await self.send(user, "add_word", f"/add_word {word} | {translation}")
+        await self.send(user, "my_words", "/my_words")
+
+        for _ in range(self.args.rounds):
+            replies = await self.send(user, "practice", "/practice")
+            words = [match.group(1).strip() for match in map(PRACTICE_WORD_RE.search, replies) if match]
+            if not words:
+                continue
+            await self.send(user, "answer", self.random.choice(SENTENCES).format(word=words[-1]))
+
+    async def run(self) -> float:
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+
+        async def limited(index: int) -> None:
+            async with semaphore:
+                await self.virtual_user(index)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(limited(index) for index in range(self.args.users)))
+        return time.perf_counter() - start
+
+
+class PoolMonitor:
+    """Samples how many pooled connections are checked out and counts new physical connections."""
+
+    def __init__(self, engine, interval: float = 0.05):
+        self.engine = engine
+        self.interval = interval
+        self.peak_checked_out = 0
+        self.opened = 0
+        self._task = None
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.opened += 1
+
+    async def _sample(self) -> None:
+        pool = self.engine.sync_engine.pool
+        while True:
+            self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        event.listen(self.engine.sync_engine, "connect", self._on_connect)
+        self._task = asyncio.create_task(self._sample())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        event.remove(self.engine.sync_engine, "connect", self._on_connect)
+
+
+def report(test: LoadTest, elapsed: float, telegram: FakeTelegramRequest, ai: StubOpenAIServer, pool: PoolMonitor) -> dict:
+    handlers = {}
+    for action, values in test.latencies.items():
+        handlers[action] = {
+            "count": len(values),
+            "errors": test.errors[action],
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+            "max_ms": round(max(values) * 1000, 1)
+        }
+    return {
+        "users": test.args.users,
+        "concurrency": test.args.concurrency,
+        "updates": test.updates,
+        "elapsed_s": round(elapsed, 2),
+        "updates_per_s": round(test.updates / elapsed, 1) if elapsed else 0,
+        "handlers": handlers,
+        "db": {
+            "pool_size": Config.DB_POOL_SIZE,
+            "max_overflow": Config.DB_MAX_OVERFLOW,
+            "peak_checked_out": pool.peak_checked_out,
+            "connections_opened": pool.opened
+        },
+        "telegram_calls": dict(telegram.calls),
+        "openai": ai.stats()
+    }
+
+
+def print_report(result: dict) -> None:
+    print(
+        f"\n{result['updates']} updates from {result['users']} users in {result['elapsed_s']}s "
+        f"-> {result['updates_per_s']} updates/s (concurrency {result['concurrency']})\n"
+    )
+    print(f"{'handler':12} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for action, row in result["handlers"].items():
+        print(
+            f"{action:12} {row['count']:>7} {row['errors']:>7} {row['p50_ms']:>9} "
+            f"{row['p95_ms']:>9} {row['p99_ms']:>9} {row['max_ms']:>9}"
+        )
+    db = result["db"]
+    print(
+        f"\nDB: peak {db['peak_checked_out']} connections checked out "
+        f"(pool {db['pool_size']} + overflow {db['max_overflow']}), {db['connections_opened']} opened"
+    )
+    print("Telegram calls:", result["telegram_calls"])
+    print("OpenAI stub:", result["openai"])
+
+
+async def run(args) -> dict:
+    ai = StubOpenAIServer(args.ai_latency, args.ai_jitter, args.ai_error_rate, args.ai_rate_limit_rate, seed=args.seed)
+    os.environ["OPENAI_BASE_URL"] = await ai.start()
+    os.environ.setdefault("OPENAI_API_KEY", "load-test")
+    # Measure the bot, not the caches or periodic jobs
+    Config.AI_CACHE_ENABLED = False
+    Config.RUN_JOBS = args.with_jobs
+    Config.TELEGRAM_BOT_TOKEN = Config.TELEGRAM_BOT_TOKEN or "1000000001:load-test"
+
+    from main import build_application
+    from bot.webhook import start_application, stop_application
+    from database import async_engine
+
+    telegram = FakeTelegramRequest(latency=args.telegram_latency)
+    application = build_application(request=telegram)
+    await start_application(application)
+    pool = PoolMonitor(async_engine)
+    pool.start()
+
+    test = LoadTest(application, telegram, args)
+    try:
+        elapsed = await test.run()
+    finally:
+        await pool.stop()
+        await stop_application(application)
+        await ai.stop()
+        if not args.keep_data:
+            await delete_users(args.user_id_base, args.user_id_base + args.users - 1)
+    return report(test, elapsed, telegram, ai, pool)
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.loadtest --users 2000 --concurrency 200 --rounds 5 --ai-latency 1.2
+    # Needs the migrated bot database; virtual users' rows are deleted afterwards unless --keep-data
+    parser = argparse.ArgumentParser(description="Offline end-to-end load test of the bot")
+    parser.add_argument("--users", type=int, default=1000, help="virtual users, each runs the whole script once")
+    parser.add_argument("--concurrency", type=int, default=100, help="virtual users active at the same time")
+    parser.add_argument("--words", type=int, default=5, help="words each user adds")
+    parser.add_argument("--rounds", type=int, default=3, help="/practice + answer rounds per user")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between a user's messages (s)")
+    parser.add_argument("--ai-latency", type=float, default=0.8)
+    parser.add_argument("--ai-jitter", type=float, default=0.3)
+    parser.add_argument("--ai-error-rate", type=float, default=0.0)
+    parser.add_argument("--ai-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--telegram-latency", type=float, default=0.02, help="simulated Bot API round trip (s)")
+    parser.add_argument("--user-id-base", type=int, default=9_000_000_000)
+    parser.add_argument("--with-jobs", action="store_true", help="also run reminders, rollups and maintenance")
+    parser.add_argument("--keep-data", action="store_true", help="leave the virtual users' rows in the database")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="also write the report as JSON to this file")
+    args = parser.parse_args()
+    args.words = min(args.words, len(VOCABULARY))
+
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.WARNING)
+    result = asyncio.run(run(args))
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(result, stream, indent=2, ensure_ascii=False)
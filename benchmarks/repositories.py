@@ -0,0 +1,382 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Awaitable, Callable
+from sqlalchemy import func, select, text
+from config.config import Config
+from database.models import TeacherStudent, User, Word
+from database.repositories import TeacherRepository, UserRepository, UserSettingsRepository, WordRepository
+from database.unit_of_work import current_session, current_uow, unit_of_work
+
+logger = logging.getLogger(__name__)
+
+# Timings depend on the machine and the seeded dataset, so no baseline is committed: save one with
+# --save-baseline on the reference machine before comparing runs against it
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "repositories.json")
+
+
+@dataclass
+class Sample:
+    """A seeded user the benchmarks run against."""
+    id: int
+    telegram_id: int
+    first_name: str
+    username: str | None
+    word_id: int
+    teacher_id: int | None
+
+
+# A case gets (sample, samples) inside a unit of work, does any untimed setup, and returns the
+# call to time. Everything runs in a transaction that is rolled back, so writes don't accumulate.
+Case = Callable[[Sample, list[Sample]], Awaitable[Callable[[], Awaitable]]]
+CASES: dict[str, Case] = {}
+
+
+def case(name: str):
+    def register(func: Case) -> Case:
+        CASES[name] = func
+        return func
+    return register
+
+
+def _telegram_user(sample: Sample):
+    return SimpleNamespace(
+        id=sample.telegram_id, first_name=sample.first_name, last_name=None, username=sample.username,
+        language_code="en"
+    )
+
+
+@case("WordRepository.add_word")
+async def _(sample, samples):
+    data = {"word": "benchmark", "translation": "бенчмарк", "synonym": None, "example_usage": None}
+    return lambda: WordRepository(current_session()).add_word(sample.id, data)
+
+
+@case("WordRepository.add_new_words[50]")
+async def _(sample, samples):
+    rows = [{"word": f"benchmark{i}", "translation": f"translation {i}"} for i in range(50)]
+    return lambda: WordRepository(current_session()).add_new_words(sample.id, rows)
+
+
+@case("WordRepository.stream_words")
+async def _(sample, samples):
+    async def consume():
+        async for _ in WordRepository(current_session()).stream_words(sample.id):
+            pass
+    return consume
+
+
+@case("WordRepository.get_words_page")
+async def _(sample, samples):
+    return lambda: WordRepository(current_session()).get_words_page(sample.id, Config.WORDS_PAGE_SIZE)
+
+
+@case("WordRepository.get_words_page[letter]")
+async def _(sample, samples):
+    return lambda: WordRepository(current_session()).get_words_page(sample.id, Config.WORDS_PAGE_SIZE, letter="m")
+
+
+@case("WordRepository.get_word_by_id")
+async def _(sample, samples):
+    return lambda: WordRepository(current_session()).get_word_by_id(sample.word_id, sample.id)
+
+
+@case("WordRepository.take_next_due_word")
+async def _(sample, samples):
+    return lambda: WordRepository(current_session()).take_next_due_word(
+        sample.id, datetime.utcnow(), timedelta(minutes=10), sample.word_id
+    )
+
+
+@case("WordRepository.get_next_due_words[100]")
+async def _(sample, samples):
+    user_ids = [other.id for other in samples[:100]]
+    return lambda: WordRepository(current_session()).get_next_due_words(user_ids)
+
+
+@case("WordRepository.update_word")
+async def _(sample, samples):
+    return lambda: WordRepository(current_session()).update_word(sample.word_id, sample.id, {"synonym": "benchmark"})
+
+
+@case("WordRepository.delete_word")
+async def _(sample, samples):
+    # A fresh word: seeded ones are referenced by practice sessions
+    word = await WordRepository(current_session()).add_word(sample.id, {"word": "benchmark", "translation": "-"})
+    return lambda: WordRepository(current_session()).delete_word(word.id, sample.id)
+
+
+@case("UserRepository.get_or_create")
+async def _(sample, samples):
+    from database.repositories.user_repo import _identity_cache
+    # Measure the database path, not the identity cache
+    _identity_cache.pop(sample.telegram_id)
+    return lambda: UserRepository(current_session()).get_or_create(_telegram_user(sample))
+
+
+@case("UserRepository.get")
+async def _(sample, samples):
+    return lambda: UserRepository(current_session()).get(sample.id)
+
+
+@case("UserRepository.get_by_username")
+async def _(sample, samples):
+    return lambda: UserRepository(current_session()).get_by_username(sample.username)
+
+
+@case("UserSettingsRepository.get_or_create_settings")
+async def _(sample, samples):
+    return lambda: UserSettingsRepository(current_session()).get_or_create_settings(sample.id)
+
+
+@case("UserSettingsRepository.update_last_word")
+async def _(sample, samples):
+    async def call():
+        await UserSettingsRepository(current_session()).update_last_word(sample.id, sample.word_id)
+        await current_session().flush()
+    return call
+
+
+@case("UserSettingsRepository.get_last_word_id")
+async def _(sample, samples):
+    return lambda: UserSettingsRepository(current_session()).get_last_word_id(sample.id)
+
+
+@case("UserSettingsRepository.set_reminder_interval")
+async def _(sample, samples):
+    async def call():
+        await UserSettingsRepository(current_session()).set_reminder_interval(sample.id, 60)
+        await current_session().flush()
+    return call
+
+
+@case("UserSettingsRepository.claim_due_reminders[500]")
+async def _(sample, samples):
+    return lambda: UserSettingsRepository(current_session()).claim_due_reminders(datetime.utcnow(), 500)
+
+
+@case("UserSettingsRepository.bulk_update[100]")
+async def _(sample, samples):
+    db = current_session()
+    result = await db.execute(text("SELECT id FROM user_settings WHERE user_id = ANY(:ids)"), {
+        "ids": [other.id for other in samples[:100]]
+    })
+    rows = [{"id": settings_id, "practice_interval": 60} for settings_id in result.scalars().all()]
+    return lambda: UserSettingsRepository(db).bulk_update(rows)
+
+
+@case("TeacherRepository.add_teacher")
+async def _(sample, samples):
+    teacher = samples[(samples.index(sample) + 1) % len(samples)]
+    return lambda: TeacherRepository(current_session()).add_teacher(sample.id, teacher.id)
+
+
+@case("TeacherRepository.is_teacher_of")
+async def _(sample, samples):
+    return lambda: TeacherRepository(current_session()).is_teacher_of(sample.teacher_id or 0, sample.id)
+
+
+@case("TeacherRepository.get_student_teachers")
+async def _(sample, samples):
+    return lambda: TeacherRepository(current_session()).get_student_teachers(sample.id)
+
+
+@case("TeacherRepository.get_teacher_students")
+async def _(sample, samples):
+    return lambda: TeacherRepository(current_session()).get_teacher_students(sample.teacher_id or sample.id)
+
+
+@case("TeacherRepository.get_class_stats")
+async def _(sample, samples):
+    return lambda: TeacherRepository(current_session()).get_class_stats(sample.teacher_id or sample.id)
+
+
+@case("PracticeService.get_next_word")
+async def _(sample, samples):
+    return lambda: _practice_service().get_next_word(sample.id)
+
+
+@case("PracticeService._exceeded_daily_limit")
+async def _(sample, samples):
+    service = _practice_service()
+    # Cold path: the per-day count comes from user_statistics, not the in-process cache
+    service._daily_counts.clear()
+    return lambda: service._exceeded_daily_limit(sample.id)
+
+
+_practice = None
+
+
+def _practice_service():
+    global _practice
+    if _practice is None:
+        os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+        from bot.services.practice import PracticeService
+        _practice = PracticeService()
+    return _practice
+
+
+async def load_samples(user_id_base: int, count: int, heavy: bool, seed: int) -> list[Sample]:
+    """`count` seeded users: a random spread, or (heavy) the ones with the most words."""
+    from database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        if heavy:
+            user_ids = (await db.execute(
+                select(Word.user_id)
+                .join(User, User.id == Word.user_id)
+                .where(User.telegram_id > user_id_base)
+                .group_by(Word.user_id)
+                .order_by(func.count().desc())
+                .limit(count)
+            )).scalars().all()
+        else:
+            user_ids = (await db.execute(
+                select(User.id)
+                .where(User.telegram_id > user_id_base)
+                .order_by(func.md5(func.concat(User.id, str(seed))))
+                .limit(count)
+            )).scalars().all()
+        if not user_ids:
+            raise SystemExit("No seeded users found; run python -m benchmarks.seed first")
+
+        users = (await db.execute(select(User).where(User.id.in_(user_ids)))).scalars().all()
+        words = dict((await db.execute(
+            select(Word.user_id, Word.id).where(Word.user_id.in_(user_ids)).order_by(Word.user_id, Word.id)
+            .distinct(Word.user_id)
+        )).all())
+        teachers = dict((await db.execute(
+            select(TeacherStudent.student_id, func.min(TeacherStudent.teacher_id))
+            .where(TeacherStudent.student_id.in_(user_ids))
+            .group_by(TeacherStudent.student_id)
+        )).all())
+    samples = [
+        Sample(user.id, user.telegram_id, user.first_name, user.username, words.get(user.id, 0), teachers.get(user.id))
+        for user in users
+    ]
+    random.Random(seed).shuffle(samples)
+    return samples
+
+
+@unit_of_work
+async def _timed_call(name: str, sample: Sample, samples: list[Sample]) -> float:
+    call = await CASES[name](sample, samples)
+    start = time.perf_counter()
+    await call()
+    elapsed = time.perf_counter() - start
+    await current_uow().rollback()
+    return elapsed
+
+
+async def run_case(name: str, samples: list[Sample], iterations: int, warmup: int) -> dict:
+    timings = []
+    for i in range(warmup + iterations):
+        elapsed = await _timed_call(name, samples[i % len(samples)], samples)
+        if i >= warmup:
+            timings.append(elapsed)
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+        "p50_ms": round(timings[len(timings) // 2] * 1000, 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 3)
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list[str]:
+    """Cases whose p50 got slower than the baseline by more than `tolerance` (and `min_delta_ms`)."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        delta = result["p50_ms"] - before["p50_ms"]
+        if delta > min_delta_ms and result["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p50 {before['p50_ms']} -> {result['p50_ms']} ms (+{delta / before['p50_ms']:.0%})"
+            )
+    return regressions
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    results = {}
+    for group, heavy in (("typical", False), ("heavy", True)):
+        samples = await load_samples(args.user_id_base, args.samples, heavy, args.seed)
+        for name in CASES:
+            if args.filter and args.filter not in name:
+                continue
+            key = f"{name}/{group}"
+            results[key] = await run_case(name, samples, args.iterations, args.warmup)
+            logger.info("%-60s p50 %8.3f ms  p95 %8.3f ms", key, results[key]["p50_ms"], results[key]["p95_ms"])
+    return {
+        "created": datetime.utcnow().isoformat(timespec="seconds"),
+        "revision": _git_revision(),
+        "iterations": args.iterations,
+        "results": results
+    }
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.seed                                  (once)
+    # python -m benchmarks.repositories --save-baseline          (on the reference revision)
+    # python -m benchmarks.repositories                          (exits 1 on regressions, 2 without a baseline)
+    parser = argparse.ArgumentParser(description="Data-layer micro-benchmarks against the seeded dataset")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=200, help="users per group (typical and heavy)")
+    parser.add_argument("--filter", help="only cases whose name contains this")
+    parser.add_argument("--user-id-base", type=int, default=8_000_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown, as a fraction")
+    parser.add_argument("--min-delta-ms", type=float, default=0.2, help="ignore slowdowns smaller than this")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
+    # Repository methods log every call at INFO; keep the output to the results
+    logging.getLogger("database").setLevel(logging.WARNING)
+    logging.getLogger("bot").setLevel(logging.WARNING)
+    report = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as stream:
+            json.dump(report, stream, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as stream:
+            baseline = json.load(stream)
+        regressions = compare(report["results"], baseline["results"], args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"Regressions against {args.baseline} (revision {baseline.get('revision')}):")
+            print("\n".join(regressions))
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (revision {baseline.get('revision')})")
+    else:
+        # Nothing was compared; don't let a check that relies on the exit code pass silently
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one", file=sys.stderr)
+        sys.exit(2)
@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import logging
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, or_, select, text
+from database import AsyncSessionLocal
+from database.models import PracticeSession, TeacherStudent, User, UserSettings, UserStatistics, Word
+from bot.services.partitions import PracticePartitionMaintenance
+from bot.services.rollup import StatisticsRollup
+
+logger = logging.getLogger(__name__)
+
+INSERT_USERS = text("""
+    INSERT INTO users (telegram_id, first_name, username, language_code, created_at, last_activity)
+    SELECT :base + g, 'Seed ' || g, 'seed_' || g, 'en',
+           now() - random() * make_interval(days => :days), now() - random() * make_interval(days => 30)
+    FROM generate_series(CAST(:first AS bigint), CAST(:last AS bigint)) AS g
+    RETURNING id
+""")
+INSERT_WORDS = text("""
+    INSERT INTO words (user_id, word, translation, added_at, last_practiced, due_at, ease, interval_days, repetitions)
+    SELECT c.user_id,
+           chr(97 + ((c.user_id + g) % 26)) || substr(md5(c.user_id || ':' || g), 1, 7),
+           'translation ' || g,
+           now() - random() * make_interval(days => :days),
+           CASE WHEN random() < 0.8 THEN now() - random() * make_interval(days => :days) END,
+           now() + (random() * 60 - 30) * interval '1 day',
+           1.3 + random() * 1.7, floor(random() * 60), floor(random() * 8)::int
+    FROM unnest(CAST(:user_ids AS integer[]), CAST(:counts AS integer[])) AS c(user_id, n)
+    CROSS JOIN LATERAL generate_series(1, c.n) AS g
+""")
+# Each session picks a random word of its user
+INSERT_SESSIONS = text("""
+    INSERT INTO practice_sessions (user_id, word_id, user_sentence, ai_feedback, is_correct, created_at)
+    SELECT w.user_id, w.ids[1 + floor(random() * array_length(w.ids, 1))::int],
+           'Seeded practice sentence ' || g, 'Seeded feedback', random() < 0.7,
+           now() - random() * make_interval(days => :days)
+    FROM (
+        SELECT user_id, array_agg(id) AS ids FROM words
+        WHERE user_id = ANY(CAST(:user_ids AS integer[])) GROUP BY user_id
+    ) AS w
+    JOIN unnest(CAST(:user_ids AS integer[]), CAST(:counts AS integer[])) AS c(user_id, n) ON c.user_id = w.user_id
+    CROSS JOIN LATERAL generate_series(1, c.n) AS g
+""")
+# A third of the users have reminders on, some of them already due
+INSERT_SETTINGS = text("""
+    INSERT INTO user_settings (user_id, practice_interval, notifications_enabled, next_reminder_at)
+    SELECT u.id, s.interval, s.interval > 0,
+           CASE WHEN s.interval > 0 THEN now() + (random() * 24 - 2) * interval '1 hour' END
+    FROM unnest(CAST(:user_ids AS integer[])) AS u(id)
+    -- u.id * 0 ties the subquery to the row so random() is drawn per user
+    CROSS JOIN LATERAL (
+        SELECT CASE WHEN random() < 0.3 THEN (ARRAY[30, 60, 240, 1440])[1 + floor(random() * 4)::int] ELSE 0 END
+               + u.id * 0 AS interval
+    ) AS s
+""")
+
+
+def skewed_counts(n: int, total: int, sigma: float, rng: random.Random, minimum: int = 0) -> list[int]:
+    """`n` log-normally distributed counts summing to about `total`: most small, a long heavy tail."""
+    weights = [rng.lognormvariate(0, sigma) for _ in range(n)]
+    scale = total / sum(weights)
+    return [max(minimum, round(weight * scale)) for weight in weights]
+
+
+def chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class DatasetSeeder:
+    """Generates a large, realistically skewed dataset for the repository benchmarks.
+
+    Users get telegram ids from `user_id_base` up, so seeded rows never collide with real
+    ones and can be removed with `drop`. Words per user and sessions per user are log-normal
+    (a median user has a few dozen words, the heaviest ones tens of thousands), teachers get
+    classes of `class_size` random students, and a third of the users have reminders set.
+    Rows are generated inside Postgres with INSERT ... SELECT, a chunk of users per
+    transaction, then the statistics rollup is backfilled and the tables analyzed.
+    """
+
+    def __init__(
+        self,
+        users: int = 100_000,
+        words: int = 10_000_000,
+        sessions: int = 50_000_000,
+        teacher_share: float = 0.01,
+        class_size: int = 30,
+        history_days: int = 180,
+        skew: float = 1.2,
+        user_id_base: int = 8_000_000_000,
+        chunk_size: int = 1000,
+        seed: int = 1
+    ):
+        self.users = users
+        self.words = words
+        self.sessions = sessions
+        self.teacher_share = teacher_share
+        self.class_size = class_size
+        self.history_days = history_days
+        self.skew = skew
+        self.user_id_base = user_id_base
+        self.chunk_size = chunk_size
+        self.rng = random.Random(seed)
+
+    async def run(self, rollup: bool = True) -> None:
+        start = time.monotonic()
+        word_counts = skewed_counts(self.users, self.words, self.skew, self.rng, minimum=1)
+        # Active learners practice more: sessions follow words, with their own spread on top
+        activity = [count * self.rng.lognormvariate(0, self.skew / 2) for count in word_counts]
+        scale = self.sessions / sum(activity)
+        session_counts = [round(weight * scale) for weight in activity]
+
+        await self._create_partitions()
+        user_ids = []
+        for number, (counts, sessions) in enumerate(
+            zip(chunks(word_counts, self.chunk_size), chunks(session_counts, self.chunk_size))
+        ):
+            first = number * self.chunk_size + 1
+            user_ids.extend(await self._seed_chunk(first, counts, sessions))
+            logger.info(
+                "Seeded %d/%d users (%.0fs)", min(first + self.chunk_size - 1, self.users), self.users,
+                time.monotonic() - start
+            )
+
+        await self._seed_teachers(user_ids)
+        if rollup:
+            logger.info("Backfilling user_statistics")
+            await StatisticsRollup(batch_size=50_000, lag=0).run(max_batches=None)
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("ANALYZE users, words, practice_sessions, user_settings, teacher_students, user_statistics"))
+            await db.commit()
+        logger.info(
+            "Seeded %d users, %d words, %d sessions in %.0fs",
+            self.users, sum(word_counts), sum(session_counts), time.monotonic() - start
+        )
+
+    async def _create_partitions(self) -> None:
+        oldest = (datetime.utcnow() - timedelta(days=self.history_days)).date()
+        months = math.ceil(self.history_days / 28) + 1
+        await PracticePartitionMaintenance(months_ahead=months).create_partitions(oldest)
+
+    async def _seed_chunk(self, first: int, word_counts: list[int], session_counts: list[int]) -> list[int]:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SET LOCAL synchronous_commit = off"))
+            result = await db.execute(INSERT_USERS, {
+                "base": self.user_id_base, "first": first, "last": first + len(word_counts) - 1,
+                "days": self.history_days
+            })
+            ids = sorted(result.scalars().all())
+            await db.execute(INSERT_WORDS, {"user_ids": ids, "counts": word_counts, "days": self.history_days})
+            await db.execute(INSERT_SESSIONS, {"user_ids": ids, "counts": session_counts, "days": self.history_days})
+            await db.execute(INSERT_SETTINGS, {"user_ids": ids})
+            await db.commit()
+        return ids
+
+    async def _seed_teachers(self, user_ids: list[int]) -> None:
+        teachers = self.rng.sample(user_ids, max(1, int(len(user_ids) * self.teacher_share)))
+        rows = []
+        for teacher_id in teachers:
+            students = self.rng.sample(user_ids, min(self.class_size + 1, len(user_ids)))
+            rows.extend(
+                {"teacher_id": teacher_id, "student_id": student_id}
+                for student_id in students[:self.class_size + 1] if student_id != teacher_id
+            )
+        async with AsyncSessionLocal() as db:
+            for batch in chunks(rows, 5000):
+                await db.execute(insert(TeacherStudent), batch)
+            await db.commit()
+        logger.info("Seeded %d teachers with %d students in total", len(teachers), len(rows))
+
+
+async def delete_users(first_telegram_id: int, last_telegram_id: int) -> None:
+    """Remove users in a telegram id range together with everything that references them."""
+    users = select(User.id).where(User.telegram_id.between(first_telegram_id, last_telegram_id)).scalar_subquery()
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(UserSettings).where(UserSettings.user_id.in_(users)))
+        await db.execute(delete(PracticeSession).where(PracticeSession.user_id.in_(users)))
+        await db.execute(delete(UserStatistics).where(UserStatistics.user_id.in_(users)))
+        await db.execute(delete(TeacherStudent).where(
+            or_(TeacherStudent.student_id.in_(users), TeacherStudent.teacher_id.in_(users))
+        ))
+        await db.execute(delete(Word).where(Word.user_id.in_(users)))
+        await db.execute(delete(User).where(User.telegram_id.between(first_telegram_id, last_telegram_id)))
+        await db.commit()
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.seed --users 100000 --words 10000000 --sessions 50000000
+    # python -m benchmarks.seed --drop
+    parser = argparse.ArgumentParser(description="Seed a large synthetic dataset for benchmarks")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=10_000_000)
+    parser.add_argument("--sessions", type=int, default=50_000_000)
+    parser.add_argument("--teacher-share", type=float, default=0.01, help="share of users that teach a class")
+    parser.add_argument("--class-size", type=int, default=30)
+    parser.add_argument("--history-days", type=int, default=180)
+    parser.add_argument("--skew", type=float, default=1.2, help="sigma of the log-normal per-user sizes")
+    parser.add_argument("--user-id-base", type=int, default=8_000_000_000)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="users per transaction")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-rollup", action="store_true")
+    parser.add_argument("--drop", action="store_true", help="delete the seeded users instead")
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
+    if args.drop:
+        asyncio.run(delete_users(args.user_id_base, args.user_id_base + args.users))
+    else:
+        seeder = DatasetSeeder(
+            args.users, args.words, args.sessions, args.teacher_share, args.class_size, args.history_days,
+            args.skew, args.user_id_base, args.chunk_size, args.seed
+        )
+        asyncio.run(seeder.run(rollup=not args.skip_rollup))
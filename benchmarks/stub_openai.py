@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from aiohttp import web
+
+SINGLE_RE = re.compile(r"Correct this using '(?P<word>.*)': '(?P<sentence>.*)'\. Return JSON", re.S)
+BATCH_RE = re.compile(r"Items: (?P<items>\[.*\])\. Return JSON", re.S)
+
+
+class StubOpenAIServer:
+    """Local OpenAI-compatible `/v1/chat/completions` for offline load tests.
+
+    Each request waits `latency` ± `jitter` seconds (normally distributed) and answers in the
+    JSON shape AIService asks for; `correct_rate` of the sentences are judged correct. A share
+    of requests fails instead: `rate_limit_rate` with a 429 and Retry-After, `error_rate` with
+    a 500. Streamed requests get their first chunk after `first_chunk_share` of the latency and
+    the rest spread over the remainder. Point the bot at it with OPENAI_BASE_URL=<base_url>.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.8,
+        jitter: float = 0.3,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        correct_rate: float = 0.7,
+        first_chunk_share: float = 0.2,
+        seed: int | None = None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.correct_rate = correct_rate
+        self.first_chunk_share = first_chunk_share
+        self.random = random.Random(seed)
+        self.base_url = None
+        self._runner = None
+
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_completion(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            latency = max(0.0, self.random.gauss(self.latency, self.jitter))
+            if body.get("stream"):
+                latency, remaining = latency * self.first_chunk_share, latency * (1 - self.first_chunk_share)
+            await asyncio.sleep(latency)
+            roll = self.random.random()
+            if roll < self.rate_limit_rate:
+                self.rate_limited += 1
+                return web.json_response(
+                    {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                    status=429,
+                    headers={"retry-after": "1"}
+                )
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.errors += 1
+                return web.json_response({"error": {"message": "Stub server error", "type": "server_error"}}, status=500)
+            if body.get("stream"):
+                return await self._stream(request, self._completion(body), remaining)
+            return web.json_response(self._completion(body))
+        finally:
+            self.in_flight -= 1
+
+    def _completion(self, body: dict) -> dict:
+        prompt = body["messages"][-1]["content"]
+        content = json.dumps(self._answer(prompt))
+        prompt_tokens = sum(len(message["content"]) for message in body["messages"]) // 4
+        completion_tokens = len(content) // 4
+        return {
+            "id": f"chatcmpl-stub-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    async def _stream(self, request: web.Request, completion: dict, duration: float) -> web.StreamResponse:
+        """Send `completion` as chat.completion.chunk server-sent events over `duration` seconds."""
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        content = completion["choices"][0]["message"]["content"]
+        pieces = [content[i:i + 8] for i in range(0, len(content), 8)]
+        base = {key: completion[key] for key in ("id", "created", "model")}
+        for index, piece in enumerate(pieces):
+            if index:
+                await asyncio.sleep(duration / len(pieces))
+            delta = {"role": "assistant", "content": piece} if index == 0 else {"content": piece}
+            chunk = {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        final = {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        await response.write(f"data: {json.dumps(final)}\n\n".encode())
+        usage = {**base, "object": "chat.completion.chunk", "choices": [], "usage": completion["usage"]}
+        await response.write(f"data: {json.dumps(usage)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    def _answer(self, prompt: str) -> dict:
+        batch = BATCH_RE.search(prompt)
+        if batch:
+            items = json.loads(batch.group("items"))
+            return {"results": [{"id": item.get("id"), **self._judge(item.get("sentence", ""))} for item in items]}
+        single = SINGLE_RE.search(prompt)
+        return self._judge(single.group("sentence") if single else prompt)
+
+    def _judge(self, sentence: str) -> dict:
+        if self.random.random() < self.correct_rate:
+            return {"is_correct": True, "correction": sentence, "explanation": "Well done, the word is used correctly."}
+        return {
+            "is_correct": False,
+            "correction": sentence.rstrip(".") + ", indeed.",
+            "explanation": "The sentence is understandable but could be more natural."
+        }
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "max_in_flight": self.max_in_flight
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.handle_completion)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{port}/v1"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def serve(args) -> None:
+    server = StubOpenAIServer(args.latency, args.jitter, args.error_rate, args.rate_limit_rate)
+    print("Stub OpenAI listening on", await server.start(args.host, args.port))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.stub_openai --port 8090 --latency 1.5
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub for offline runs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.8)
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
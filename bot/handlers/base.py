@@ -1,16 +1,17 @@
 import os
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler
-from database.session import get_db
+from database.unit_of_work import current_session, unit_of_work
 from database.repositories import UserRepository
 
 
 class BaseHandlers:
     @staticmethod
+    @unit_of_work
     async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        db = next(get_db())
+        db = current_session()
         try:
-            user = UserRepository(db).get_or_create(update.effective_user)
+            user = await UserRepository(db).get_or_create(update.effective_user)
 
             welcome_text = (
                 f"✨ *Welcome {user.first_name} to English Teacher Bot!* ✨\n\n"
@@ -51,8 +52,6 @@ class BaseHandlers:
                 "Let's start learning English!",
                 parse_mode="Markdown"
             )
-        finally:
-            db.close()
 
     @staticmethod
     async def handle_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1,11 +1,21 @@
+import os
+import re
+import tempfile
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler
+from telegram.ext import ContextTypes, CommandHandler, CallbackQueryHandler, MessageHandler, filters
+from config.config import Config
 from bot.services.dictionary import DictionaryService
-from database.session import get_db
+from bot.services.word_import import WordImportService
+from bot.services.export import ExportService, FORMAT_ANKI, FORMAT_CSV, KIND_HISTORY, KIND_WORDS
+from bot.services.message_dispatcher import get_dispatcher
+from bot.handlers.word_pager import WordPager
+from database.repositories import UserRepository, TeacherRepository
+from database.unit_of_work import current_session, current_uow, unit_of_work
 
 
 class DictionaryHandlers:
     @staticmethod
+    @unit_of_work
     async def add_word(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not update.message:
             return
@@ -35,10 +45,10 @@ class DictionaryHandlers:
             'example_usage': parts[3].strip() if len(parts) > 3 else None
         }
 
-        db = next(get_db())
+        db = current_session()
         try:
             service = DictionaryService(db)
-            word = service.add_word(update.effective_user, word_data)
+            word = await service.add_word(update.effective_user, word_data)
 
             response = (
                 "✅ *Word added successfully!*\n\n"
@@ -51,56 +61,28 @@ class DictionaryHandlers:
             await update.message.reply_text(response, parse_mode="Markdown")
         except Exception as e:
             await update.message.reply_text(f"❌ *Error:* {str(e)}", parse_mode="Markdown")
-        finally:
-            db.close()
 
     @staticmethod
+    @unit_of_work
     async def list_words(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not update.message:
             return
 
-        db = next(get_db())
+        db = current_session()
         try:
-            service = DictionaryService(db)
-            words = service.get_user_words(update.effective_user)
-
-            if not words:
-                await update.message.reply_text(
-                    "📭 *Your word list is empty*\n\n"
-                    "Add your first word with /addword command",
-                    parse_mode="Markdown"
-                )
-                return
-
-            response_lines = ["📚 *Your Vocabulary*"]
-            for word in words:
-                response_lines.append(f"🔹 #{word.id} *{word.word}* - {word.translation}")
-
-            response_lines.append("\nℹ️ Use `/word <id>` to see details\nExample: `/word 1`")
-
-            max_message_length = 4096
-            chunks = []
-            current_chunk = ""
-
-            for line in response_lines:
-                if len(current_chunk) + len(line) + 1 <= max_message_length:
-                    current_chunk += line + "\n"
-                else:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = line + "\n"
-
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-
-            for chunk in chunks:
-                await update.message.reply_text(chunk, parse_mode="Markdown")
-
+            user = await UserRepository(db).get_or_create(update.effective_user)
+            await WordPager.send_first_page(
+                update,
+                user.id,
+                "📚 *Your Vocabulary*",
+                "📭 *Your word list is empty*\n\n"
+                "Add your first word with /addword command"
+            )
         except Exception as e:
             await update.message.reply_text(f"❌ *Error:* {str(e)}", parse_mode="Markdown")
-        finally:
-            db.close()
 
     @staticmethod
+    @unit_of_work
     async def show_word(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not update.message:
             return
@@ -112,11 +94,11 @@ class DictionaryHandlers:
             )
             return
 
-        db = next(get_db())
+        db = current_session()
         try:
             word_id = int(context.args[0])
             service = DictionaryService(db)
-            word = service.get_word_details(update.effective_user, word_id)
+            word = await service.get_word_details(update.effective_user, word_id)
 
             if not word:
                 await update.message.reply_text(
@@ -156,10 +138,9 @@ class DictionaryHandlers:
             )
         except Exception as e:
             await update.message.reply_text(f"❌ *Error:* {str(e)}", parse_mode="Markdown")
-        finally:
-            db.close()
 
     @staticmethod
+    @unit_of_work
     async def edit_word(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not update.message:
             return
@@ -175,7 +156,6 @@ class DictionaryHandlers:
             )
             return
 
-        db = None
         try:
             word_id = int(context.args[0])
             field = context.args[1].lower()
@@ -196,11 +176,11 @@ class DictionaryHandlers:
                 )
                 return
 
-            db = next(get_db())
+            db = current_session()
             service = DictionaryService(db)
 
             update_data = {valid_fields[field]: new_value}
-            word = service.update_word(update.effective_user, word_id, update_data)
+            word = await service.update_word(update.effective_user, word_id, update_data)
 
             if not word:
                 await update.message.reply_text(
@@ -222,11 +202,9 @@ class DictionaryHandlers:
             )
         except Exception as e:
             await update.message.reply_text(f"❌ *Error:* {str(e)}", parse_mode="Markdown")
-        finally:
-            if db:
-                db.close()
 
     @staticmethod
+    @unit_of_work
     async def delete_word(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not update.message:
             return
@@ -240,13 +218,12 @@ class DictionaryHandlers:
             )
             return
 
-        db = None
         try:
             word_id = int(context.args[0])
-            db = next(get_db())
+            db = current_session()
             service = DictionaryService(db)
 
-            if service.delete_word(update.effective_user, word_id):
+            if await service.delete_word(update.effective_user, word_id):
                 await update.message.reply_text(
                     f"✅ *Word #{word_id} deleted successfully!*",
                     parse_mode="Markdown"
@@ -264,9 +241,144 @@ class DictionaryHandlers:
             )
         except Exception as e:
             await update.message.reply_text(f"❌ *Error:* {str(e)}", parse_mode="Markdown")
-        finally:
-            if db:
-                db.close()
+
+    @staticmethod
+    async def import_words(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not update.message:
+            return
+
+        # The next document this user sends is imported (into a student's list if a username is given)
+        context.user_data["import_target"] = context.args[0].lstrip("@") if context.args else ""
+        await update.message.reply_text(
+            "📥 *How to import words:*\n"
+            "Send a CSV or TSV file, one word per row:\n"
+            "`word, translation, synonym, example`\n\n"
+            "A header row naming the columns is optional. Words already in the list are skipped.\n"
+            "Teachers can import into a student's list with `/import <student_username>`",
+            parse_mode="Markdown"
+        )
+
+    @staticmethod
+    @unit_of_work
+    async def handle_import_document(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        message = update.message
+        caption = (message.caption or "").split()
+        if caption and caption[0].split("@")[0] == "/import":
+            target = caption[1].lstrip("@") if len(caption) > 1 else ""
+        elif "import_target" in context.user_data:
+            target = context.user_data.pop("import_target")
+        else:
+            return
+
+        document = message.document
+        if document.file_size and document.file_size > Config.IMPORT_MAX_FILE_SIZE:
+            await message.reply_text(
+                f"❌ The file is too large. Please keep it under {Config.IMPORT_MAX_FILE_SIZE // (1024 * 1024)} MB."
+            )
+            return
+
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                # Download before touching the database so no pooled connection waits on Telegram
+                path = os.path.join(directory, "import")
+                telegram_file = await document.get_file()
+                await telegram_file.download_to_drive(path)
+
+                db = current_session()
+                user = await UserRepository(db).get_or_create(update.effective_user)
+                owner_id = user.id
+                if target:
+                    student = await UserRepository(db).get_by_username(target)
+                    if not student or not await TeacherRepository(db).is_teacher_of(user.id, student.id):
+                        await message.reply_text("❌ Student not found or you are not their teacher.")
+                        return
+                    owner_id = student.id
+
+                with open(path, newline="", encoding="utf-8-sig", errors="replace") as stream:
+                    result = await WordImportService(db).import_words(owner_id, stream, document.file_name)
+        except Exception as e:
+            # All or nothing: drop the batches already flushed
+            await current_uow().rollback()
+            await message.reply_text(f"❌ Error: {str(e)}")
+            return
+
+        lines = [
+            f"✅ Imported {result.imported} words",
+            f"• Already in the list: {result.duplicates}",
+            f"• Invalid rows: {result.invalid}"
+        ]
+        lines.extend(f"   line {line}: {reason}" for line, reason in result.errors)
+        if result.truncated:
+            lines.append(f"⚠️ Only the first {Config.IMPORT_MAX_ROWS} rows were read")
+        await message.reply_text("\n".join(lines))
+
+    @staticmethod
+    @unit_of_work
+    async def export_words(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not update.message:
+            return
+
+        kind, fmt, target = KIND_WORDS, FORMAT_CSV, ""
+        for arg in context.args or []:
+            value = arg.lower()
+            if value in (KIND_WORDS, KIND_HISTORY):
+                kind = value
+            elif value in (FORMAT_CSV, FORMAT_ANKI):
+                fmt = value
+            else:
+                target = arg.lstrip("@")
+
+        if kind == KIND_HISTORY and fmt == FORMAT_ANKI:
+            await update.message.reply_text(
+                "📤 *How to export:*\n"
+                "`/export [words|history] [csv|anki] [student_username]`\n\n"
+                "Anki format is only available for words.",
+                parse_mode="Markdown"
+            )
+            return
+
+        db = current_session()
+        try:
+            user = await UserRepository(db).get_or_create(update.effective_user)
+            owner_id, owner_name = user.id, user.username or user.first_name
+            if target:
+                student = await UserRepository(db).get_by_username(target)
+                if not student or not await TeacherRepository(db).is_teacher_of(user.id, student.id):
+                    await update.message.reply_text("❌ Student not found or you are not their teacher.")
+                    return
+                owner_id, owner_name = student.id, target
+
+            with tempfile.TemporaryDirectory() as directory:
+                extension = "txt" if fmt == FORMAT_ANKI else "csv"
+                safe_name = re.sub(r"[^\w-]", "_", owner_name)
+                filename = f"{safe_name}_{kind}.{extension}"
+                path = os.path.join(directory, filename)
+
+                service = ExportService(db)
+                with open(path, "w", newline="", encoding="utf-8") as stream:
+                    if kind == KIND_HISTORY:
+                        count = await service.export_history(owner_id, stream)
+                    else:
+                        count = await service.export_words(owner_id, stream, fmt)
+
+                # Read-only from here on: give the connection back before the upload
+                await current_uow().release()
+
+                if not count:
+                    await update.message.reply_text("📭 Nothing to export yet.")
+                    return
+
+                async def upload():
+                    with open(path, "rb") as document:
+                        return await update.message.reply_document(
+                            document=document,
+                            filename=filename,
+                            caption=f"📤 {count} {'words' if kind == KIND_WORDS else 'practice sessions'}"
+                        )
+
+                await get_dispatcher().send(upload, update.message.chat_id)
+        except Exception as e:
+            await update.message.reply_text(f"❌ Error: {str(e)}")
 
     @staticmethod
     async def handle_word_callbacks(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -298,7 +410,11 @@ class DictionaryHandlers:
         application.add_handler(CommandHandler("word", DictionaryHandlers.show_word))
         application.add_handler(CommandHandler("edit", DictionaryHandlers.edit_word))
         application.add_handler(CommandHandler("delete", DictionaryHandlers.delete_word))
+        application.add_handler(CommandHandler("import", DictionaryHandlers.import_words))
+        application.add_handler(CommandHandler("export", DictionaryHandlers.export_words))
+        application.add_handler(MessageHandler(filters.Document.ALL, DictionaryHandlers.handle_import_document))
         application.add_handler(CallbackQueryHandler(
             DictionaryHandlers.handle_word_callbacks,
             pattern="^(edit_word_|delete_word_)"
-        ))
\ No newline at end of file
+        ))
+        WordPager.register_handlers(application)
\ No newline at end of file
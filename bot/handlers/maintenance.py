@@ -0,0 +1,25 @@
+import logging
+from telegram.ext import ContextTypes
+from config.config import Config
+from bot.services.partitions import PracticePartitionMaintenance
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceHandlers:
+    partitions = PracticePartitionMaintenance()
+
+    @staticmethod
+    async def _partition_tick(context: ContextTypes.DEFAULT_TYPE):
+        try:
+            result = await MaintenanceHandlers.partitions.run()
+            logger.info("Partition maintenance: %s", result)
+        except Exception as e:
+            logger.error("Partition maintenance error: %s", str(e))
+
+    @staticmethod
+    def register_handlers(application):
+        if Config.RUN_JOBS:
+            application.job_queue.run_repeating(
+                MaintenanceHandlers._partition_tick, interval=Config.PARTITION_MAINTENANCE_INTERVAL_SECONDS, first=60
+            )
@@ -1,31 +1,67 @@
+import asyncio
 import logging
+from datetime import datetime, timedelta
 from telegram import Update
+from telegram.error import BadRequest, Forbidden
 from telegram.ext import ContextTypes, CommandHandler, MessageHandler, filters
-from database.session import get_db
+from telegram.helpers import escape_markdown
+from config.config import Config
+from database.unit_of_work import current_session, unit_of_work
 from database.repositories import UserRepository, WordRepository, UserSettingsRepository
-from bot.services.practice import PracticeService
+from bot.services.practice import PracticeService, Reminder
+from bot.services.message_dispatcher import get_dispatcher, ProgressiveReply, PRIORITY_BULK
+from bot.instrumentation import timed
 
 logger = logging.getLogger(__name__)
 
+CHECKING_TEXT = "🤔 Checking your sentence..."
+QUEUED_TEXT = "⏳ Lots of learners right now - your sentence is queued, feedback is on its way."
+
+
+def format_partial_feedback(partial: dict) -> str:
+    """Plain-text preview of a streaming correction; Markdown could be cut mid-entity."""
+    is_correct = partial.get("is_correct")
+    if is_correct is True:
+        parts = ["✅ Correct!"]
+    elif is_correct is False:
+        parts = ["📝 Suggestion:", partial.get("correction", "")]
+    else:
+        parts = [CHECKING_TEXT]
+    if partial.get("explanation"):
+        parts.append(f"Explanation: {partial['explanation']}")
+    return "\n\n".join(part for part in parts if part)
+
+
+def format_result(result: dict) -> str:
+    """Markdown reply for a checked sentence; the correction can be the learner's own text, so it is escaped."""
+    if result['is_correct']:
+        return f"✅ *Correct!*\n\n{result['feedback']}"
+    return (
+        f"📝 *Suggestion:*\n{escape_markdown(result['correction'])}\n\n"
+        f"*Explanation:* {result['feedback']}"
+    )
+
 
 class PracticeHandlers:
     def __init__(self, application):
         self.application = application
         self.job_queue = application.job_queue
         self.practice_service = PracticeService()
-        self.active_jobs = {}
 
+    @unit_of_work
     async def start_practice(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        db = next(get_db())
+        db = current_session()
         try:
-            user = UserRepository(db).get_or_create(update.effective_user)
-            word = self.practice_service.get_random_word(user.id)
+            user = await UserRepository(db).get_or_create(update.effective_user)
+            settings = await UserSettingsRepository(db).get_or_create_settings(user.id)
+            # Asking again without answering skips the current word
+            word = await self.practice_service.get_next_word(user.id, exclude_id=settings.last_word_id)
 
             if not word:
                 await update.message.reply_text("❌ Add words first!")
                 return
 
-            UserSettingsRepository(db).update_last_word(user.id, word.id)
+            settings.last_word_id = word.id
 
             await update.message.reply_text(
                 f"✏️ *Practice word:* {word.word}\n"
@@ -36,88 +72,143 @@ class PracticeHandlers:
         except Exception as e:
             logger.error("Practice error: %s", str(e))
             await update.message.reply_text("❌ Error starting practice")
-        finally:
-            db.close()
 
+    @unit_of_work
     async def check_sentence(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        db = next(get_db())
+        db = current_session()
+        reply = None
         try:
-            user = UserRepository(db).get_or_create(update.effective_user)
+            user = await UserRepository(db).get_or_create(update.effective_user)
 
-            last_word_id = UserSettingsRepository(db).get_last_word_id(user.id)
+            last_word_id = await UserSettingsRepository(db).get_last_word_id(user.id)
             if not last_word_id:
                 await update.message.reply_text("❌ No active word found. Start with /practice")
                 return
 
             # word = WordRepository(db).get_word_by_id(last_word_id)
-            word = WordRepository(db).get_word_by_id(last_word_id, user.id)
+            word = await WordRepository(db).get_word_by_id(last_word_id, user.id)
 
             if not word:
                 await update.message.reply_text("❌ Word not found in database")
                 return
 
+            on_progress = None
+            if Config.AI_STREAMING_ENABLED:
+                reply = ProgressiveReply(update.message)
+                reply.start(CHECKING_TEXT)
+
+                def on_progress(partial: dict) -> None:
+                    reply.update(format_partial_feedback(partial))
+
+            async def notify_queued():
+                if reply is not None:
+                    reply.update(QUEUED_TEXT)
+                else:
+                    await update.message.reply_text(QUEUED_TEXT)
+
             result = await self.practice_service.evaluate_sentence(
-                user.id, word.id, update.message.text
+                user.id, word.id, update.message.text, on_queued=notify_queued, on_progress=on_progress
             )
 
-            if result['is_correct']:
-                response = f"✅ *Correct!*\n\n{result['feedback']}"
-            else:
-                response = (
-                    f"📝 *Suggestion:*\n{result['correction']}\n\n"
-                    f"*Explanation:* {result['feedback']}"
-                )
+            if result.get('prechecked'):
+                # Keep the practice word active so the learner can simply try again
+                await self._send_result(update, reply, f"⚠️ {result['feedback']}")
+                return
 
-            UserSettingsRepository(db).update_last_word(user.id, None)
+            await UserSettingsRepository(db).update_last_word(user.id, None)
 
-            await update.message.reply_text(response, parse_mode="Markdown")
+            await self._send_result(update, reply, format_result(result))
         except Exception as e:
             logger.error("Check error: %s", str(e))
-            await update.message.reply_text("❌ Error checking sentence")
-        finally:
-            db.close()
+            if reply is not None:
+                await reply.finish("❌ Error checking sentence")
+            else:
+                await update.message.reply_text("❌ Error checking sentence")
+
+    @staticmethod
+    async def _send_result(update: Update, reply: ProgressiveReply | None, text: str):
+        if reply is not None:
+            await reply.finish(text, parse_mode="Markdown")
+        else:
+            await update.message.reply_text(text, parse_mode="Markdown")
 
+    @unit_of_work
     async def set_schedule(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         try:
             interval = int(context.args[0]) if context.args else 0
-            user = UserRepository(next(get_db())).get_or_create(update.effective_user)
+            db = current_session()
+            user = await UserRepository(db).get_or_create(update.effective_user)
+            await UserSettingsRepository(db).set_reminder_interval(user.id, max(interval, 0))
 
             if interval > 0:
-                job = self.job_queue.run_repeating(
-                    self._send_reminder,
-                    interval=interval * 60,
-                    chat_id=update.effective_chat.id,
-                    data={"user_id": user.id}
-                )
-                self.active_jobs[user.id] = job
                 await update.message.reply_text(f"🔔 Reminders set every {interval} minutes")
-                logger.info(f"Job set for user {user.id} to repeat every {interval} minutes")
+                logger.info(f"Reminders set for user {user.id} every {interval} minutes")
             else:
-                if user.id in self.active_jobs:
-                    self.active_jobs[user.id].schedule_removal()
                 await update.message.reply_text("🔕 Reminders disabled")
-                logger.info(f"Job removed for user {user.id}")
+                logger.info(f"Reminders disabled for user {user.id}")
         except (ValueError, IndexError):
             await update.message.reply_text("Usage: /setschedule <minutes>")
 
-    async def _send_reminder(self, context: ContextTypes.DEFAULT_TYPE):
-        db = next(get_db())
-        try:
-            user_id = context.job.data["user_id"]
-            word = self.practice_service.get_random_word(user_id)
+    async def _reminder_tick(self, context: ContextTypes.DEFAULT_TYPE):
+        """Single periodic job for every user's reminders.
+
+        Due users are claimed from the database in batches, so schedules survive restarts and
+        the cost of a tick depends on how many reminders are due, not on how many users exist.
+        A claim only leases the rows; each reminder is rescheduled once it has been sent, and
+        one that could not be sent comes back when its lease (REMINDER_LEASE_SECONDS) expires.
+        """
+        for _ in range(Config.REMINDER_MAX_BATCHES_PER_TICK):
+            try:
+                reminders = await self._claim_reminder_batch()
+            except Exception as e:
+                logger.error("Reminder batch error: %s", str(e))
+                return
 
-            if word:
-                UserSettingsRepository(db).update_last_word(user_id, word.id)
+            sent = await asyncio.gather(*(self._send_reminder(context.bot, reminder) for reminder in reminders))
+            handled = [reminder for reminder, ok in zip(reminders, sent) if ok]
+            try:
+                await self._confirm_reminders(handled)
+            except Exception as e:
+                logger.error("Reminder confirmation error: %s", str(e))
+                return
+            if len(handled) < len(reminders):
+                logger.warning("%d reminders not sent, retrying after their lease", len(reminders) - len(handled))
+                if not handled:
+                    # Telegram is unreachable; don't lease the rest of the backlog just to fail it
+                    return
+            if len(reminders) < Config.REMINDER_BATCH_SIZE:
+                return
 
-                await context.bot.send_message(
-                    chat_id=context.job.chat_id,
-                    text=f"⏰ *Practice time!*\n\nWord: {word.word}\n\nWrite a sentence:",
-                    parse_mode="Markdown"
-                )
+    @unit_of_work
+    async def _claim_reminder_batch(self):
+        return await self.practice_service.claim_reminder_batch(
+            datetime.utcnow(), Config.REMINDER_BATCH_SIZE, timedelta(seconds=Config.REMINDER_LEASE_SECONDS)
+        )
+
+    @unit_of_work
+    async def _confirm_reminders(self, reminders):
+        await self.practice_service.confirm_reminders(reminders, datetime.utcnow())
+
+    @timed("PracticeHandlers._send_reminder", update=False)
+    async def _send_reminder(self, bot, reminder: Reminder) -> bool:
+        """Send one reminder; False if it should be retried later."""
+        if reminder.word is None:
+            return True
+        try:
+            await get_dispatcher().send_message(
+                bot,
+                reminder.chat_id,
+                f"⏰ *Practice time!*\n\nWord: {reminder.word}\n\nWrite a sentence:",
+                priority=PRIORITY_BULK,
+                parse_mode="Markdown"
+            )
+        except (Forbidden, BadRequest) as e:
+            # Blocked bot or deleted chat: retrying won't help
+            logger.error("Reminder for chat %s dropped: %s", reminder.chat_id, str(e))
         except Exception as e:
-            logger.error("Reminder error: %s", str(e))
-        finally:
-            db.close()
+            logger.error("Reminder error for chat %s: %s", reminder.chat_id, str(e))
+            return False
+        return True
 
     def register_handlers(self):
         handlers = [
@@ -127,3 +218,6 @@ class PracticeHandlers:
         ]
         for handler in handlers:
             self.application.add_handler(handler)
+
+        if Config.RUN_JOBS:
+            self.job_queue.run_repeating(self._reminder_tick, interval=Config.REMINDER_TICK_SECONDS, first=5)
@@ -0,0 +1,64 @@
+import logging
+from datetime import datetime
+from telegram import Update
+from telegram.ext import ContextTypes, CommandHandler
+from config.config import Config
+from bot.services.rollup import StatisticsRollup
+from bot.services.stats import StatsService
+from database.repositories import UserRepository
+from database.unit_of_work import current_session, unit_of_work
+
+logger = logging.getLogger(__name__)
+
+BAR_WIDTH = 10
+
+
+class StatsHandlers:
+    rollup = StatisticsRollup()
+
+    @staticmethod
+    @unit_of_work
+    async def show_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not update.message:
+            return
+
+        db = current_session()
+        try:
+            user = await UserRepository(db).get_or_create(update.effective_user)
+            summary = await StatsService(db).get_summary(user.id, datetime.utcnow().date())
+        except Exception as e:
+            await update.message.reply_text(f"❌ *Error:* {str(e)}", parse_mode="Markdown")
+            return
+
+        accuracy = f"{100 * summary['correct'] / summary['sentences']:.0f}%" if summary['sentences'] else "-"
+        peak = max((day["sentences"] for day in summary["history"]), default=0) or 1
+        chart = "\n".join(
+            f"`{day['date'].strftime('%a %d')} {'▇' * round(BAR_WIDTH * day['sentences'] / peak):<{BAR_WIDTH}} {day['sentences']}`"
+            for day in summary["history"]
+        )
+
+        await update.message.reply_text(
+            "📈 *Your Statistics*\n\n"
+            f"• *Words added:* {summary['words_added']}\n"
+            f"• *Sentences practiced:* {summary['sentences']}\n"
+            f"• *Accuracy:* {accuracy}\n"
+            f"• *Streak:* 🔥 {summary['streak']} days\n\n"
+            "*Last 7 days:*\n"
+            f"{chart}",
+            parse_mode="Markdown"
+        )
+
+    @staticmethod
+    async def _rollup_tick(context: ContextTypes.DEFAULT_TYPE):
+        try:
+            await StatsHandlers.rollup.run()
+        except Exception as e:
+            logger.error("Statistics rollup error: %s", str(e))
+
+    @staticmethod
+    def register_handlers(application):
+        application.add_handler(CommandHandler("stats", StatsHandlers.show_stats))
+        if Config.RUN_JOBS:
+            application.job_queue.run_repeating(
+                StatsHandlers._rollup_tick, interval=Config.ROLLUP_INTERVAL_SECONDS, first=30
+            )
@@ -1,14 +1,15 @@
-from sqlalchemy import Update
+from telegram import Update
 from telegram.ext import CommandHandler, ContextTypes
 
 from bot.services.teacher_service import TeacherService
-from database.repositories import WordRepository
 from database.repositories.teacher_repo import TeacherRepository
 from database.repositories.user_repo import UserRepository
-from database.session import get_db
+from bot.handlers.word_pager import WordPager
+from database.unit_of_work import current_session, unit_of_work
 
 class TeacherHandlers:
     @staticmethod
+    @unit_of_work
     async def add_teacher(update, context):
         if not context.args:
             await update.message.reply_text(
@@ -20,10 +21,10 @@ class TeacherHandlers:
             return
 
         teacher_username = context.args[0].lstrip("@")
-        db = next(get_db())
+        db = current_session()
         try:
             service = TeacherService(db)
-            student = UserRepository(db).get_or_create(update.effective_user)
+            student = await UserRepository(db).get_or_create(update.effective_user)
             teacher = await service.add_teacher(student.id, teacher_username)
 
             if not teacher:
@@ -33,10 +34,9 @@ class TeacherHandlers:
             await update.message.reply_text(f"✅ Teacher @{teacher_username} added successfully!")
         except Exception as e:
             await update.message.reply_text(f"❌ Error: {str(e)}")
-        finally:
-            db.close()
 
     @staticmethod
+    @unit_of_work
     async def view_student_words(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if not context.args:
             await update.message.reply_text(
@@ -48,50 +48,64 @@ class TeacherHandlers:
             return
 
         student_username = context.args[0].lstrip("@")
-        db = next(get_db())
+        db = current_session()
         try:
-            teacher = UserRepository(db).get_or_create(update.effective_user)
-            student = UserRepository(db).get_by_username(student_username)
+            teacher = await UserRepository(db).get_or_create(update.effective_user)
+            student = await UserRepository(db).get_by_username(student_username)
 
             if not student:
                 await update.message.reply_text("❌ Student not found.")
                 return
 
-            relation = TeacherRepository(db).get_teacher_students(teacher.id)
-            if student.id not in [rel.student_id for rel in relation]:
+            if not await TeacherRepository(db).is_teacher_of(teacher.id, student.id):
                 await update.message.reply_text("❌ You are not a teacher of this student.")
                 return
 
-            words = WordRepository(db).get_user_words(student.id)
-            if not words:
-                await update.message.reply_text(f"📭 *{student_username}'s word list is empty*", parse_mode="Markdown")
-                return
-
-            response_lines = [f"📚 *{student_username}'s Vocabulary*"]
-            for word in words:
-                response_lines.append(f"🔹 #{word.id} *{word.word}* - {word.translation}")
-            response_lines.append("\nℹ️ Use `/word <id>` to see details\nExample: `/word 1`")
-
-            max_message_length = 4096
-            chunks = []
-            current_chunk = ""
-            for line in response_lines:
-                if len(current_chunk) + len(line) + 1 <= max_message_length:
-                    current_chunk += line + "\n"
-                else:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = line + "\n"
-            if current_chunk:
-                chunks.append(current_chunk.strip())
+            await WordPager.send_first_page(
+                update,
+                student.id,
+                f"📚 *{student_username}'s Vocabulary*",
+                f"📭 *{student_username}'s word list is empty*"
+            )
+        except Exception as e:
+            await update.message.reply_text(f"❌ Error: {str(e)}")
 
-            for chunk in chunks:
-                await update.message.reply_text(chunk, parse_mode="Markdown")
+    @staticmethod
+    @unit_of_work
+    async def class_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        db = current_session()
+        try:
+            teacher = await UserRepository(db).get_or_create(update.effective_user)
+            rows = await TeacherService(db).get_class_stats(teacher.id)
         except Exception as e:
             await update.message.reply_text(f"❌ Error: {str(e)}")
-        finally:
-            db.close()
+            return
+
+        if not rows:
+            await update.message.reply_text("📭 You don't have any students yet.")
+            return
+
+        lines = [f"📊 Class overview ({len(rows)} students)", ""]
+        for row in rows:
+            accuracy = f"{100 * row.correct / row.sentences:.0f}%" if row.sentences else "-"
+            last_seen = row.last_activity.strftime("%Y-%m-%d") if row.last_activity else "never"
+            lines.append(
+                f"👤 {row.username or row.first_name}: {row.words} words, {row.sentences} sentences, "
+                f"{accuracy} correct, last active {last_seen}"
+            )
+
+        # Telegram caps a message at 4096 characters; big classes are split across messages
+        chunk, size = [], 0
+        for line in lines:
+            if chunk and size + len(line) > 4000:
+                await update.message.reply_text("\n".join(chunk))
+                chunk, size = [], 0
+            chunk.append(line)
+            size += len(line) + 1
+        await update.message.reply_text("\n".join(chunk))
 
     @staticmethod
     def register_handlers(application):
         application.add_handler(CommandHandler("add_teacher", TeacherHandlers.add_teacher))
+        application.add_handler(CommandHandler("class_stats", TeacherHandlers.class_stats))
         application.add_handler(CommandHandler("view_student_words", TeacherHandlers.view_student_words))
\ No newline at end of file
@@ -0,0 +1,126 @@
+import string
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
+from telegram.ext import ContextTypes, CallbackQueryHandler
+from config.config import Config
+from database.repositories import UserRepository, WordRepository, TeacherRepository
+from database.unit_of_work import current_session, unit_of_work
+
+# Callback data: wp:<owner_id>:<action>[:<arg>]
+#   s - first page        n:<id> - page after word id    p:<id> - page before word id
+#   f:<id> - page from id  l:<letter> - jump to letter    a:<id> - show the A-Z keyboard
+CALLBACK_PREFIX = "wp"
+
+
+class WordPager:
+    """Keyset-paginated vocabulary listing shared by /my_words and /view_student_words.
+
+    Every page is one indexed query and navigation edits the same message in place.
+    """
+
+    @staticmethod
+    async def send_first_page(update: Update, owner_id: int, title: str, empty_text: str):
+        text, markup = await WordPager._render(owner_id, "s", None, title)
+        if text is None:
+            await update.message.reply_text(empty_text, parse_mode="Markdown")
+            return
+        await update.message.reply_text(text, parse_mode="Markdown", reply_markup=markup)
+
+    @staticmethod
+    @unit_of_work
+    async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        query = update.callback_query
+        await query.answer()
+
+        parts = query.data.split(":")
+        owner_id, action = int(parts[1]), parts[2]
+        arg = parts[3] if len(parts) > 3 else None
+
+        db = current_session()
+        viewer = await UserRepository(db).get_or_create(update.effective_user)
+        if viewer.id == owner_id:
+            title = "📚 *Your Vocabulary*"
+        elif await TeacherRepository(db).is_teacher_of(viewer.id, owner_id):
+            owner = await UserRepository(db).get(owner_id)
+            title = f"📚 *{owner.username or owner.first_name}'s Vocabulary*"
+        else:
+            await query.edit_message_text("❌ You are not a teacher of this student.")
+            return
+
+        if action == "a":
+            await query.edit_message_reply_markup(reply_markup=WordPager._alphabet_keyboard(owner_id, arg))
+            return
+
+        text, markup = await WordPager._render(owner_id, action, arg, title)
+        if text is None:
+            text, markup = await WordPager._render(owner_id, "s", None, title)
+        if text is None:
+            await WordPager._edit(query, "📭 *The word list is empty*", parse_mode="Markdown")
+            return
+        await WordPager._edit(query, text, parse_mode="Markdown", reply_markup=markup)
+
+    @staticmethod
+    async def _edit(query, text: str, **kwargs):
+        try:
+            await query.edit_message_text(text, **kwargs)
+        except BadRequest as e:
+            # Going back to the page already shown (or falling back to the first one) changes nothing
+            if "message is not modified" not in str(e).lower():
+                raise
+
+    @staticmethod
+    async def _render(owner_id: int, action: str, arg: str | None, title: str):
+        repo = WordRepository(current_session())
+        limit = Config.WORDS_PAGE_SIZE
+
+        if action == "n":
+            rows, has_next = await repo.get_words_page(owner_id, limit, after_id=int(arg))
+            has_prev = True
+        elif action == "p":
+            rows, has_prev = await repo.get_words_page(owner_id, limit, before_id=int(arg))
+            has_next = True
+            if len(rows) < limit:
+                # Walked back past the start: show the first page instead of a short one
+                return await WordPager._render(owner_id, "s", None, title)
+        elif action == "f":
+            rows, has_next = await repo.get_words_page(owner_id, limit, from_id=int(arg))
+            has_prev = True
+        elif action == "l":
+            rows, has_next = await repo.get_words_page(owner_id, limit, letter=arg)
+            has_prev = True
+            if not rows:
+                return await WordPager._render(owner_id, "s", None, title)
+        else:
+            rows, has_next = await repo.get_words_page(owner_id, limit)
+            has_prev = False
+
+        if not rows:
+            return None, None
+
+        lines = [title]
+        lines.extend(f"🔹 #{row.id} *{row.word}* - {row.translation}" for row in rows)
+        lines.append("\nℹ️ Use `/word <id>` to see details\nExample: `/word 1`")
+
+        navigation = []
+        if has_prev:
+            navigation.append(InlineKeyboardButton("◀️ Prev", callback_data=f"{CALLBACK_PREFIX}:{owner_id}:p:{rows[0].id}"))
+        navigation.append(InlineKeyboardButton("🔤 A-Z", callback_data=f"{CALLBACK_PREFIX}:{owner_id}:a:{rows[0].id}"))
+        if has_next:
+            navigation.append(InlineKeyboardButton("Next ▶️", callback_data=f"{CALLBACK_PREFIX}:{owner_id}:n:{rows[-1].id}"))
+
+        return "\n".join(lines), InlineKeyboardMarkup([navigation])
+
+    @staticmethod
+    def _alphabet_keyboard(owner_id: int, back_id: str | None) -> InlineKeyboardMarkup:
+        letters = [
+            InlineKeyboardButton(letter.upper(), callback_data=f"{CALLBACK_PREFIX}:{owner_id}:l:{letter}")
+            for letter in string.ascii_lowercase
+        ]
+        keyboard = [letters[i:i + 7] for i in range(0, len(letters), 7)]
+        back = f"{CALLBACK_PREFIX}:{owner_id}:f:{back_id}" if back_id else f"{CALLBACK_PREFIX}:{owner_id}:s"
+        keyboard.append([InlineKeyboardButton("↩️ Back", callback_data=back)])
+        return InlineKeyboardMarkup(keyboard)
+
+    @staticmethod
+    def register_handlers(application):
+        application.add_handler(CallbackQueryHandler(WordPager.handle_callback, pattern=f"^{CALLBACK_PREFIX}:"))
@@ -0,0 +1,177 @@
+import functools
+import logging
+import time
+from contextvars import ContextVar
+from aiohttp import web
+from sqlalchemy import event
+from config.config import Config
+from bot.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+HANDLER_DURATION = REGISTRY.histogram(
+    "bot_handler_duration_seconds", "Time spent in a handler or job callback", ("handler", "status")
+)
+UPDATES_IN_FLIGHT = REGISTRY.gauge("bot_updates_in_flight", "Updates currently being handled")
+DB_QUERIES = REGISTRY.counter("bot_db_queries_total", "SQL statements executed", ("handler",))
+DB_QUERY_DURATION = REGISTRY.histogram("bot_db_query_duration_seconds", "Duration of single SQL statements")
+DB_QUERIES_PER_UPDATE = REGISTRY.histogram(
+    "bot_db_queries_per_update", "SQL statements per handled update or job run", ("handler",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 250)
+)
+DB_TIME_PER_UPDATE = REGISTRY.histogram(
+    "bot_db_time_per_update_seconds", "Time spent in SQL per handled update or job run", ("handler",)
+)
+AI_DURATION = REGISTRY.histogram("bot_ai_request_duration_seconds", "OpenAI request latency", ("outcome",))
+AI_FIRST_TOKEN = REGISTRY.histogram(
+    "bot_ai_first_token_seconds", "Time from sending a streamed OpenAI request to its first content chunk"
+)
+AI_TOKENS = REGISTRY.counter("bot_ai_tokens_total", "OpenAI tokens used", ("kind",))
+AI_ERRORS = REGISTRY.counter("bot_ai_errors_total", "Failed OpenAI requests by exception class", ("error",))
+JOB_LAG = REGISTRY.histogram(
+    "bot_job_lag_seconds", "Delay between a job's scheduled and actual start", ("job",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+)
+
+
+class QueryStats:
+    """SQL executed on behalf of one handled update or job run."""
+
+    __slots__ = ("name", "update_id", "count", "time", "statements")
+
+    def __init__(self, name: str, update_id: int | None = None, record: bool = False):
+        self.name = name
+        self.update_id = update_id
+        self.count = 0
+        self.time = 0.0
+        # (statement, seconds) per execution, kept only while the SQL profiler is on
+        self.statements: list | None = [] if record else None
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# Called with the finished QueryStats of every update and job run (see bot.profiler)
+_finish_hooks: list = []
+
+
+def current_query_stats() -> QueryStats | None:
+    return _query_stats.get()
+
+
+def add_finish_hook(hook) -> None:
+    _finish_hooks.append(hook)
+
+
+def timed(name: str, update: bool = True):
+    """Record latency and SQL usage of a handler (`update=True`) or job callback under `name`."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            update_id = getattr(args[0], "update_id", None) if update and args else None
+            stats = QueryStats(name, update_id, record=bool(_finish_hooks))
+            token = _query_stats.set(stats)
+            if update:
+                UPDATES_IN_FLIGHT.inc()
+            status = "ok"
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                HANDLER_DURATION.observe(time.perf_counter() - start, handler=name, status=status)
+                DB_QUERIES_PER_UPDATE.observe(stats.count, handler=name)
+                DB_TIME_PER_UPDATE.observe(stats.time, handler=name)
+                if update:
+                    UPDATES_IN_FLIGHT.dec()
+                _query_stats.reset(token)
+                for hook in _finish_hooks:
+                    try:
+                        hook(stats)
+                    except Exception as e:
+                        logger.error("Query stats hook failed: %s", str(e))
+        return wrapper
+    return decorator
+
+
+def _callback_name(callback) -> str:
+    return getattr(callback, "__qualname__", None) or getattr(callback, "__name__", repr(callback))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERY_DURATION.observe(elapsed)
+    current = _query_stats.get()
+    DB_QUERIES.inc(handler=current.name if current else "")
+    if current:
+        current.count += 1
+        current.time += elapsed
+
+
+def instrument_engine(engine) -> None:
+    # SQLAlchemy runs these inside the awaiting task's context, so they see its _query_stats
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_application(application) -> None:
+    """Wrap every registered handler and job with `timed` and track job-queue lag."""
+    for handlers in application.handlers.values():
+        for handler in handlers:
+            handler.callback = timed(_callback_name(handler.callback))(handler.callback)
+
+    job_queue = application.job_queue
+    if job_queue is None:
+        return
+    for job in job_queue.jobs():
+        job.callback = timed(job.name, update=False)(job.callback)
+
+    from apscheduler.events import EVENT_JOB_SUBMITTED
+
+    def on_submitted(scheduler_event):
+        now = time.time()
+        job = job_queue.scheduler.get_job(scheduler_event.job_id)
+        for scheduled in scheduler_event.scheduled_run_times:
+            JOB_LAG.observe(max(0.0, now - scheduled.timestamp()), job=job.name if job else scheduler_event.job_id)
+
+    job_queue.scheduler.add_listener(on_submitted, EVENT_JOB_SUBMITTED)
+
+
+def register_runtime_gauges() -> None:
+    from bot.services.message_dispatcher import get_dispatcher
+    from database.session import async_engine
+
+    REGISTRY.gauge(
+        "bot_outbound_queue_depth", "Telegram messages waiting in the dispatcher",
+        function=lambda: get_dispatcher().queue_depth
+    )
+    REGISTRY.gauge(
+        "bot_outbound_in_flight", "Telegram API calls in progress",
+        function=lambda: get_dispatcher().stats()["in_flight"]
+    )
+    REGISTRY.gauge(
+        "bot_db_pool_checked_out", "Database connections checked out of the pool",
+        function=lambda: async_engine.sync_engine.pool.checkedout()
+    )
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    return web.Response(text=REGISTRY.render(), content_type="text/plain", charset="utf-8")
+
+
+async def start_metrics_server(host: str | None = None, port: int | None = None) -> web.AppRunner:
+    # Read at call time: supervisor workers move METRICS_PORT after this module is imported
+    host = host or Config.METRICS_HOST
+    port = port or Config.METRICS_PORT
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Metrics on http://%s:%s/metrics", host, port)
+    return runner
@@ -0,0 +1,163 @@
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from sqlalchemy import event
+from config.config import Config
+from database.cache import LRUCache
+from bot.instrumentation import QueryStats, add_finish_hook, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+# Bind placeholders in every paramstyle the drivers use, including expanded IN lists
+_PLACEHOLDERS = re.compile(r"(?:\$\d+|%\(\w+\)s|%s)(?:::\w+)?(?:\s*,\s*(?:\$\d+|%\(\w+\)s|%s)(?:::\w+)?)*")
+_EXPLAINABLE = ("SELECT", "WITH")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with bind placeholders and IN-list lengths folded, so repeats compare equal."""
+    return _PLACEHOLDERS.sub("?", _WHITESPACE.sub(" ", statement).strip())
+
+
+class SQLProfiler:
+    """Profiling mode for the database layer.
+
+    Every statement run while a handler or job is being handled (see bot.instrumentation.timed)
+    is recorded with its duration against that handler and update id. When the update finishes,
+    statement shapes executed `repeat_threshold` or more times are reported as a likely N+1, and
+    the whole update is appended to `path` as one JSON line for `python -m bot.profiler`.
+    Statements slower than `slow_ms` are logged with their EXPLAIN plan, fetched on a separate
+    connection so the caller's transaction is never touched, at most once per shape per
+    `explain_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        engine,
+        slow_ms: float = Config.SQL_SLOW_QUERY_MS,
+        repeat_threshold: int = Config.SQL_N_PLUS_ONE_THRESHOLD,
+        path: str | None = Config.SQL_PROFILE_PATH,
+        explain: bool = Config.SQL_EXPLAIN_SLOW,
+        explain_interval: float = 600
+    ):
+        self.engine = engine
+        self.slow = slow_ms / 1000
+        self.repeat_threshold = repeat_threshold
+        self.path = path
+        self.explain = explain
+        self._explained = LRUCache(maxsize=1000, ttl=explain_interval)
+        self._explain_tasks = set()
+
+    def install(self) -> None:
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(self.engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        add_finish_hook(self.finish)
+        logger.info("SQL profiling on (slow >= %.0f ms, N+1 at %d repeats)", self.slow * 1000, self.repeat_threshold)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["profile_start"].pop()
+        if statement.startswith("EXPLAIN "):
+            return
+        current = current_query_stats()
+        if current is not None and current.statements is not None:
+            current.statements.append((statement, elapsed))
+        if elapsed >= self.slow:
+            self._slow_query(statement, parameters, elapsed, current)
+
+    def _slow_query(self, statement: str, parameters, elapsed: float, current: QueryStats | None) -> None:
+        shape = statement_shape(statement)
+        logger.warning(
+            "Slow query %.0f ms [%s update %s]: %s",
+            elapsed * 1000, current.name if current else "-", current.update_id if current else "-", shape
+        )
+        if not self.explain or not shape.upper().startswith(_EXPLAINABLE) or self._explained.get(shape):
+            return
+        self._explained.set(shape, True)
+        try:
+            task = asyncio.get_running_loop().create_task(self._explain(statement, parameters, shape))
+        except RuntimeError:
+            return
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, statement: str, parameters, shape: str) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                result = await conn.exec_driver_sql("EXPLAIN " + statement, parameters)
+                plan = "\n".join(row[0] for row in result)
+            logger.warning("Plan for slow query %s\n%s", shape, plan)
+        except Exception as e:
+            logger.error("EXPLAIN failed for %s: %s", shape, str(e))
+
+    def finish(self, stats: QueryStats) -> None:
+        if not stats.statements:
+            return
+        shapes = Counter(statement_shape(statement) for statement, _ in stats.statements)
+        repeated = [(shape, count) for shape, count in shapes.most_common() if count >= self.repeat_threshold]
+        for shape, count in repeated:
+            logger.warning(
+                "Possible N+1 in %s (update %s): %d x %s",
+                stats.name, stats.update_id, count, shape
+            )
+        if self.path:
+            record = {
+                "at": datetime.utcnow().isoformat(timespec="milliseconds"),
+                "handler": stats.name,
+                "update_id": stats.update_id,
+                "queries": len(stats.statements),
+                "db_ms": round(sum(elapsed for _, elapsed in stats.statements) * 1000, 3),
+                "statements": [
+                    {"sql": statement_shape(statement), "ms": round(elapsed * 1000, 3)}
+                    for statement, elapsed in stats.statements
+                ],
+                "repeated": [{"sql": shape, "count": count} for shape, count in repeated]
+            }
+            with open(self.path, "a", encoding="utf-8") as stream:
+                stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def summarize(path: str, top: int = 10) -> None:
+    """Print DB cost per handler and the most frequent N+1 shapes from a profile file."""
+    handlers = defaultdict(lambda: {"updates": 0, "queries": 0, "db_ms": 0.0, "max_queries": 0})
+    repeats = Counter()
+    with open(path, encoding="utf-8") as stream:
+        for line in stream:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            totals = handlers[record["handler"]]
+            totals["updates"] += 1
+            totals["queries"] += record["queries"]
+            totals["db_ms"] += record["db_ms"]
+            totals["max_queries"] = max(totals["max_queries"], record["queries"])
+            for item in record["repeated"]:
+                repeats[(record["handler"], item["sql"])] += 1
+
+    print(f"{'handler':40} {'updates':>8} {'q/update':>9} {'max q':>6} {'db ms/update':>13}")
+    for name, totals in sorted(handlers.items(), key=lambda item: -item[1]["db_ms"]):
+        updates = totals["updates"]
+        print(
+            f"{name[:40]:40} {updates:>8} {totals['queries'] / updates:>9.1f} "
+            f"{totals['max_queries']:>6} {totals['db_ms'] / updates:>13.2f}"
+        )
+    if repeats:
+        print("\nRepeated statements (updates affected):")
+        for (name, shape), count in repeats.most_common(top):
+            print(f"{count:>6}  {name}: {shape[:160]}")
+
+
+if __name__ == "__main__":
+    # python -m bot.profiler sql_profile.jsonl
+    parser = argparse.ArgumentParser(description="Summarize a SQL profile written with SQL_PROFILING")
+    parser.add_argument("file", nargs="?", default=Config.SQL_PROFILE_PATH or "sql_profile.jsonl")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    summarize(args.file, args.top)
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CorrectionBatcher:
+    """Collects concurrent correction requests and sends them to OpenAI as one prompt.
+
+    A batch is flushed when `max_items` requests are pending or `window` seconds after
+    the first one arrived, whichever comes first. Every caller gets back the raw JSON
+    object for its own sentence, the same shape a single request returns, so the
+    AIService parsing path does not change. Items the model drops or mangles are
+    retried one by one through `single_call`.
+    """
+
+    def __init__(
+        self,
+        single_call: Callable[..., Awaitable[str]],
+        batch_call: Callable[..., Awaitable[str]],
+        window: float = 0.05,
+        max_items: int = 10
+    ):
+        self.single_call = single_call
+        self.batch_call = batch_call
+        self.window = window
+        self.max_items = max_items
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    async def submit(self, word: str, sentence: str, priority: int = 0, on_queued=None) -> str:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((word, sentence, priority, on_queued, future))
+
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list) -> None:
+        if len(batch) == 1:
+            await self._resolve_single(*batch[0])
+            return
+
+        items = [{"id": i, "word": entry[0], "sentence": entry[1]} for i, entry in enumerate(batch)]
+        priority = min(entry[2] for entry in batch)
+        callbacks = [entry[3] for entry in batch if entry[3] is not None]
+
+        async def on_queued():
+            await asyncio.gather(*(callback() for callback in callbacks), return_exceptions=True)
+
+        try:
+            response = await self.batch_call(items, priority=priority, on_queued=on_queued if callbacks else None)
+            results = self._split_results(response, len(batch))
+        except Exception as e:
+            logger.warning("Batched AI correction failed, falling back per item: %s", str(e))
+            results = [None] * len(batch)
+
+        fallbacks = []
+        for (word, sentence, priority, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result is None:
+                fallbacks.append(self._resolve_single(word, sentence, priority, None, future))
+            else:
+                future.set_result(json.dumps(result))
+
+        if fallbacks:
+            logger.info("Batch of %d returned %d unusable items", len(batch), len(fallbacks))
+            await asyncio.gather(*fallbacks)
+
+    async def _resolve_single(self, word: str, sentence: str, priority: int, on_queued, future: asyncio.Future) -> None:
+        try:
+            response = await self.single_call(word, sentence, priority=priority, on_queued=on_queued)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(response)
+
+    @staticmethod
+    def _split_results(response: str, size: int) -> list:
+        results = [None] * size
+        try:
+            data = json.loads(response)
+        except (TypeError, json.JSONDecodeError):
+            return results
+
+        items = data.get("results") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return results
+
+        for item in items:
+            if not isinstance(item, dict) or "correction" not in item:
+                continue
+            index = item.get("id")
+            if isinstance(index, int) and 0 <= index < size and results[index] is None:
+                results[index] = {
+                    "is_correct": item.get("is_correct", False),
+                    "correction": item["correction"],
+                    "explanation": item.get("explanation", "No feedback")
+                }
+        return results
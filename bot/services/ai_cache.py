@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from config.config import Config
+from database.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCorrectionStore:
+    """Persistent cache tier kept in a local SQLite file so results survive restarts.
+
+    It is deliberately separate from Postgres: lookups never take a connection from the
+    bot's pool and the file can be shared by every process on the host.
+    """
+
+    def __init__(self, path: str, ttl: int):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ai_corrections ("
+            "key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM ai_corrections WHERE created_at < ?", (time.time() - ttl,))
+        self._conn.commit()
+
+    def _get(self, key: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM ai_corrections WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def _set(self, key: str, result: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_corrections (key, result, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result), time.time())
+            )
+            self._conn.commit()
+
+    async def get(self, key: str) -> dict | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, result: dict) -> None:
+        await asyncio.to_thread(self._set, key, result)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class CorrectionCache:
+    """Two-tier cache for AIService.check_sentence results: in-memory LRU, then SQLite."""
+
+    def __init__(self, model: str, prompt_version: str):
+        self.model = model
+        self.prompt_version = prompt_version
+        self.memory = LRUCache(maxsize=Config.AI_CACHE_SIZE, ttl=Config.AI_CACHE_TTL)
+        self.persistent = None
+        if Config.AI_CACHE_PATH:
+            try:
+                self.persistent = SQLiteCorrectionStore(Config.AI_CACHE_PATH, Config.AI_CACHE_PERSISTENT_TTL)
+            except sqlite3.Error as e:
+                logger.error("Persistent AI cache disabled: %s", str(e))
+
+    def make_key(self, word: str, sentence: str) -> str:
+        # Case is kept on purpose: capitalisation mistakes are part of what gets corrected
+        normalized_word = " ".join(word.split()).lower()
+        normalized_sentence = " ".join(sentence.split())
+        raw = "\x1f".join((normalized_word, normalized_sentence, self.model, self.prompt_version))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, word: str, sentence: str) -> dict | None:
+        key = self.make_key(word, sentence)
+        result = self.memory.get(key)
+        if result is not None:
+            return dict(result)
+
+        if self.persistent is None:
+            return None
+        try:
+            result = await self.persistent.get(key)
+        except sqlite3.Error as e:
+            logger.error("AI cache read failed: %s", str(e))
+            return None
+        if result is None:
+            return None
+        self.memory.set(key, result)
+        return dict(result)
+
+    async def set(self, word: str, sentence: str, result: dict) -> None:
+        key = self.make_key(word, sentence)
+        self.memory.set(key, dict(result))
+        if self.persistent is None:
+            return
+        try:
+            await self.persistent.set(key, result)
+        except sqlite3.Error as e:
+            logger.error("AI cache write failed: %s", str(e))
+
+    def stats(self) -> dict:
+        return {
+            "memory": self.memory.stats(),
+            "persistent": self.persistent.stats() if self.persistent else None
+        }
@@ -0,0 +1,170 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable
+import openai
+from bot.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+
+
+class AdaptiveConcurrency:
+    """AIMD cap on in-flight requests.
+
+    Each fast success raises the cap by 1/cap (about +1 per round trip of the whole window),
+    a 429 halves it and a response slower than `latency_target` shrinks it by 10%.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, latency_target: float):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+
+    def on_success(self, latency: float) -> None:
+        if latency > self.latency_target:
+            self.limit = max(self.minimum, self.limit * 0.9)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_rate_limited(self) -> None:
+        self.limit = max(self.minimum, self.limit * 0.5)
+
+    @property
+    def cap(self) -> int:
+        return max(self.minimum, int(self.limit))
+
+
+class AILimiter:
+    """Admission control for OpenAI calls.
+
+    Requests wait in a priority queue for an in-flight slot (lower `priority` first, FIFO
+    within a priority; every caller today is an interactive answer), then take their share
+    of the requests-per-minute and tokens-per-minute buckets. When a request has to wait,
+    `on_queued` is called once so the caller can tell the user their sentence is queued
+    instead of failing it.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        initial_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        latency_target: float = 8.0,
+        max_retries: int = 3
+    ):
+        self.requests = TokenBucket(requests_per_minute / 60, max(1, requests_per_minute / 6))
+        self.tokens = TokenBucket(tokens_per_minute / 60, max(1, tokens_per_minute / 6))
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, min_concurrency, max_concurrency, latency_target)
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self.rate_limited = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable],
+        priority: int = PRIORITY_INTERACTIVE,
+        tokens: int = 0,
+        on_queued: Callable[[], Awaitable] | None = None
+    ):
+        attempt = 0
+        while True:
+            await self._acquire_slot(priority, on_queued)
+            on_queued = None
+            try:
+                await self.requests.acquire()
+                await self.tokens.acquire(tokens)
+
+                start = time.monotonic()
+                result = await call()
+                self.concurrency.on_success(time.monotonic() - start)
+
+                usage = getattr(result, "usage", None)
+                if usage is not None and tokens:
+                    self.tokens.adjust(tokens - usage.total_tokens)
+                return result
+            except openai.RateLimitError as e:
+                self.rate_limited += 1
+                self.concurrency.on_rate_limited()
+                delay = self._retry_after(e, attempt)
+                self.requests.pause(delay)
+                logger.warning(
+                    "OpenAI rate limited (attempt %d), concurrency cap now %d, retrying in %.1fs",
+                    attempt + 1, self.concurrency.cap, delay
+                )
+                if attempt >= self.max_retries:
+                    raise
+            finally:
+                self._release_slot()
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _acquire_slot(self, priority: int, on_queued) -> None:
+        if self.in_flight < self.concurrency.cap and not self._waiters:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            if on_queued is not None:
+                try:
+                    await on_queued()
+                except Exception as e:
+                    logger.error("Queued notification failed: %s", str(e))
+            self._wake()
+            await future
+        except BaseException:
+            # Cancelled while notifying or waiting: leave the queue, or hand back a slot already granted
+            if future.done() and not future.cancelled():
+                self._release_slot()
+            else:
+                future.cancel()
+            raise
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.concurrency.cap:
+            *_, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+
+    @staticmethod
+    def _retry_after(error: openai.RateLimitError, attempt: int) -> float:
+        response = getattr(error, "response", None)
+        header = response.headers.get("retry-after") if response is not None else None
+        try:
+            return float(header)
+        except (TypeError, ValueError):
+            return min(30.0, 2 ** attempt)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queue_depth,
+            "concurrency_cap": self.concurrency.cap,
+            "rate_limited": self.rate_limited
+        }
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int) -> int:
+    # ~4 characters per token is close enough for budgeting; the real usage is settled afterwards
+    return sum(len(message["content"]) for message in messages) // 4 + max_tokens
@@ -1,25 +1,87 @@
 import openai
 import json
 import logging
-from typing import Optional
+import time
+from types import SimpleNamespace
+from typing import Callable, Optional
 from config.config import Config
 from datetime import datetime
+from bot.services.ai_cache import CorrectionCache
+from bot.services.ai_batcher import CorrectionBatcher
+from bot.services.ai_limiter import AILimiter, PRIORITY_INTERACTIVE, estimate_tokens
+from bot.instrumentation import AI_DURATION, AI_ERRORS, AI_FIRST_TOKEN, AI_TOKENS
+from bot.utils.metrics import REGISTRY
+from bot.utils.partial_json import parse_partial_json
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the prompt in _get_ai_correction changes so cached results are not reused
+PROMPT_VERSION = "1"
+INVALID_RESPONSE_FEEDBACK = "Invalid response format"
+
 
 class AIService:
     def __init__(self):
-        self.client = openai.AsyncOpenAI(api_key=Config.OPENAI_API_KEY)
+        self.limiter = None
+        if Config.AI_LIMITER_ENABLED:
+            self.limiter = AILimiter(
+                requests_per_minute=Config.AI_REQUESTS_PER_MINUTE,
+                tokens_per_minute=Config.AI_TOKENS_PER_MINUTE,
+                initial_concurrency=Config.AI_INITIAL_CONCURRENCY,
+                max_concurrency=Config.AI_MAX_CONCURRENCY,
+                latency_target=Config.AI_LATENCY_TARGET
+            )
+            limiter = self.limiter
+            REGISTRY.gauge("bot_ai_in_flight", "OpenAI requests in progress", function=lambda: limiter.in_flight)
+            REGISTRY.gauge("bot_ai_queued", "OpenAI requests waiting for the limiter", function=lambda: limiter.queue_depth)
+            REGISTRY.gauge(
+                "bot_ai_concurrency_cap", "Current adaptive OpenAI concurrency cap",
+                function=lambda: limiter.concurrency.cap
+            )
+        # The limiter does its own 429 handling, so the client must not retry behind its back
+        self.client = openai.AsyncOpenAI(api_key=Config.OPENAI_API_KEY, max_retries=0 if self.limiter else 2)
         self.model = Config.MODEL_NAME
         self.max_tokens = 150
         self.temperature = 0.3
+        self.cache = CorrectionCache(self.model, PROMPT_VERSION) if Config.AI_CACHE_ENABLED else None
+        self.batcher = None
+        if Config.AI_BATCHING_ENABLED:
+            self.batcher = CorrectionBatcher(
+                self._get_ai_correction,
+                self._get_ai_correction_batch,
+                window=Config.AI_BATCH_WINDOW_MS / 1000,
+                max_items=Config.AI_BATCH_MAX_ITEMS
+            )
         logger.info("AI Service initialized with model: %s", self.model)
 
-    async def check_sentence(self, word: str, sentence: str) -> dict:
+    async def check_sentence(
+        self,
+        word: str,
+        sentence: str,
+        priority: int = PRIORITY_INTERACTIVE,
+        on_queued=None,
+        on_progress: Callable[[dict], None] | None = None
+    ) -> dict:
+        """Evaluate `sentence`; with AI_STREAMING_ENABLED, `on_progress` is called with the
+        fields parsed so far (is_correct, correction, explanation) while the completion streams.
+        """
         try:
+            if self.cache:
+                cached = await self.cache.get(word, sentence)
+                if cached is not None:
+                    logger.info("AI correction served from cache | Word: %s", word)
+                    return cached
+
             start_time = datetime.now()
-            response = await self._get_ai_correction(word, sentence)
+            if on_progress is not None and Config.AI_STREAMING_ENABLED:
+                # Streaming trades the batch discount for time to first feedback
+                response = await self._get_ai_correction(
+                    word, sentence, priority=priority, on_queued=on_queued, on_progress=on_progress
+                )
+            elif self.batcher:
+                response = await self.batcher.submit(word, sentence, priority=priority, on_queued=on_queued)
+            else:
+                response = await self._get_ai_correction(word, sentence, priority=priority, on_queued=on_queued)
             result = self._parse_response(response, sentence)
 
             logger.info(
@@ -27,16 +89,21 @@ class AIService:
                 (datetime.now() - start_time).total_seconds(),
                 word
             )
+            if self.cache and not result.get("error"):
+                await self.cache.set(word, sentence, result)
             return result
         except Exception as e:
             logger.error("AI correction failed: %s", str(e))
             return {
                 "is_correct": False,
                 "correction": sentence,
-                "feedback": f"Error: {str(e)}"
+                "feedback": f"Error: {str(e)}",
+                "error": True
             }
 
-    async def _get_ai_correction(self, word: str, sentence: str) -> str:
+    async def _get_ai_correction(
+        self, word: str, sentence: str, priority: int = PRIORITY_INTERACTIVE, on_queued=None, on_progress=None
+    ) -> str:
         messages = [{
             "role": "system",
             "content": "You are an English teacher. Correct sentences concisely."
@@ -45,15 +112,100 @@ class AIService:
             "content": f"Correct this using '{word}': '{sentence}'. Return JSON with: is_correct, correction, explanation"
         }]
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            max_tokens=self.max_tokens,
-            temperature=self.temperature,
-            response_format={"type": "json_object"}
-        )
+        on_delta = None
+        if on_progress is not None:
+            def on_delta(content: str) -> None:
+                on_progress(parse_partial_json(content))
+
+        response = await self._create_completion(messages, self.max_tokens, priority, on_queued, on_delta)
         return response.choices[0].message.content
 
+    async def _get_ai_correction_batch(
+        self, items: list[dict], priority: int = PRIORITY_INTERACTIVE, on_queued=None
+    ) -> str:
+        messages = [{
+            "role": "system",
+            "content": "You are an English teacher. Correct sentences concisely."
+        }, {
+            "role": "user",
+            "content": (
+                "Correct each sentence so it uses its word. Items: "
+                f"{json.dumps(items, ensure_ascii=False)}. "
+                'Return JSON {"results": [...]} with one object per item containing: '
+                "id, is_correct, correction, explanation"
+            )
+        }]
+
+        response = await self._create_completion(messages, self.max_tokens * len(items), priority, on_queued)
+        return response.choices[0].message.content
+
+    async def _create_completion(
+        self, messages: list[dict], max_tokens: int, priority: int, on_queued, on_delta=None
+    ):
+        """Run a chat completion through the limiter; with `on_delta` it is streamed and
+        `on_delta` gets the accumulated content after every chunk.
+        """
+        async def call():
+            start = time.perf_counter()
+            try:
+                if on_delta is None:
+                    response = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=self.temperature,
+                        response_format={"type": "json_object"}
+                    )
+                else:
+                    stream = await self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=self.temperature,
+                        response_format={"type": "json_object"},
+                        stream=True,
+                        stream_options={"include_usage": True}
+                    )
+                    response = await self._consume_stream(stream, on_delta, start)
+            except Exception as e:
+                AI_DURATION.observe(time.perf_counter() - start, outcome="error")
+                AI_ERRORS.inc(error=type(e).__name__)
+                raise
+            AI_DURATION.observe(time.perf_counter() - start, outcome="ok")
+            if response.usage is not None:
+                AI_TOKENS.inc(response.usage.prompt_tokens, kind="prompt")
+                AI_TOKENS.inc(response.usage.completion_tokens, kind="completion")
+            return response
+
+        if not self.limiter:
+            return await call()
+        return await self.limiter.run(
+            call,
+            priority=priority,
+            tokens=estimate_tokens(messages, max_tokens),
+            on_queued=on_queued
+        )
+
+    @staticmethod
+    async def _consume_stream(stream, on_delta: Callable[[str], None], start: float):
+        """Collect a streamed completion into the parts of a ChatCompletion that callers use."""
+        parts = []
+        usage = None
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            if not parts:
+                AI_FIRST_TOKEN.observe(time.perf_counter() - start)
+            parts.append(chunk.choices[0].delta.content)
+            try:
+                on_delta("".join(parts))
+            except Exception as e:
+                logger.warning("Streaming progress callback failed: %s", str(e))
+        content = "".join(parts)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
     def _parse_response(self, response: str, original: str) -> dict:
         try:
             data = json.loads(response)
@@ -66,5 +218,6 @@ class AIService:
             return {
                 "is_correct": False,
                 "correction": original,
-                "feedback": "Invalid response format"
+                "feedback": INVALID_RESPONSE_FEEDBACK,
+                "error": True
             }
\ No newline at end of file
@@ -0,0 +1,87 @@
+import csv
+import html
+import logging
+from typing import TextIO
+from config.config import Config
+from database.repositories import WordRepository, PracticeSessionRepository
+
+logger = logging.getLogger(__name__)
+
+FORMAT_CSV = "csv"
+FORMAT_ANKI = "anki"
+KIND_WORDS = "words"
+KIND_HISTORY = "history"
+
+# Anki (2.1.54+) reads these file headers, so the import dialog needs no manual setup
+ANKI_HEADER = "#separator:tab\n#html:true\n#columns:Front\tBack\tTags\n"
+
+
+def anki_back(translation: str, synonym: str | None, example: str | None) -> str:
+    parts = [html.escape(translation)]
+    if synonym:
+        parts.append(f"<i>{html.escape(synonym)}</i>")
+    if example:
+        parts.append(html.escape(example))
+    return "<br>".join(parts)
+
+
+class ExportService:
+    """Writes a user's vocabulary or practice history to a text file.
+
+    Rows come from server-side cursors `batch_size` at a time and go straight to the file,
+    so memory stays flat whatever the size of the export.
+    """
+
+    def __init__(self, db, batch_size: int = Config.EXPORT_BATCH_SIZE):
+        self.word_repo = WordRepository(db)
+        self.practice_repo = PracticeSessionRepository(db)
+        self.batch_size = batch_size
+
+    async def export_words(self, owner_id: int, stream: TextIO, fmt: str = FORMAT_CSV) -> int:
+        result = await self.word_repo.stream_words(owner_id, self.batch_size)
+        if fmt == FORMAT_ANKI:
+            stream.write(ANKI_HEADER)
+            writer = csv.writer(stream, delimiter="\t", lineterminator="\n")
+        else:
+            writer = csv.writer(stream)
+            writer.writerow(["word", "translation", "synonym", "example", "added_at"])
+
+        count = 0
+        async for row in result:
+            if fmt == FORMAT_ANKI:
+                writer.writerow([
+                    html.escape(row.word),
+                    anki_back(row.translation, row.synonym, row.example_usage),
+                    "english_teacher_bot"
+                ])
+            else:
+                writer.writerow([
+                    row.word,
+                    row.translation,
+                    row.synonym or "",
+                    row.example_usage or "",
+                    row.added_at.isoformat() if row.added_at else ""
+                ])
+            count += 1
+
+        logger.info(f"Exported {count} words for user {owner_id} as {fmt}")
+        return count
+
+    async def export_history(self, owner_id: int, stream: TextIO) -> int:
+        result = await self.practice_repo.stream_history(owner_id, self.batch_size)
+        writer = csv.writer(stream)
+        writer.writerow(["created_at", "word", "sentence", "is_correct", "feedback"])
+
+        count = 0
+        async for row in result:
+            writer.writerow([
+                row.created_at.isoformat() if row.created_at else "",
+                row.word or "",
+                row.user_sentence or "",
+                "" if row.is_correct is None else int(row.is_correct),
+                row.ai_feedback or ""
+            ])
+            count += 1
+
+        logger.info(f"Exported {count} practice sessions for user {owner_id}")
+        return count
@@ -0,0 +1,366 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Awaitable, Callable
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+from telegram.ext import BaseRateLimiter
+from config.config import Config
+from database.cache import LRUCache
+from bot.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+# Bot API methods that post to or edit messages in a chat, and so count against its rate limits
+DISPATCHED_METHODS = frozenset({
+    "sendMessage", "sendPhoto", "sendDocument", "sendAudio", "sendVideo", "sendAnimation", "sendVoice",
+    "sendVideoNote", "sendSticker", "sendMediaGroup", "sendLocation", "sendVenue", "sendContact", "sendPoll",
+    "sendDice", "copyMessage", "forwardMessage", "editMessageText", "editMessageCaption", "editMessageMedia",
+    "editMessageReplyMarkup"
+})
+
+# Set while the dispatcher itself makes a call, so DispatcherRateLimiter lets it straight through
+_delivering: ContextVar[bool] = ContextVar("dispatcher_delivering", default=False)
+
+
+class _Job:
+    __slots__ = ("call", "chat_id", "priority", "future", "attempts")
+
+    def __init__(self, call, chat_id, priority, future):
+        self.call = call
+        self.chat_id = chat_id
+        self.priority = priority
+        self.future = future
+        self.attempts = 0
+
+
+class MessageDispatcher:
+    """Single outbound queue for Telegram sends.
+
+    Sends are paced by a global token bucket (Telegram allows ~30 msg/s per bot) and a bucket
+    per chat (~1 msg/s in private chats, 20/min in groups). Each chat keeps FIFO order: it has
+    at most one send in flight and its next message is only released when that one is done.
+    Among chats that are allowed to send, interactive replies go before bulk traffic such as
+    reminders. RetryAfter pauses only the affected chat and the message is retried ahead of
+    the chat's other messages, so large fan-outs drain at the allowed rate instead of dropping
+    messages. A paused chat's bucket is pinned until the pause is over, so evicting it from
+    the bucket cache can't lift the pause early.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 30,
+        private_chat_rate: float = 1,
+        group_chat_rate: float = 20 / 60,
+        chat_burst: int = 3,
+        max_attempts: int = 5
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.private_chat_rate = private_chat_rate
+        self.group_chat_rate = group_chat_rate
+        self.chat_burst = chat_burst
+        self.max_attempts = max_attempts
+
+        self._chat_buckets = LRUCache(maxsize=100000)
+        # chat_id -> (bucket, paused until); kept out of the LRU until the pause is over
+        self._paused: dict[int, tuple[TokenBucket, float]] = {}
+        # A chat has a queue while it has messages waiting or one in flight
+        self._chat_queues: dict[int, deque] = {}
+        self._sending: set[int] = set()
+        self._ready = []
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._worker = None
+        self._in_flight = set()
+
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.flood_waits = 0
+
+    async def send(
+        self,
+        call: Callable[[], Awaitable],
+        chat_id: int,
+        priority: int = PRIORITY_INTERACTIVE
+    ):
+        """Queue `call` (a zero-argument coroutine function doing the actual API call) and await its result."""
+        future = asyncio.get_running_loop().create_future()
+        job = _Job(call, chat_id, priority, future)
+
+        queue = self._chat_queues.get(chat_id)
+        if queue is None:
+            self._chat_queues[chat_id] = deque([job])
+            self._schedule_chat(chat_id, priority, self._chat_bucket(chat_id).delay())
+        else:
+            queue.append(job)
+
+        self._ensure_worker()
+        self._wakeup.set()
+        return await future
+
+    async def send_message(self, bot, chat_id: int, text: str, priority: int = PRIORITY_BULK, **kwargs):
+        return await self.send(lambda: bot.send_message(chat_id=chat_id, text=text, **kwargs), chat_id, priority)
+
+    async def reply_text(self, message, text: str, priority: int = PRIORITY_INTERACTIVE, **kwargs):
+        return await self.send(lambda: message.reply_text(text, **kwargs), message.chat_id, priority)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._chat_queues.values())
+
+    def stats(self) -> dict:
+        depth_by_priority = {}
+        for queue in self._chat_queues.values():
+            for job in queue:
+                depth_by_priority[job.priority] = depth_by_priority.get(job.priority, 0) + 1
+        return {
+            "queue_depth": self.queue_depth,
+            "queue_depth_by_priority": depth_by_priority,
+            "in_flight": len(self._in_flight),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "flood_waits": self.flood_waits
+        }
+
+    async def aclose(self, timeout: float = 10) -> None:
+        """Wait up to `timeout` seconds for queued messages to go out, then stop the worker."""
+        deadline = time.monotonic() + timeout
+        while (self.queue_depth or self._in_flight) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        paused = self._paused.get(chat_id)
+        if paused is not None:
+            bucket, until = paused
+            if until > time.monotonic():
+                return bucket
+            del self._paused[chat_id]
+            self._chat_buckets.set(chat_id, bucket)
+            return bucket
+
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            rate = self.private_chat_rate if chat_id > 0 else self.group_chat_rate
+            bucket = TokenBucket(rate, self.chat_burst)
+            self._chat_buckets.set(chat_id, bucket)
+        return bucket
+
+    def _schedule_chat(self, chat_id: int, priority: int, delay: float) -> None:
+        if delay <= 0:
+            heapq.heappush(self._ready, (priority, next(self._sequence), chat_id))
+        else:
+            heapq.heappush(self._waiting, (time.monotonic() + delay, next(self._sequence), priority, chat_id))
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            while self._waiting and self._waiting[0][0] <= now:
+                _, _, priority, chat_id = heapq.heappop(self._waiting)
+                heapq.heappush(self._ready, (priority, next(self._sequence), chat_id))
+
+            if not self._ready:
+                self._wakeup.clear()
+                timeout = self._waiting[0][0] - now if self._waiting else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, chat_id = heapq.heappop(self._ready)
+            queue = self._chat_queues.get(chat_id)
+            if chat_id in self._sending:
+                continue
+            if not queue:
+                self._chat_queues.pop(chat_id, None)
+                continue
+
+            bucket = self._chat_bucket(chat_id)
+            if not bucket.try_acquire():
+                self._schedule_chat(chat_id, queue[0].priority, bucket.delay())
+                continue
+
+            await self.global_bucket.acquire()
+            job = queue.popleft()
+            self._sending.add(chat_id)
+            task = asyncio.create_task(self._deliver(job))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _deliver(self, job: _Job) -> None:
+        try:
+            await self._attempt(job)
+        finally:
+            # Release the chat's next message (or the retried one) only now, keeping its order
+            self._sending.discard(job.chat_id)
+            queue = self._chat_queues.get(job.chat_id)
+            if queue:
+                self._schedule_chat(job.chat_id, queue[0].priority, self._chat_bucket(job.chat_id).delay())
+                self._wakeup.set()
+            else:
+                self._chat_queues.pop(job.chat_id, None)
+
+    async def _attempt(self, job: _Job) -> None:
+        _delivering.set(True)
+        job.attempts += 1
+        try:
+            result = await job.call()
+        except RetryAfter as e:
+            self.flood_waits += 1
+            logger.warning("Flood wait %ss for chat %s", e.retry_after, job.chat_id)
+            self._retry(job, float(e.retry_after))
+        except (Forbidden, BadRequest) as e:
+            self._fail(job, e)
+        except NetworkError as e:
+            self._retry(job, min(30.0, 2 ** job.attempts), e)
+        except Exception as e:
+            self._fail(job, e)
+        else:
+            self.sent += 1
+            if not job.future.done():
+                job.future.set_result(result)
+
+    def _retry(self, job: _Job, delay: float, error: Exception | None = None) -> None:
+        if job.attempts >= self.max_attempts:
+            self._fail(job, error or RuntimeError(f"Gave up after {job.attempts} attempts"))
+            return
+
+        self.retried += 1
+        # Whole chat waits out the flood period; its other messages stay behind the retried one
+        bucket = self._chat_bucket(job.chat_id)
+        bucket.pause(delay)
+        now = time.monotonic()
+        self._paused = {chat_id: paused for chat_id, paused in self._paused.items() if paused[1] > now}
+        self._paused[job.chat_id] = (bucket, now + delay)
+        self._chat_queues.setdefault(job.chat_id, deque()).appendleft(job)
+
+    def _fail(self, job: _Job, error: Exception) -> None:
+        self.failed += 1
+        logger.error("Message to chat %s failed: %s", job.chat_id, str(error))
+        if not job.future.done():
+            job.future.set_exception(error)
+
+
+class DispatcherRateLimiter(BaseRateLimiter):
+    """Routes every chat-bound Bot API call of the application's bot through the dispatcher.
+
+    Installed with `ApplicationBuilder.rate_limiter`, so handlers can keep calling
+    `reply_text`, `edit_message_text` and friends and still share the global and per-chat
+    budgets with reminders. Calls land in the interactive lane unless `rate_limit_args`
+    names another priority; calls without a numeric chat id are passed straight through.
+    """
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        # Queued messages are drained by the application's post_shutdown hook
+        pass
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        chat_id = data.get("chat_id")
+        if _delivering.get() or endpoint not in DISPATCHED_METHODS or not isinstance(chat_id, int):
+            return await callback(*args, **kwargs)
+        priority = PRIORITY_INTERACTIVE if rate_limit_args is None else rate_limit_args
+        return await get_dispatcher().send(lambda: callback(*args, **kwargs), chat_id, priority)
+
+
+class ProgressiveReply:
+    """A reply that is posted at once and then edited in place as more of it becomes known.
+
+    The placeholder is sent in the background so the caller is never held up by it. Edits go
+    through the dispatcher, so they share the chat's rate budget with all other sends, and
+    are coalesced: at most one per `interval` seconds, always with the newest text. Telegram
+    rejects edits that change nothing, so those are skipped.
+    """
+
+    def __init__(self, message, interval: float = Config.AI_STREAM_EDIT_INTERVAL, dispatcher=None):
+        self.message = message
+        self.interval = interval
+        self.dispatcher = dispatcher or get_dispatcher()
+        self._posted = None
+        self._shown = None
+        self._pending = None
+        self._last_edit = 0.0
+        self._flusher = None
+
+    def start(self, text: str) -> None:
+        self._shown = text
+        self._last_edit = time.monotonic()
+        self._posted = asyncio.create_task(self.dispatcher.reply_text(self.message, text))
+
+    def update(self, text: str, **kwargs) -> None:
+        """Show `text` soon; only the latest text given within one interval is sent."""
+        if self._posted is None or text == self._shown:
+            return
+        self._pending = (text, kwargs)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def finish(self, text: str, **kwargs) -> None:
+        """Replace the reply with its final `text` (posting it if the placeholder never made it)."""
+        self._pending = None
+        if self._flusher is not None:
+            # An edit already handed to the dispatcher still goes out, before this one
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        if not await self._edit(text, kwargs):
+            await self.dispatcher.reply_text(self.message, text, **kwargs)
+
+    async def _flush_later(self) -> None:
+        while self._pending is not None:
+            delay = self._last_edit + self.interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            text, kwargs = self._pending
+            self._pending = None
+            await self._edit(text, kwargs)
+
+    async def _edit(self, text: str, kwargs: dict) -> bool:
+        try:
+            # Shielded: cancelling a pending edit must not cancel the placeholder itself
+            posted = await asyncio.shield(self._posted) if self._posted is not None else None
+        except Exception:
+            posted = None
+        if posted is None:
+            return False
+        if text == self._shown:
+            return True
+        self._last_edit = time.monotonic()
+        try:
+            await self.dispatcher.send(lambda: posted.edit_text(text, **kwargs), posted.chat_id, PRIORITY_INTERACTIVE)
+        except Exception as e:
+            logger.warning("Progressive edit in chat %s failed: %s", posted.chat_id, str(e))
+            return False
+        self._shown = text
+        return True
+
+
+_dispatcher: MessageDispatcher | None = None
+
+
+def get_dispatcher() -> MessageDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = MessageDispatcher(
+            global_rate=Config.TELEGRAM_GLOBAL_RATE,
+            private_chat_rate=Config.TELEGRAM_CHAT_RATE,
+            group_chat_rate=Config.TELEGRAM_GROUP_RATE
+        )
+    return _dispatcher
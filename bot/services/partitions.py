@@ -0,0 +1,158 @@
+import csv
+import gzip
+import logging
+import os
+import re
+from datetime import date, datetime
+from sqlalchemy import text
+from config.config import Config
+from database.models import RollupWatermark
+from database.unit_of_work import current_session, unit_of_work
+
+logger = logging.getLogger(__name__)
+
+PARENT = "practice_sessions"
+PARTITION_RE = re.compile(rf"^{PARENT}_p(\d{{4}})_(\d{{2}})$")
+# Catch-all for rows before the migration month, created by migration 0005 in offline (--sql) mode
+HISTORY = f"{PARENT}_history"
+ARCHIVE_COLUMNS = ["id", "user_id", "word_id", "user_sentence", "ai_feedback", "is_correct", "created_at"]
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_p{month:%Y_%m}"
+
+
+class PracticePartitionMaintenance:
+    """Keeps the monthly partitions of practice_sessions in shape.
+
+    Partitions for the next `months_ahead` months are created in advance so inserts never
+    miss one. Partitions entirely older than `retention_months` are detached from the parent,
+    so hot queries, vacuum and the indexes only ever see recent months. In "file" mode, the
+    default and the only archival path, each is then written to a gzip CSV and dropped. "detach"
+    mode is retention only: the tables stay in the database and keep their disk space, so
+    back them up and drop them by hand. A partition is only detached once the statistics
+    rollup has folded all of its rows. The history partition goes the same way once its
+    newest row is older than the retention window.
+    """
+
+    def __init__(
+        self,
+        months_ahead: int = Config.PRACTICE_PARTITION_MONTHS_AHEAD,
+        retention_months: int = Config.PRACTICE_RETENTION_MONTHS,
+        archive_mode: str = Config.PRACTICE_ARCHIVE_MODE,
+        archive_dir: str = Config.PRACTICE_ARCHIVE_DIR,
+        batch_size: int = Config.EXPORT_BATCH_SIZE
+    ):
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.archive_mode = archive_mode
+        self.archive_dir = archive_dir
+        self.batch_size = batch_size
+
+    async def run(self, today: date | None = None) -> dict:
+        today = today or datetime.utcnow().date()
+        created = await self.create_partitions(today)
+        cutoff = add_months(date(today.year, today.month, 1), -self.retention_months)
+        archived = []
+        for name, attached in await self.list_partitions():
+            if not attached and self.archive_mode != "file":
+                continue
+            end = await self._history_end() if name == HISTORY else add_months(self._month(name), 1)
+            if end > cutoff:
+                continue
+            if await self.archive_partition(name, attached):
+                archived.append(name)
+        return {"created": created, "archived": archived}
+
+    @unit_of_work
+    async def create_partitions(self, today: date) -> list[str]:
+        db = current_session()
+        current = date(today.year, today.month, 1)
+        created = []
+        for offset in range(self.months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            exists = await db.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+            if exists:
+                continue
+            await db.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {PARENT} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            created.append(name)
+            logger.info(f"Created partition {name}")
+        return created
+
+    @unit_of_work
+    async def list_partitions(self) -> list[tuple[str, bool]]:
+        """(name, attached) for every monthly or history partition table, attached or already detached."""
+        result = await current_session().execute(
+            text(
+                "SELECT relname, relispartition FROM pg_class "
+                "WHERE relkind = 'r' AND (relname ~ :pattern OR relname = :history)"
+            ),
+            {"pattern": PARTITION_RE.pattern, "history": HISTORY}
+        )
+        return sorted((row.relname, row.relispartition) for row in result.all())
+
+    @unit_of_work
+    async def _history_end(self) -> date:
+        """First month after the newest row of the history partition (its rows span many months)."""
+        newest = await current_session().scalar(text(f"SELECT max(created_at) FROM {HISTORY}"))
+        return add_months(date(newest.year, newest.month, 1), 1) if newest else date.min
+
+    async def archive_partition(self, name: str, attached: bool) -> bool:
+        if attached and not await self._detach(name):
+            return False
+        if self.archive_mode == "file":
+            path = await self._write_archive(name)
+            await self._drop(name)
+            logger.info(f"Archived partition {name} to {path}")
+        else:
+            logger.info(f"Detached partition {name}; it stays in the database until dropped by hand")
+        return True
+
+    @unit_of_work
+    async def _detach(self, name: str) -> bool:
+        db = current_session()
+        last_id = await db.scalar(text(f"SELECT max(id) FROM {name}"))
+        watermark = await db.get(RollupWatermark, PARENT)
+        if last_id is not None and (watermark is None or watermark.last_id < last_id):
+            logger.warning(f"Not archiving {name}: statistics rollup has not reached id {last_id} yet")
+            return False
+        # Short transaction: DETACH locks the parent until commit
+        await db.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        return True
+
+    @unit_of_work
+    async def _write_archive(self, name: str) -> str:
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{name}.csv.gz")
+        partial = path + ".partial"
+
+        result = await current_session().stream(
+            text(f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM {name} ORDER BY id")
+            .execution_options(yield_per=self.batch_size)
+        )
+        with gzip.open(partial, "wt", newline="", encoding="utf-8") as stream:
+            writer = csv.writer(stream)
+            writer.writerow(ARCHIVE_COLUMNS)
+            async for row in result:
+                writer.writerow(row)
+
+        os.replace(partial, path)
+        return path
+
+    @unit_of_work
+    async def _drop(self, name: str) -> None:
+        await current_session().execute(text(f"DROP TABLE {name}"))
+
+    @staticmethod
+    def _month(name: str) -> date:
+        match = PARTITION_RE.match(name)
+        return date(int(match.group(1)), int(match.group(2)), 1)
@@ -1,33 +1,63 @@
-import random
-from datetime import datetime
-from database.session import get_db
-from database.repositories import WordRepository, UserSettingsRepository
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from config.config import Config
+from database.cache import LRUCache
+from database.unit_of_work import after_commit, current_session, current_uow
+from database.repositories import WordRepository, StatisticsRepository, UserSettingsRepository
 from database.models import PracticeSession
 from bot.services.ai_service import AIService
+from bot.services.ai_limiter import PRIORITY_INTERACTIVE
+from bot.services.precheck import SentencePrechecker
+from bot.services.spaced_repetition import SKIP_DELAY, schedule_review, quality_from_result
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True)
+class Reminder:
+    settings_id: int
+    # For private chats the chat id is the user's telegram id
+    chat_id: int
+    word: str | None
+    interval: int
+
+
 class PracticeService:
-    def __init__(self):
+    def __init__(self, prechecker: SentencePrechecker | None = None):
         self.ai_service = AIService()
-        self.daily_limit = 50
+        self.prechecker = prechecker or SentencePrechecker()
+        self.daily_limit = Config.DAILY_SENTENCE_LIMIT
+        # (user_id, date) -> sentences evaluated today; kept in step with the user_statistics upserts
+        self._daily_counts = LRUCache(maxsize=Config.DAILY_COUNT_CACHE_SIZE, ttl=Config.DAILY_COUNT_CACHE_TTL)
 
-    async def evaluate_sentence(self, user_id: int, word_id: int, sentence: str) -> dict:
-        db = next(get_db())
+    async def evaluate_sentence(
+        self, user_id: int, word_id: int, sentence: str, on_queued=None, on_progress=None
+    ) -> dict:
+        db = current_session()
         try:
-            if self._exceeded_daily_limit(user_id):
+            if await self._exceeded_daily_limit(user_id):
                 return {
                     "is_correct": False,
-                    "feedback": "Daily limit reached (50/day)",
+                    "feedback": f"Daily limit reached ({self.daily_limit}/day)",
                     "correction": sentence
                 }
 
-            word = WordRepository(db).get_word_by_id(word_id)
+            word = await WordRepository(db).get_word_by_id(word_id)
             if not word:
                 return None
 
-            result = await self.ai_service.check_sentence(word.word, sentence)
+            precheck = self.prechecker.check(word, sentence)
+            if precheck:
+                return precheck
+
+            await current_uow().release()
+            result = await self.ai_service.check_sentence(
+                word.word, sentence, priority=PRIORITY_INTERACTIVE, on_queued=on_queued, on_progress=on_progress
+            )
+            if result.get("error"):
+                # Nothing was checked: don't record it or count it against the daily limit
+                return result
 
             session = PracticeSession(
                 user_id=user_id,
@@ -38,7 +68,14 @@ class PracticeService:
                 created_at=datetime.utcnow()
             )
             db.add(session)
-            db.commit()
+
+            today = session.created_at.date()
+            total = await StatisticsRepository(db).record_sentence(user_id, result['is_correct'], today)
+            after_commit(db, lambda: self._daily_counts.set((user_id, today), total))
+
+            # release() may have detached the word; re-attach it so the new schedule is saved
+            db.add(word)
+            schedule_review(word, quality_from_result(result))
 
             return result
         except Exception as e:
@@ -46,45 +83,61 @@ class PracticeService:
             return {
                 "is_correct": False,
                 "feedback": "Evaluation error",
-                "correction": sentence
+                "correction": sentence,
+                "error": True
             }
-        finally:
-            db.close()
 
-    def _exceeded_daily_limit(self, user_id: int) -> bool:
-        db = next(get_db())
-        try:
-            today = datetime.utcnow().date()
-            count = db.query(PracticeSession)\
-                .filter(
-                    PracticeSession.user_id == user_id,
-                    PracticeSession.created_at >= today
-                )\
-                .count()
-            return count >= self.daily_limit
-        finally:
-            db.close()
-
-    def get_random_word(self, user_id):
-        db = next(get_db())
-        try:
-            words = WordRepository(db).get_user_words(user_id)
-            if not words:
-                return None
+    async def _exceeded_daily_limit(self, user_id: int) -> bool:
+        today = datetime.utcnow().date()
+        count = self._daily_counts.get((user_id, today))
+        if count is None:
+            count = await StatisticsRepository(current_session()).get_daily_total(user_id, today)
+            self._daily_counts.set((user_id, today), count)
+        return count >= self.daily_limit
+
+    async def get_next_word(self, user_id, exclude_id=None):
+        """The word to practise next; it is deferred by SKIP_DELAY in case it is never answered."""
+        return await WordRepository(current_session()).take_next_due_word(
+            user_id, datetime.utcnow(), SKIP_DELAY, exclude_id
+        )
 
-            recent_sessions = db.query(PracticeSession.word_id) \
-                .filter(PracticeSession.user_id == user_id) \
-                .order_by(PracticeSession.created_at.desc()) \
-                .limit(5) \
-                .all()
+    async def claim_reminder_batch(self, now: datetime, batch_size: int, lease: timedelta) -> list[Reminder]:
+        """Claim due reminders and pick each user's next word, leasing the rows for `lease`.
 
-            recent_word_ids = {session.word_id for session in recent_sessions}
+        Claimed rows become due again once the lease runs out, so a reminder that is never
+        confirmed with `confirm_reminders` (failed send, crash) is retried rather than lost.
+        Returns the reminders to send once the transaction is committed; `word` is None for
+        users without words.
+        """
+        db = current_session()
+        settings_repo = UserSettingsRepository(db)
+        due = await settings_repo.claim_due_reminders(now, batch_size)
+        if not due:
+            return []
 
-            available_words = [word for word in words if word.id not in recent_word_ids]
+        words = await WordRepository(db).get_next_due_words([row.user_id for row in due])
 
-            if available_words:
-                return random.choice(available_words)
-            else:
-                return random.choice(words)
-        finally:
-            db.close()
\ No newline at end of file
+        updates = []
+        reminders = []
+        for row in due:
+            word = words.get(row.user_id)
+            update = {"id": row.id, "next_reminder_at": now + lease}
+            if word:
+                update["last_word_id"] = word.id
+            updates.append(update)
+            reminders.append(Reminder(row.id, row.telegram_id, word.word if word else None, row.practice_interval))
+
+        await settings_repo.bulk_update(updates)
+        logger.info("Claimed %d due reminders, %d with words", len(due), sum(1 for r in reminders if r.word))
+        return reminders
+
+    async def confirm_reminders(self, reminders: list[Reminder], now: datetime) -> None:
+        """Schedule the next reminder for each handled one, ending its lease."""
+        await UserSettingsRepository(current_session()).bulk_update([
+            {
+                "id": reminder.settings_id,
+                "next_reminder_at": now + timedelta(minutes=reminder.interval),
+                "last_practice_time": now
+            }
+            for reminder in reminders
+        ])
@@ -0,0 +1,170 @@
+import re
+from typing import Callable, Optional
+from telegram.helpers import escape_markdown
+
+TOKEN_RE = re.compile(r"[^\W\d_]+(?:['’-][^\W\d_]+)*")
+LATIN_RE = re.compile(r"[A-Za-z]")
+
+IRREGULAR_FORMS = {
+    "be": {"am", "is", "are", "was", "were", "been", "being"},
+    "have": {"has", "had", "having"},
+    "do": {"does", "did", "done", "doing"},
+    "go": {"goes", "went", "gone", "going"},
+    "make": {"made"},
+    "take": {"took", "taken"},
+    "get": {"got", "gotten"},
+    "give": {"gave", "given"},
+    "come": {"came"},
+    "see": {"saw", "seen"},
+    "know": {"knew", "known"},
+    "think": {"thought"},
+    "bring": {"brought"},
+    "buy": {"bought"},
+    "catch": {"caught"},
+    "teach": {"taught"},
+    "find": {"found"},
+    "tell": {"told"},
+    "say": {"said"},
+    "pay": {"paid"},
+    "leave": {"left"},
+    "feel": {"felt"},
+    "keep": {"kept"},
+    "sleep": {"slept"},
+    "meet": {"met"},
+    "run": {"ran"},
+    "begin": {"began", "begun"},
+    "write": {"wrote", "written"},
+    "speak": {"spoke", "spoken"},
+    "break": {"broke", "broken"},
+    "choose": {"chose", "chosen"},
+    "eat": {"ate", "eaten"},
+    "fall": {"fell", "fallen"},
+    "drive": {"drove", "driven"},
+    "rise": {"rose", "risen"},
+    "grow": {"grew", "grown"},
+    "throw": {"threw", "thrown"},
+    "fly": {"flew", "flown", "flies"},
+    "swim": {"swam", "swum"},
+    "sing": {"sang", "sung"},
+    "drink": {"drank", "drunk"},
+    "stand": {"stood"},
+    "understand": {"understood"},
+    "sell": {"sold"},
+    "send": {"sent"},
+    "spend": {"spent"},
+    "build": {"built"},
+    "lose": {"lost"},
+    "hold": {"held"},
+    "lead": {"led"},
+    "child": {"children"},
+    "man": {"men"},
+    "woman": {"women"},
+    "person": {"people"},
+    "foot": {"feet"},
+    "tooth": {"teeth"},
+    "mouse": {"mice"},
+    "good": {"better", "best"},
+    "bad": {"worse", "worst"},
+}
+
+VOWELS = set("aeiouy")
+
+
+def inflections(word: str) -> set[str]:
+    """Regular and common irregular English forms of a single lowercase word."""
+    forms = {word, word + "s", word + "es", word + "ed", word + "d", word + "ing", word + "er", word + "est", word + "ly"}
+    if word.endswith("y") and len(word) > 2 and word[-2] not in VOWELS:
+        stem = word[:-1]
+        forms |= {stem + "ies", stem + "ied", stem + "ier", stem + "iest", stem + "ily"}
+    if word.endswith("e"):
+        stem = word[:-1]
+        forms |= {stem + "ing", stem + "ed", stem + "er", stem + "est"}
+    if word.endswith("ie"):
+        forms.add(word[:-2] + "ying")
+    if len(word) >= 3 and word[-1] not in VOWELS | {"w", "x"} and word[-2] in VOWELS and word[-3] not in VOWELS:
+        forms |= {word + word[-1] + "ed", word + word[-1] + "ing", word + word[-1] + "er", word + word[-1] + "est"}
+    forms |= IRREGULAR_FORMS.get(word, set())
+    return forms
+
+
+def normalize(text: str) -> str:
+    return " ".join(token.lower() for token in TOKEN_RE.findall(text))
+
+
+def contains_word(word: str, sentence: str) -> bool:
+    """True if every token of `word` (a word or phrase) appears in `sentence` in some inflected form."""
+    sentence_tokens = set()
+    for token in TOKEN_RE.findall(sentence.lower()):
+        sentence_tokens.add(token)
+        sentence_tokens.update(re.split(r"['’-]", token))
+    word_tokens = TOKEN_RE.findall(word.lower())
+    if not word_tokens:
+        return True
+    return all(inflections(token) & sentence_tokens or token in sentence_tokens for token in word_tokens)
+
+
+def check_length(word, sentence: str) -> Optional[str]:
+    tokens = TOKEN_RE.findall(sentence)
+    if len(tokens) < 2:
+        return "That's too short to check - please write a full sentence with the word."
+    if len(sentence) > 500:
+        return "That's a bit long - please keep it to one sentence (under 500 characters)."
+    return None
+
+
+def check_characters(word, sentence: str) -> Optional[str]:
+    letters = [char for char in sentence if char.isalpha()]
+    if not letters or len(letters) < len(sentence.replace(" ", "")) * 0.6:
+        return "I couldn't read that - please write a normal English sentence."
+    if sum(1 for char in letters if LATIN_RE.match(char)) < len(letters) * 0.8:
+        return "Please write your sentence in English."
+    if re.search(r"(.)\1{4,}", sentence):
+        return "I couldn't read that - please write a normal English sentence."
+    tokens = TOKEN_RE.findall(sentence.lower())
+    gibberish = [token for token in tokens if len(token) > 4 and not VOWELS & set(token)]
+    if tokens and len(gibberish) * 2 >= len(tokens):
+        return "I couldn't read that - please write a normal English sentence."
+    return None
+
+
+def check_contains_word(word, sentence: str) -> Optional[str]:
+    if not contains_word(word.word, sentence):
+        # Sent with parse_mode="Markdown", where escapes are not allowed inside *bold*, so the word stays plain
+        return f"Your sentence doesn't use '{escape_markdown(word.word)}' - try again with the practice word."
+    return None
+
+
+def check_not_example(word, sentence: str) -> Optional[str]:
+    if word.example_usage and normalize(word.example_usage) == normalize(sentence):
+        return "That's the example from your dictionary - try writing your own sentence."
+    return None
+
+
+DEFAULT_RULES = [check_length, check_characters, check_contains_word, check_not_example]
+
+
+class SentencePrechecker:
+    """Cheap local checks run before a sentence is sent to the AI.
+
+    A rule takes the practice Word and the sentence and returns a feedback message when the
+    sentence can be rejected without the AI, or None to let it through. Rules run in order
+    and the first message wins.
+    """
+
+    def __init__(self, rules: list[Callable] | None = None):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+
+    def add_rule(self, rule: Callable) -> None:
+        self.rules.append(rule)
+
+    def check(self, word, sentence: str) -> dict | None:
+        for rule in self.rules:
+            feedback = rule(word, sentence)
+            if feedback:
+                return {
+                    "is_correct": False,
+                    "correction": sentence,
+                    "feedback": feedback,
+                    "prechecked": True
+                }
+        return None
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from config.config import Config
+from database.models import PracticeSession, Word
+from database.repositories import StatisticsRepository
+from database.unit_of_work import current_session, unit_of_work
+
+logger = logging.getLogger(__name__)
+
+# watermark name -> (id column, creation time column, StatisticsRepository method)
+SOURCES = {
+    "practice_sessions": (PracticeSession.id, PracticeSession.created_at, "rollup_practice"),
+    "words": (Word.id, Word.added_at, "rollup_words"),
+}
+
+
+class StatisticsRollup:
+    """Folds new practice_sessions and words rows into the per-(user, day) user_statistics rows.
+
+    Each source keeps a watermark (the last id processed) in rollup_watermarks. A batch takes
+    the next `batch_size` ids, recomputes the days they touch and moves the watermark, all in
+    one transaction, so a crash never loses or double-counts a batch. Rows younger than `lag`
+    are left for the next run because ids from transactions still in flight can commit out of
+    order. Starting from an empty watermark this backfills the whole history.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = Config.ROLLUP_BATCH_SIZE,
+        lag: float = Config.ROLLUP_LAG_SECONDS
+    ):
+        self.batch_size = batch_size
+        self.lag = timedelta(seconds=lag)
+
+    async def run(self, max_batches: int | None = Config.ROLLUP_MAX_BATCHES_PER_TICK) -> int:
+        """Process up to `max_batches` batches per source (None: until caught up); returns rows folded."""
+        total = 0
+        for name in SOURCES:
+            batches = 0
+            while max_batches is None or batches < max_batches:
+                processed, caught_up = await self.run_batch(name)
+                total += processed
+                batches += 1
+                if caught_up:
+                    break
+        return total
+
+    @unit_of_work
+    async def run_batch(self, name: str) -> tuple[int, bool]:
+        id_column, created_column, method = SOURCES[name]
+        repo = StatisticsRepository(current_session())
+
+        watermark = await repo.claim_watermark(name)
+        if watermark is None:
+            logger.info(f"Rollup of {name} is running elsewhere, skipping")
+            return 0, True
+
+        rows = await repo.get_pending_ids(id_column, created_column, watermark.last_id, self.batch_size)
+        cutoff = datetime.utcnow() - self.lag
+        until_id = watermark.last_id
+        for row_id, created in rows:
+            if created is not None and created > cutoff:
+                break
+            until_id = row_id
+
+        if until_id == watermark.last_id:
+            return 0, True
+
+        days = await getattr(repo, method)(watermark.last_id, until_id)
+        logger.info(f"Rolled up {name} ids {watermark.last_id + 1}..{until_id} into {days} daily rows")
+        processed = sum(1 for row_id, _ in rows if row_id <= until_id)
+        watermark.last_id = until_id
+        return processed, processed < len(rows) or len(rows) < self.batch_size
+
+
+async def backfill():
+    logging.basicConfig(level=logging.INFO)
+    rows = await StatisticsRollup(lag=0).run(max_batches=None)
+    logger.info(f"Backfill complete: {rows} rows folded into user_statistics")
+
+
+if __name__ == "__main__":
+    # python -m bot.services.rollup
+    asyncio.run(backfill())
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+MIN_EASE = 1.3
+RELEARN_DELAY = timedelta(minutes=10)
+# A word handed out for practice but not answered comes back after this
+SKIP_DELAY = timedelta(minutes=10)
+
+
+def quality_from_result(result: dict) -> int:
+    """Map an AI evaluation to an SM-2 answer quality (0-5)."""
+    return 4 if result.get("is_correct") else 2
+
+
+def schedule_review(word, quality: int, now: datetime | None = None) -> None:
+    """Apply one SM-2 review to `word` in place and set its next due time."""
+    now = now or datetime.utcnow()
+
+    if quality < 3:
+        word.repetitions = 0
+        word.interval_days = 0
+        word.due_at = now + RELEARN_DELAY
+    else:
+        word.repetitions = (word.repetitions or 0) + 1
+        if word.repetitions == 1:
+            word.interval_days = 1
+        elif word.repetitions == 2:
+            word.interval_days = 6
+        else:
+            word.interval_days = round((word.interval_days or 1) * (word.ease or 2.5), 2)
+        word.due_at = now + timedelta(days=word.interval_days)
+
+    ease = (word.ease or 2.5) + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    word.ease = max(MIN_EASE, ease)
+    word.last_practiced = now
\ No newline at end of file
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+from database.repositories import StatisticsRepository
+
+
+def current_streak(practice_dates: list[date], today: date) -> int:
+    """Consecutive practice days ending today (or yesterday, if today has no practice yet)."""
+    streak = 0
+    expected = today
+    for day in practice_dates:
+        if day == expected or (streak == 0 and day == today - timedelta(days=1)):
+            streak += 1
+            expected = day - timedelta(days=1)
+        elif day < expected:
+            break
+    return streak
+
+
+class StatsService:
+    """User-facing statistics read from the user_statistics rollups only, O(days) per user."""
+
+    def __init__(self, db):
+        self.stats_repo = StatisticsRepository(db)
+
+    async def get_summary(self, user_id: int, today: date, days: int = 7) -> dict:
+        since = today - timedelta(days=days - 1)
+        rows = {row.date.date(): row for row in await self.stats_repo.get_days(user_id, since)}
+        totals = await self.stats_repo.get_totals(user_id)
+        practice_dates = await self.stats_repo.get_practice_dates(user_id)
+
+        history = []
+        for offset in range(days):
+            day = since + timedelta(days=offset)
+            row = rows.get(day)
+            history.append({
+                "date": day,
+                "sentences": row.total_sentences if row else 0,
+                "correct": row.correct_sentences if row else 0,
+                "words_added": row.words_added if row else 0
+            })
+
+        return {
+            "words_added": totals.words_added,
+            "sentences": totals.total_sentences,
+            "correct": totals.correct_sentences,
+            "streak": current_streak(practice_dates, today),
+            "history": history
+        }
@@ -1,16 +1,19 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from bot.services.user_service import UserService
 from database.repositories.teacher_repo import TeacherRepository
 
 class TeacherService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.user_service = UserService(db)
         self.teacher_repo = TeacherRepository(db)
 
     async def add_teacher(self, student_id, teacher_username):
-        teacher = self.user_service.get_by_username(teacher_username)
+        teacher = await self.user_service.get_by_username(teacher_username)
         if not teacher:
             return None
 
-        return self.teacher_repo.add_teacher(student_id, teacher.id)
\ No newline at end of file
+        return await self.teacher_repo.add_teacher(student_id, teacher.id)
+
+    async def get_class_stats(self, teacher_id):
+        return await self.teacher_repo.get_class_stats(teacher_id)
@@ -1,13 +1,13 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database.repositories.user_repo import UserRepository
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.user_repo = UserRepository(db)
 
-    def get_by_username(self, username):
-        return self.user_repo.get_by_username(username)
+    async def get_by_username(self, username):
+        return await self.user_repo.get_by_username(username)
 
-    def get_or_create(self, telegram_user):
-        return self.user_repo.get_or_create(telegram_user)
\ No newline at end of file
+    async def get_or_create(self, telegram_user):
+        return await self.user_repo.get_or_create(telegram_user)
\ No newline at end of file
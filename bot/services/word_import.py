@@ -0,0 +1,133 @@
+import csv
+import logging
+from dataclasses import dataclass, field
+from typing import Iterator, TextIO
+from config.config import Config
+from database.repositories import WordRepository
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("word", "translation", "synonym", "example_usage")
+HEADER_ALIASES = {
+    "word": "word",
+    "english": "word",
+    "translation": "translation",
+    "synonym": "synonym",
+    "synonyms": "synonym",
+    "example": "example_usage",
+    "example_usage": "example_usage",
+}
+MAX_LENGTHS = {"word": 100, "translation": 100, "synonym": 100}
+MAX_REPORTED_ERRORS = 5
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    truncated: bool = False
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line: int, reason: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, reason))
+
+
+def detect_dialect(stream: TextIO, filename: str | None = None):
+    sample = stream.read(4096)
+    stream.seek(0)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        return csv.excel_tab if (filename or "").lower().endswith(".tsv") else csv.excel
+
+
+def iter_rows(stream: TextIO, filename: str | None = None) -> Iterator[tuple[int, dict | None, str | None]]:
+    """Yield (line, word_data, error) for each data row, reading the file one row at a time.
+
+    Columns are positional (word, translation, synonym, example) unless the first row is a
+    header naming at least `word` and `translation`, in which case columns are matched by name.
+    """
+    reader = csv.reader(stream, detect_dialect(stream, filename))
+    columns = list(range(len(FIELDS)))
+    names = list(FIELDS)
+
+    for cells in reader:
+        line = reader.line_num
+        if not any(cell.strip() for cell in cells):
+            continue
+
+        if line == 1:
+            header = [HEADER_ALIASES.get(cell.strip().lower()) for cell in cells]
+            if "word" in header and "translation" in header:
+                columns, names = zip(*[(i, name) for i, name in enumerate(header) if name])
+                continue
+
+        data = {name: (cells[i].strip() or None) if i < len(cells) else None for i, name in zip(columns, names)}
+        yield line, data, validate_row(data)
+
+
+def validate_row(data: dict) -> str | None:
+    if not data.get("word"):
+        return "missing word"
+    if not data.get("translation"):
+        return "missing translation"
+    for name, limit in MAX_LENGTHS.items():
+        if data.get(name) and len(data[name]) > limit:
+            return f"{name} longer than {limit} characters"
+    return None
+
+
+class WordImportService:
+    """Bulk vocabulary import from CSV/TSV files.
+
+    Rows are parsed as they are read and inserted in batches of `batch_size`; the database skips
+    words the owner already has, so memory stays bounded by one batch whatever the vocabulary
+    size. Everything runs in the caller's unit of work, so an import is committed once or not
+    at all.
+    """
+
+    def __init__(self, db, batch_size: int = Config.IMPORT_BATCH_SIZE, max_rows: int = Config.IMPORT_MAX_ROWS):
+        self.word_repo = WordRepository(db)
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+
+    async def import_words(self, owner_id: int, stream: TextIO, filename: str | None = None) -> ImportResult:
+        result = ImportResult()
+        batch = {}
+        rows = 0
+
+        for line, data, error in iter_rows(stream, filename):
+            rows += 1
+            if rows > self.max_rows:
+                result.truncated = True
+                break
+            if error:
+                result.add_error(line, error)
+                continue
+
+            # Repeats within a batch are dropped here; earlier batches are already inserted, so
+            # the database catches repeats across batches along with the owner's existing words
+            key = data["word"].lower()
+            if key in batch:
+                result.duplicates += 1
+                continue
+
+            batch[key] = data
+            if len(batch) >= self.batch_size:
+                await self._insert(owner_id, batch, result)
+                batch = {}
+
+        await self._insert(owner_id, batch, result)
+        logger.info(
+            f"Import for user {owner_id}: {result.imported} added, "
+            f"{result.duplicates} duplicates, {result.invalid} invalid"
+        )
+        return result
+
+    async def _insert(self, owner_id: int, batch: dict, result: ImportResult) -> None:
+        added = await self.word_repo.add_new_words(owner_id, list(batch.values()))
+        result.imported += added
+        result.duplicates += len(batch) - added
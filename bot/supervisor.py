@@ -0,0 +1,273 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import queue
+import signal
+import time
+from telegram import Bot, Update
+from telegram.error import TelegramError
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Update fields that carry a chat, checked in order; falls back to the sender, then the update id
+CHAT_FIELDS = (
+    "message", "edited_message", "channel_post", "edited_channel_post", "callback_query",
+    "my_chat_member", "chat_member", "chat_join_request"
+)
+SENDER_FIELDS = ("inline_query", "chosen_inline_result", "shipping_query", "pre_checkout_query", "poll_answer")
+
+
+def chat_key(data: dict) -> int:
+    for field in CHAT_FIELDS:
+        payload = data.get(field)
+        if not payload:
+            continue
+        chat = payload.get("chat") or (payload.get("message") or {}).get("chat")
+        if chat:
+            return chat["id"]
+        sender = payload.get("from")
+        if sender:
+            return sender["id"]
+    for field in SENDER_FIELDS:
+        sender = (data.get(field) or {}).get("from") or (data.get(field) or {}).get("user")
+        if sender:
+            return sender["id"]
+    return data.get("update_id", 0)
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Jump consistent hash (Lamping & Veach): growing from N to N+1 buckets moves only 1/(N+1) of the keys."""
+    key &= 0xFFFFFFFFFFFFFFFF
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+
+def shard_for(data: dict, shards: int) -> int:
+    return jump_hash(chat_key(data), shards)
+
+
+class ShardSupervisor:
+    """Runs `workers` bot processes and routes every update to one of them by chat id.
+
+    The supervisor only receives updates (long polling or the webhook endpoint) and puts the
+    raw JSON on the owning worker's queue, so all updates of a chat go to the same process in
+    the order Telegram sent them, and each worker handles them in that order. Workers run the
+    normal handler registrations; periodic jobs run only in worker 0, and the Telegram and
+    OpenAI rate budgets and the database pool (see database/session.py) are split evenly
+    between workers. A worker that dies is restarted
+    with backoff and picks up its queue where the old one stopped. On shutdown the supervisor
+    stops receiving, lets the workers drain their queues and then stops them.
+    """
+
+    def __init__(
+        self,
+        workers: int = Config.BOT_WORKERS,
+        queue_size: int = Config.WORKER_QUEUE_SIZE,
+        drain_timeout: float = Config.WORKER_DRAIN_TIMEOUT
+    ):
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self._context = multiprocessing.get_context("spawn")
+        self.queues = [self._context.Queue(maxsize=queue_size) for _ in range(workers)]
+        self.processes = [None] * workers
+        self.restarts = [0] * workers
+        self._started = [0.0] * workers
+        # When each dead worker is due to be restarted, so one worker's backoff never delays another
+        self._restart_at: list[float | None] = [None] * workers
+        self._stopping = False
+        self._offset = None
+
+        self.routed = 0
+        self.dropped = 0
+
+    def route(self, data: dict) -> bool:
+        shard = shard_for(data, self.workers)
+        try:
+            self.queues[shard].put_nowait(json.dumps(data))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.routed += 1
+        return True
+
+    def ready(self) -> bool:
+        return all(process is not None and process.is_alive() for process in self.processes)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "alive": sum(1 for process in self.processes if process is not None and process.is_alive()),
+            "restarts": sum(self.restarts),
+            "routed": self.routed,
+            "queue_full": self.dropped
+        }
+
+    def _start_worker(self, index: int) -> None:
+        process = self._context.Process(
+            target=run_worker,
+            args=(index, self.workers, self.queues[index]),
+            name=f"bot-worker-{index}"
+        )
+        process.start()
+        self.processes[index] = process
+        self._started[index] = time.monotonic()
+        logger.info("Started worker %d (pid %s)", index, process.pid)
+
+    async def _monitor(self) -> None:
+        while not self._stopping:
+            self._check_workers(time.monotonic())
+            await asyncio.sleep(1)
+
+    def _check_workers(self, now: float) -> None:
+        for index, process in enumerate(self.processes):
+            restart_at = self._restart_at[index]
+            if restart_at is not None:
+                if now >= restart_at:
+                    self._restart_at[index] = None
+                    self._start_worker(index)
+                continue
+            if process.is_alive():
+                continue
+            # Reset the backoff once a worker has stayed up for a minute since it was last started
+            if now - self._started[index] > 60:
+                self.restarts[index] = 0
+            delay = min(30, 2 ** self.restarts[index])
+            logger.error("Worker %d exited with code %s, restarting in %ss", index, process.exitcode, delay)
+            self.restarts[index] += 1
+            self._restart_at[index] = now + delay
+
+    async def _poll(self, bot: Bot) -> None:
+        await bot.delete_webhook()
+        while not self._stopping:
+            try:
+                updates = await bot.get_updates(offset=self._offset, timeout=30, allowed_updates=Update.ALL_TYPES)
+            except TelegramError as e:
+                logger.error("get_updates failed: %s", str(e))
+                await asyncio.sleep(1)
+                continue
+            for update in updates:
+                data = update.to_dict()
+                # Full worker queue: hold the offset so Telegram keeps this update and the rest in order
+                while not self.route(data):
+                    await asyncio.sleep(0.5)
+                self._offset = update.update_id + 1
+
+    async def _drain(self) -> None:
+        deadline = time.monotonic() + self.drain_timeout
+        for index, worker_queue in enumerate(self.queues):
+            try:
+                # A stuck or dead worker never makes room for the stop marker; it is terminated below
+                await asyncio.to_thread(worker_queue.put, None, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                logger.warning("Worker %d queue is still full, not waiting for it to drain", index)
+        for index, process in enumerate(self.processes):
+            while process.is_alive() and time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+            if process.is_alive():
+                logger.warning("Worker %d did not drain in time, terminating", index)
+                process.terminate()
+            process.join(5)
+
+    async def serve(self, mode: str = Config.BOT_MODE) -> None:
+        for index in range(self.workers):
+            self._start_worker(index)
+        monitor = asyncio.create_task(self._monitor())
+
+        from bot.webhook import wait_for_stop_signal
+        bot = Bot(Config.TELEGRAM_BOT_TOKEN)
+        await bot.initialize()
+        endpoint = None
+        receiver = None
+        if mode == "webhook":
+            from bot.webhook import WebhookEndpoint
+            endpoint = WebhookEndpoint(self.route, self.ready, self.stats)
+            await endpoint.start(bot)
+        else:
+            receiver = asyncio.create_task(self._poll(bot))
+
+        try:
+            await wait_for_stop_signal()
+        finally:
+            logger.info("Stopping: no new updates, draining workers")
+            self._stopping = True
+            if endpoint is not None:
+                await endpoint.stop()
+            if receiver is not None:
+                receiver.cancel()
+                await asyncio.gather(receiver, return_exceptions=True)
+                if self._offset is not None:
+                    # Confirm what was already routed so it isn't delivered again after a restart
+                    await bot.get_updates(offset=self._offset, timeout=0)
+            monitor.cancel()
+            await asyncio.gather(monitor, return_exceptions=True)
+            await self._drain()
+            await bot.shutdown()
+
+
+def run_worker(index: int, workers: int, updates: multiprocessing.Queue) -> None:
+    """Worker process entry point."""
+    # Shutdown is coordinated by the supervisor through the queue, not by terminal signals
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Per-process share of the bot-wide limits
+    Config.RUN_JOBS = Config.RUN_JOBS and index == 0
+    Config.TELEGRAM_GLOBAL_RATE = Config.TELEGRAM_GLOBAL_RATE / workers
+    Config.AI_REQUESTS_PER_MINUTE = max(1, Config.AI_REQUESTS_PER_MINUTE // workers)
+    Config.AI_TOKENS_PER_MINUTE = max(1, Config.AI_TOKENS_PER_MINUTE // workers)
+    Config.METRICS_PORT = Config.METRICS_PORT + index
+
+    logging.basicConfig(
+        format=f'%(asctime)s - worker {index} - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
+    asyncio.run(_worker_main(updates))
+
+
+async def _worker_main(updates: multiprocessing.Queue) -> None:
+    from main import build_application
+    from bot.webhook import start_application, stop_application
+
+    application = build_application()
+    await start_application(application)
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(Config.WORKER_CONCURRENCY)
+    # Bounded read-ahead, so a busy worker leaves updates in its queue and the supervisor sees it full
+    pending = asyncio.Semaphore(Config.WORKER_CONCURRENCY * 4)
+    # Last pending task per chat: a chat's next update waits for it, other chats run concurrently
+    chat_tails: dict[int, asyncio.Task] = {}
+
+    async def process(data: dict, previous: asyncio.Task | None) -> None:
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        async with semaphore:
+            try:
+                await application.process_update(Update.de_json(data, application.bot))
+            except Exception as e:
+                logger.error("Failed to process update %s: %s", data.get("update_id"), str(e))
+
+    def finished(task: asyncio.Task, key: int) -> None:
+        pending.release()
+        if chat_tails.get(key) is task:
+            del chat_tails[key]
+
+    while True:
+        await pending.acquire()
+        raw = await loop.run_in_executor(None, updates.get)
+        if raw is None:
+            break
+        data = json.loads(raw)
+        key = chat_key(data)
+        task = asyncio.create_task(process(data, chat_tails.get(key)))
+        chat_tails[key] = task
+        task.add_done_callback(lambda done, key=key: finished(done, key))
+
+    if chat_tails:
+        await asyncio.gather(*chat_tails.values(), return_exceptions=True)
+    await stop_application(application)
@@ -0,0 +1,4 @@
+from .rate_limit import TokenBucket
+from .metrics import Counter, Gauge, Histogram, Registry, REGISTRY
+
+__all__ = ['TokenBucket', 'Counter', 'Gauge', 'Histogram', 'Registry', 'REGISTRY']
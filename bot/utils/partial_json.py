@@ -0,0 +1,76 @@
+import json
+
+_LITERALS = (("true", True), ("false", False), ("null", None))
+
+
+def _skip_whitespace(text: str, i: int) -> int:
+    while i < len(text) and text[i] in " \t\r\n":
+        i += 1
+    return i
+
+
+def _read_string(text: str, i: int) -> tuple[str, int, bool]:
+    """Decode the JSON string starting at the quote at `i`; returns (value, end, complete).
+
+    An unterminated string yields what has arrived so far, up to the last whole escape. A high
+    surrogate escape at the end is held back until its pair arrives, so the text only grows.
+    """
+    start = i + 1
+    i = start
+    high_surrogate = None
+    while i < len(text):
+        char = text[i]
+        if char == '"':
+            return json.loads(text[start - 1:i + 1]), i + 1, True
+        if char == "\\":
+            size = 6 if text[i + 1:i + 2] == "u" else 2
+            if i + size > len(text):
+                break
+            high_surrogate = i if size == 6 and text[i + 2:i + 4].lower() in ("d8", "d9", "da", "db") else None
+            i += size
+            continue
+        high_surrogate = None
+        i += 1
+    end = high_surrogate if high_surrogate is not None and high_surrogate + 6 == i else i
+    return json.loads('"' + text[start:end] + '"'), i, False
+
+
+def parse_partial_json(text: str) -> dict:
+    """Top-level fields of a JSON object that may still be arriving (e.g. a streamed completion).
+
+    Strings, booleans and null are returned as soon as they start; a string that is still
+    being written holds its text so far. Parsing stops at the first nested or numeric value
+    or at anything malformed, so the result only ever grows as more text arrives.
+    """
+    result = {}
+    i = text.find("{")
+    if i < 0:
+        return result
+    i += 1
+    while True:
+        i = _skip_whitespace(text, i)
+        if i < len(text) and text[i] == ",":
+            i = _skip_whitespace(text, i + 1)
+        if i >= len(text) or text[i] != '"':
+            return result
+
+        key, i, complete = _read_string(text, i)
+        i = _skip_whitespace(text, i)
+        if not complete or i >= len(text) or text[i] != ":":
+            return result
+        i = _skip_whitespace(text, i + 1)
+        if i >= len(text):
+            return result
+
+        if text[i] == '"':
+            result[key], i, complete = _read_string(text, i)
+            if not complete:
+                return result
+            continue
+        for literal, value in _LITERALS:
+            if text.startswith(literal, i):
+                result[key] = value
+                i += len(literal)
+                break
+        else:
+            return result
@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second refill up to `capacity`.
+
+    Waiters are served in FIFO order. `adjust` lets callers settle the difference between
+    an estimated and the real cost after the fact; the balance may go negative (debt).
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def delay(self, amount: float = 1.0) -> float:
+        """Seconds until `amount` tokens would be available, 0 if they are now."""
+        self._refill()
+        missing = min(amount, self.capacity) - self._tokens
+        return max(0.0, missing / self.rate)
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            self._tokens -= amount
+            return True
+        return False
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        async with self._lock:
+            while not self.try_acquire(amount):
+                await asyncio.sleep(self.delay(amount))
+
+    def adjust(self, delta: float) -> None:
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + delta)
+
+    def pause(self, seconds: float) -> None:
+        """Drain the bucket so nothing is granted for roughly `seconds` (e.g. after a 429)."""
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import hmac
+import json
+import logging
+import signal
+from typing import Callable
+from aiohttp import web
+from telegram import Update
+from config.config import Config
+from bot.services.message_dispatcher import get_dispatcher
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookEndpoint:
+    """HTTP side of webhook mode: verifies and parses Telegram's POSTs and hands each update
+    (as a dict) to `accept`, which returns False when there is no room for it. Refused updates
+    get a 503 and Telegram redelivers them later instead of them being buffered without limit.
+    """
+
+    def __init__(
+        self,
+        accept: Callable[[dict], bool],
+        ready: Callable[[], bool],
+        stats: Callable[[], dict],
+        path: str = Config.WEBHOOK_PATH,
+        secret: str | None = Config.WEBHOOK_SECRET
+    ):
+        self.accept = accept
+        self.ready = ready
+        self.extra_stats = stats
+        self.path = path
+        self.secret = secret
+        self._runner = None
+
+        self.received = 0
+        self.rejected = 0
+        self.dropped = 0
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(self.path, self.handle_update)
+        app.router.add_get("/healthz", self.handle_health)
+        app.router.add_get("/readyz", self.handle_ready)
+        return app
+
+    async def handle_update(self, request: web.Request) -> web.Response:
+        if self.secret and not hmac.compare_digest(request.headers.get(SECRET_HEADER, ""), self.secret):
+            self.rejected += 1
+            return web.Response(status=403)
+
+        try:
+            data = await request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self.rejected += 1
+            return web.Response(status=400)
+        if not isinstance(data, dict):
+            self.rejected += 1
+            return web.Response(status=400)
+
+        if not self.accept(data):
+            self.dropped += 1
+            logger.warning("No room for update %s, asking Telegram to retry", data.get("update_id"))
+            return web.Response(status=503, headers={"Retry-After": "1"})
+
+        self.received += 1
+        return web.Response()
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    async def handle_ready(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats(), status=200 if self.ready() else 503)
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            **self.extra_stats()
+        }
+
+    async def start(self, bot, host: str = Config.WEBHOOK_LISTEN, port: int = Config.WEBHOOK_PORT) -> None:
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        logger.info("Webhook listening on %s:%s%s", host, port, self.path)
+
+        if Config.WEBHOOK_URL:
+            await bot.set_webhook(
+                url=Config.WEBHOOK_URL.rstrip("/") + self.path,
+                secret_token=self.secret,
+                max_connections=Config.WEBHOOK_MAX_CONNECTIONS,
+                allowed_updates=Update.ALL_TYPES
+            )
+            logger.info("Webhook registered with Telegram")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+class WebhookServer:
+    """Single-process webhook mode.
+
+    Telegram's POST is answered as soon as the update is queued; `workers` tasks drain the
+    bounded queue through `application.process_update`, so handler concurrency is capped and a
+    slow handler never holds the HTTP request open. The server is stateless apart from that
+    queue, so several replicas can run behind a load balancer (with RUN_JOBS on only one).
+    """
+
+    def __init__(
+        self,
+        application,
+        path: str = Config.WEBHOOK_PATH,
+        secret: str | None = Config.WEBHOOK_SECRET,
+        queue_size: int = Config.WEBHOOK_QUEUE_SIZE,
+        workers: int = Config.WEBHOOK_WORKERS
+    ):
+        self.application = application
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.workers = workers
+        self.endpoint = WebhookEndpoint(self._enqueue, self._ready, self._stats, path, secret)
+        self._worker_tasks = []
+
+        self.processed = 0
+        self.failed = 0
+
+    def _enqueue(self, data: dict) -> bool:
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def _ready(self) -> bool:
+        return self.application.running and not self.queue.full()
+
+    def _stats(self) -> dict:
+        return {
+            "running": self.application.running,
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed
+        }
+
+    def stats(self) -> dict:
+        return self.endpoint.stats()
+
+    async def _work(self) -> None:
+        while True:
+            data = await self.queue.get()
+            try:
+                update = Update.de_json(data, self.application.bot)
+                await self.application.process_update(update)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error("Failed to process update: %s", str(e))
+            finally:
+                self.queue.task_done()
+
+    async def start(self, host: str = Config.WEBHOOK_LISTEN, port: int = Config.WEBHOOK_PORT) -> None:
+        await start_application(self.application)
+        self._worker_tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        await self.endpoint.start(self.application.bot, host, port)
+
+    async def stop(self, timeout: float = 10) -> None:
+        # Stop accepting updates first, then let the workers drain what was already queued
+        await self.endpoint.stop()
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Stopping with %d updates still queued", self.queue.qsize())
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        await stop_application(self.application)
+
+    async def serve(self) -> None:
+        """Run until SIGINT/SIGTERM."""
+        await self.start()
+        try:
+            await wait_for_stop_signal()
+        finally:
+            await self.stop()
+
+
+async def start_application(application) -> None:
+    """What run_polling does around the Updater: initialize, post_init, start (incl. the job queue)."""
+    await application.initialize()
+    if application.post_init:
+        await application.post_init(application)
+    await application.start()
+
+
+async def stop_application(application) -> None:
+    if application.running:
+        await application.stop()
+    # Flush queued messages while the bot can still send: shutdown() closes its HTTP client
+    await get_dispatcher().aclose()
+    await application.shutdown()
+    if application.post_shutdown:
+        await application.post_shutdown(application)
+
+
+async def wait_for_stop_signal() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+
+async def replay(path: str, url: str, secret: str | None) -> None:
+    """POST recorded updates (one JSON object per line) to a running webhook, for local testing."""
+    from aiohttp import ClientSession
+
+    headers = {SECRET_HEADER: secret} if secret else {}
+    async with ClientSession() as session:
+        with open(path, encoding="utf-8") as stream:
+            for line in stream:
+                if not line.strip():
+                    continue
+                async with session.post(url, data=line, headers={**headers, "Content-Type": "application/json"}) as response:
+                    print(response.status, line.strip()[:80])
+
+
+if __name__ == "__main__":
+    # python -m bot.webhook updates.jsonl --url http://localhost:8080/telegram
+    parser = argparse.ArgumentParser(description="Replay recorded Telegram updates against the webhook")
+    parser.add_argument("file")
+    parser.add_argument("--url", default=f"http://localhost:{Config.WEBHOOK_PORT}{Config.WEBHOOK_PATH}")
+    parser.add_argument("--secret", default=Config.WEBHOOK_SECRET)
+    args = parser.parse_args()
+    asyncio.run(replay(args.file, args.url, args.secret))
@@ -6,13 +6,106 @@ load_dotenv()
 
 class Config:
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+    TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))
+    TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))
+    TELEGRAM_GROUP_RATE = float(os.getenv("TELEGRAM_GROUP_RATE", str(20 / 60)))
+
+    # "polling" or "webhook"
+    BOT_MODE = os.getenv("BOT_MODE", "polling")
+    WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+    WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram")
+    WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+    WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+    WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+    WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+    WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "32"))
+    WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))
+
+    # Worker processes behind the sharding supervisor; 1 runs everything in this process
+    BOT_WORKERS = int(os.getenv("BOT_WORKERS", "1"))
+    WORKER_QUEUE_SIZE = int(os.getenv("WORKER_QUEUE_SIZE", "1000"))
+    WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "32"))
+    WORKER_DRAIN_TIMEOUT = int(os.getenv("WORKER_DRAIN_TIMEOUT", "20"))
+    # Periodic jobs (reminders, rollups, partition maintenance); only one process or replica needs them
+    RUN_JOBS = os.getenv("RUN_JOBS", "true").lower() == "true"
+
+    # Prometheus text format on /metrics; supervisor worker N listens on METRICS_PORT + N
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+    # Per-update SQL recording with N+1 and slow-query reports (bot/profiler.py); adds overhead, not for normal runs
+    SQL_PROFILING = os.getenv("SQL_PROFILING", "false").lower() == "true"
+    SQL_PROFILE_PATH = os.getenv("SQL_PROFILE_PATH", "sql_profile.jsonl")
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+    SQL_EXPLAIN_SLOW = os.getenv("SQL_EXPLAIN_SLOW", "true").lower() == "true"
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "3"))
+
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     MODEL_NAME = "gpt-3.5-turbo"
 
+    AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+    AI_CACHE_SIZE = int(os.getenv("AI_CACHE_SIZE", "10000"))
+    AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", "86400"))
+    AI_CACHE_PATH = os.getenv("AI_CACHE_PATH", "ai_cache.sqlite3")
+    AI_CACHE_PERSISTENT_TTL = int(os.getenv("AI_CACHE_PERSISTENT_TTL", str(30 * 86400)))
+
+    AI_BATCHING_ENABLED = os.getenv("AI_BATCHING_ENABLED", "false").lower() == "true"
+    AI_BATCH_WINDOW_MS = int(os.getenv("AI_BATCH_WINDOW_MS", "50"))
+    AI_BATCH_MAX_ITEMS = int(os.getenv("AI_BATCH_MAX_ITEMS", "10"))
+
+    # Stream corrections and edit the reply as they arrive; costs a few extra Telegram edits per answer
+    AI_STREAMING_ENABLED = os.getenv("AI_STREAMING_ENABLED", "false").lower() == "true"
+    AI_STREAM_EDIT_INTERVAL = float(os.getenv("AI_STREAM_EDIT_INTERVAL", "1.0"))
+
+    AI_LIMITER_ENABLED = os.getenv("AI_LIMITER_ENABLED", "true").lower() == "true"
+    AI_REQUESTS_PER_MINUTE = int(os.getenv("AI_REQUESTS_PER_MINUTE", "3500"))
+    AI_TOKENS_PER_MINUTE = int(os.getenv("AI_TOKENS_PER_MINUTE", "90000"))
+    AI_INITIAL_CONCURRENCY = int(os.getenv("AI_INITIAL_CONCURRENCY", "8"))
+    AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "64"))
+    AI_LATENCY_TARGET = float(os.getenv("AI_LATENCY_TARGET", "8"))
+
     DB_USER = os.getenv("DB_USER", "postgres")
     DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
     DB_HOST = os.getenv("DB_HOST", "localhost")
     DB_PORT = os.getenv("DB_PORT", "5432")
     DB_NAME = os.getenv("DB_NAME", "english_teacher_bot")
 
-    SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
\ No newline at end of file
+    SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    SQLALCHEMY_ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    # Connection budget for the whole bot; with BOT_WORKERS > 1 it is divided between the workers
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "50000"))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "3600"))
+    # Sentences a learner can have checked per UTC day
+    DAILY_SENTENCE_LIMIT = int(os.getenv("DAILY_SENTENCE_LIMIT", "50"))
+    DAILY_COUNT_CACHE_SIZE = int(os.getenv("DAILY_COUNT_CACHE_SIZE", "50000"))
+    DAILY_COUNT_CACHE_TTL = int(os.getenv("DAILY_COUNT_CACHE_TTL", "300"))
+
+    WORDS_PAGE_SIZE = int(os.getenv("WORDS_PAGE_SIZE", "20"))
+
+    IMPORT_MAX_FILE_SIZE = int(os.getenv("IMPORT_MAX_FILE_SIZE", str(5 * 1024 * 1024)))
+    IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "20000"))
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    REMINDER_TICK_SECONDS = int(os.getenv("REMINDER_TICK_SECONDS", "30"))
+    REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "500"))
+    REMINDER_MAX_BATCHES_PER_TICK = int(os.getenv("REMINDER_MAX_BATCHES_PER_TICK", "20"))
+    # A claimed reminder that was not confirmed as sent becomes due again after this
+    REMINDER_LEASE_SECONDS = int(os.getenv("REMINDER_LEASE_SECONDS", "300"))
+
+    ROLLUP_INTERVAL_SECONDS = int(os.getenv("ROLLUP_INTERVAL_SECONDS", "300"))
+    ROLLUP_BATCH_SIZE = int(os.getenv("ROLLUP_BATCH_SIZE", "5000"))
+    ROLLUP_MAX_BATCHES_PER_TICK = int(os.getenv("ROLLUP_MAX_BATCHES_PER_TICK", "10"))
+    ROLLUP_LAG_SECONDS = int(os.getenv("ROLLUP_LAG_SECONDS", "60"))
+
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS = int(os.getenv("PARTITION_MAINTENANCE_INTERVAL_SECONDS", "86400"))
+    PRACTICE_PARTITION_MONTHS_AHEAD = int(os.getenv("PRACTICE_PARTITION_MONTHS_AHEAD", "3"))
+    PRACTICE_RETENTION_MONTHS = int(os.getenv("PRACTICE_RETENTION_MONTHS", "12"))
+    # "file": gzip CSV in PRACTICE_ARCHIVE_DIR then drop. "detach": retention only, old partitions
+    # are left as standalone tables that still take disk space until dropped by hand
+    PRACTICE_ARCHIVE_MODE = os.getenv("PRACTICE_ARCHIVE_MODE", "file")
+    PRACTICE_ARCHIVE_DIR = os.getenv("PRACTICE_ARCHIVE_DIR", "archive")
\ No newline at end of file
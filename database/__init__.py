@@ -1,3 +1,3 @@
-from .session import Base, engine, get_db
+from .session import Base, engine, get_db, async_engine, AsyncSessionLocal, get_async_db
 
-__all__ = ['Base', 'engine', 'get_db']
\ No newline at end of file
+__all__ = ['Base', 'engine', 'get_db', 'async_engine', 'AsyncSessionLocal', 'get_async_db']
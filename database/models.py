@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean, BigInteger
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean, BigInteger, Float, Index, UniqueConstraint, func, text
 from sqlalchemy.orm import relationship
 from .session import Base
 
@@ -11,7 +11,7 @@ class User(Base):
     telegram_id = Column(BigInteger, unique=True, nullable=False, index=True)
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100))
-    username = Column(String(100))
+    username = Column(String(100), index=True)
     language_code = Column(String(10))
     created_at = Column(DateTime, default=datetime.utcnow)
     last_activity = Column(DateTime, onupdate=datetime.utcnow)
@@ -33,9 +33,21 @@ class Word(Base):
     example_usage = Column(Text)
     added_at = Column(DateTime, default=datetime.utcnow)
     last_practiced = Column(DateTime)
+    # SM-2 spaced repetition state, see bot/services/spaced_repetition.py
+    due_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now())
+    ease = Column(Float, nullable=False, default=2.5, server_default="2.5")
+    interval_days = Column(Float, nullable=False, default=0, server_default="0")
+    repetitions = Column(Integer, nullable=False, default=0, server_default="0")
 
     user = relationship("User", back_populates="words")
     practice_sessions = relationship("PracticeSession", back_populates="word")
+
+    __table_args__ = (
+        Index("ix_words_user_id_due_at", "user_id", "due_at"),
+        # Listing order is case-insensitive: (lower(word), id)
+        Index("ix_words_user_id_lower_word", "user_id", text("lower(word)"), "id"),
+    )
+
     def __repr__(self):
         return f"<Word(id={self.id}, word='{self.word}', translation='{self.translation}')>"
 
@@ -49,23 +61,32 @@ class UserSettings(Base):
     last_practice_time = Column(DateTime)
     notifications_enabled = Column(Boolean, default=True)
     last_word_id = Column(Integer, ForeignKey("words.id"), nullable=True)
+    # NULL when reminders are off; the reminder tick scans this index for due rows
+    next_reminder_at = Column(DateTime, nullable=True, index=True)
 
     user = relationship("User", back_populates="settings")
 
 class PracticeSession(Base):
     __tablename__ = "practice_sessions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # Range-partitioned by month on created_at (see bot/services/partitions.py), so the
+    # partition key has to be part of the primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     word_id = Column(Integer, ForeignKey("words.id"))
     user_sentence = Column(Text)
     ai_feedback = Column(Text)
     is_correct = Column(Boolean)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
 
     user = relationship("User", back_populates="practice_sessions")
     word = relationship("Word", back_populates="practice_sessions")
 
+    __table_args__ = (
+        Index("ix_practice_sessions_user_id_created_at", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"}
+    )
+
 class UserStatistics(Base):
     __tablename__ = "user_statistics"
 
@@ -78,6 +99,19 @@ class UserStatistics(Base):
 
     user = relationship("User", back_populates="statistics")
 
+    # One row per user per UTC day (date is stored as midnight); target of the counter upserts
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_user_statistics_user_id_date"),
+    )
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    # Last source row id folded into user_statistics, one row per source table
+    name = Column(String(50), primary_key=True)
+    last_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class TeacherStudent(Base):
     __tablename__ = "teacher_students"
 
@@ -86,4 +120,8 @@ class TeacherStudent(Base):
     student_id = Column(Integer, ForeignKey("users.id"))
 
     teacher = relationship("User", foreign_keys=[teacher_id], back_populates="students")
-    student = relationship("User", foreign_keys=[student_id], back_populates="teachers")
\ No newline at end of file
+    student = relationship("User", foreign_keys=[student_id], back_populates="teachers")
+
+    __table_args__ = (
+        UniqueConstraint("teacher_id", "student_id", name="uq_teacher_students_teacher_id_student_id"),
+    )
\ No newline at end of file
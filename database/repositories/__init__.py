@@ -2,7 +2,10 @@ from .user_repo import UserRepository
 from .user_settings_repo import UserSettingsRepository
 from .word_repo import WordRepository
 from .teacher_repo import TeacherRepository
+from .statistics_repo import StatisticsRepository
+from .practice_repo import PracticeSessionRepository
 
-__all__ = ['UserRepository', 'WordRepository', 'UserSettingsRepository', 'TeacherRepository']
+__all__ = ['UserRepository', 'WordRepository', 'UserSettingsRepository', 'TeacherRepository', 'StatisticsRepository',
+           'PracticeSessionRepository']
 
 
@@ -0,0 +1,31 @@
+import logging
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import PracticeSession, Word
+
+logger = logging.getLogger(__name__)
+
+
+class PracticeSessionRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def stream_history(self, user_id: int, batch_size: int = 1000):
+        """Server-side cursor over a user's practice sessions, oldest first.
+
+        Rows are plain tuples fetched `batch_size` at a time, so nothing accumulates in the
+        session's identity map however long the history is.
+        """
+        return await self.db.stream(
+            select(
+                PracticeSession.created_at,
+                Word.word,
+                PracticeSession.user_sentence,
+                PracticeSession.is_correct,
+                PracticeSession.ai_feedback
+            )
+            .outerjoin(Word, Word.id == PracticeSession.word_id)
+            .where(PracticeSession.user_id == user_id)
+            .order_by(PracticeSession.created_at, PracticeSession.id)
+            .execution_options(yield_per=batch_size)
+        )
@@ -0,0 +1,171 @@
+import logging
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from database.models import PracticeSession, RollupWatermark, UserStatistics, Word
+
+logger = logging.getLogger(__name__)
+
+
+def day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day)
+
+
+class StatisticsRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_daily_total(self, user_id: int, day: date) -> int:
+        total = await self.db.scalar(
+            select(UserStatistics.total_sentences)
+            .where(UserStatistics.user_id == user_id, UserStatistics.date == day_start(day))
+        )
+        return total or 0
+
+    async def record_sentence(self, user_id: int, is_correct: bool, day: date) -> int:
+        """Atomically bump today's counters and return the new total_sentences."""
+        correct = 1 if is_correct else 0
+        statement = insert(UserStatistics).values(
+            user_id=user_id,
+            date=day_start(day),
+            words_added=0,
+            total_sentences=1,
+            correct_sentences=correct
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="uq_user_statistics_user_id_date",
+            set_={
+                "total_sentences": UserStatistics.total_sentences + 1,
+                "correct_sentences": UserStatistics.correct_sentences + correct
+            }
+        ).returning(UserStatistics.total_sentences)
+
+        total = await self.db.scalar(statement)
+        logger.info(f"Recorded sentence for user {user_id} on {day}: {total} today")
+        return total
+
+    async def get_days(self, user_id: int, since: date):
+        result = await self.db.execute(
+            select(
+                UserStatistics.date,
+                UserStatistics.words_added,
+                UserStatistics.total_sentences,
+                UserStatistics.correct_sentences
+            )
+            .where(UserStatistics.user_id == user_id, UserStatistics.date >= day_start(since))
+            .order_by(UserStatistics.date)
+        )
+        return result.all()
+
+    async def get_totals(self, user_id: int):
+        result = await self.db.execute(
+            select(
+                func.coalesce(func.sum(UserStatistics.words_added), 0).label("words_added"),
+                func.coalesce(func.sum(UserStatistics.total_sentences), 0).label("total_sentences"),
+                func.coalesce(func.sum(UserStatistics.correct_sentences), 0).label("correct_sentences")
+            )
+            .where(UserStatistics.user_id == user_id)
+        )
+        return result.one()
+
+    async def get_practice_dates(self, user_id: int) -> list[date]:
+        """Days with at least one practiced sentence, newest first."""
+        result = await self.db.execute(
+            select(UserStatistics.date)
+            .where(UserStatistics.user_id == user_id, UserStatistics.total_sentences > 0)
+            .order_by(UserStatistics.date.desc())
+        )
+        return [value.date() for value in result.scalars().all()]
+
+    async def claim_watermark(self, name: str) -> RollupWatermark | None:
+        """Lock the watermark row for this transaction, or None if another worker holds it."""
+        await self.db.execute(
+            insert(RollupWatermark).values(name=name, last_id=0).on_conflict_do_nothing(index_elements=["name"])
+        )
+        return await self.db.scalar(
+            select(RollupWatermark).where(RollupWatermark.name == name).with_for_update(skip_locked=True)
+        )
+
+    async def get_pending_ids(self, id_column, created_column, after_id: int, limit: int):
+        """(id, created) of the next `limit` source rows after the watermark, in id order."""
+        result = await self.db.execute(
+            select(id_column, created_column).where(id_column > after_id).order_by(id_column).limit(limit)
+        )
+        return result.all()
+
+    async def rollup_practice(self, after_id: int, until_id: int) -> int:
+        """Recompute session counters for every (user, day) touched by sessions in (after_id, until_id].
+
+        Counters are recomputed and set rather than incremented, so running a range twice is
+        harmless and the online increments from record_sentence are corrected if they drifted.
+        """
+        day = func.date_trunc("day", PracticeSession.created_at)
+        touched = (
+            select(PracticeSession.user_id, day.label("day"))
+            .where(
+                PracticeSession.id > after_id,
+                PracticeSession.id <= until_id,
+                PracticeSession.user_id.is_not(None),
+                PracticeSession.created_at.is_not(None)
+            )
+            .distinct()
+            .subquery()
+        )
+        sessions = aliased(PracticeSession)
+        aggregates = (
+            select(
+                touched.c.user_id,
+                touched.c.day,
+                func.count(sessions.id),
+                func.count(sessions.id).filter(sessions.is_correct.is_(True))
+            )
+            .join(
+                sessions,
+                (sessions.user_id == touched.c.user_id)
+                & (sessions.created_at >= touched.c.day)
+                & (sessions.created_at < touched.c.day + timedelta(days=1))
+            )
+            .group_by(touched.c.user_id, touched.c.day)
+        )
+        statement = insert(UserStatistics).from_select(
+            ["user_id", "date", "total_sentences", "correct_sentences"], aggregates
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="uq_user_statistics_user_id_date",
+            set_={
+                "total_sentences": statement.excluded.total_sentences,
+                "correct_sentences": statement.excluded.correct_sentences
+            }
+        )
+        result = await self.db.execute(statement)
+        return result.rowcount
+
+    async def rollup_words(self, after_id: int, until_id: int) -> int:
+        """Recompute words_added for every (user, day) touched by words in (after_id, until_id]."""
+        day = func.date_trunc("day", Word.added_at)
+        touched = (
+            select(Word.user_id, day.label("day"))
+            .where(Word.id > after_id, Word.id <= until_id, Word.user_id.is_not(None), Word.added_at.is_not(None))
+            .distinct()
+            .subquery()
+        )
+        words = aliased(Word)
+        aggregates = (
+            select(touched.c.user_id, touched.c.day, func.count(words.id))
+            .join(
+                words,
+                (words.user_id == touched.c.user_id)
+                & (words.added_at >= touched.c.day)
+                & (words.added_at < touched.c.day + timedelta(days=1))
+            )
+            .group_by(touched.c.user_id, touched.c.day)
+        )
+        statement = insert(UserStatistics).from_select(["user_id", "date", "words_added"], aggregates)
+        statement = statement.on_conflict_do_update(
+            constraint="uq_user_statistics_user_id_date",
+            set_={"words_added": statement.excluded.words_added}
+        )
+        result = await self.db.execute(statement)
+        return result.rowcount
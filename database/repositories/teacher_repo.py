@@ -1,19 +1,86 @@
-from sqlalchemy.orm import Session
-from database.models import TeacherStudent
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import PracticeSession, TeacherStudent, User, UserStatistics, Word
 
 class TeacherRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def add_teacher(self, student_id, teacher_id):
-        relation = TeacherStudent(student_id=student_id, teacher_id=teacher_id)
-        self.db.add(relation)
-        self.db.commit()
-        self.db.refresh(relation)
-        return relation
+    async def add_teacher(self, student_id, teacher_id):
+        # Adding the same teacher twice is a no-op instead of a unique violation
+        await self.db.execute(
+            insert(TeacherStudent)
+            .values(student_id=student_id, teacher_id=teacher_id)
+            .on_conflict_do_nothing(constraint="uq_teacher_students_teacher_id_student_id")
+        )
+        return await self.db.scalar(
+            select(TeacherStudent).filter_by(teacher_id=teacher_id, student_id=student_id)
+        )
 
-    def get_student_teachers(self, student_id):
-        return self.db.query(TeacherStudent).filter_by(student_id=student_id).all()
+    async def is_teacher_of(self, teacher_id, student_id) -> bool:
+        relation_id = await self.db.scalar(
+            select(TeacherStudent.id)
+            .where(TeacherStudent.teacher_id == teacher_id, TeacherStudent.student_id == student_id)
+            .limit(1)
+        )
+        return relation_id is not None
 
-    def get_teacher_students(self, teacher_id):
-        return self.db.query(TeacherStudent).filter_by(teacher_id=teacher_id).all()
\ No newline at end of file
+    async def get_student_teachers(self, student_id):
+        result = await self.db.execute(select(TeacherStudent).filter_by(student_id=student_id))
+        return result.scalars().all()
+
+    async def get_teacher_students(self, teacher_id):
+        result = await self.db.execute(select(TeacherStudent).filter_by(teacher_id=teacher_id))
+        return result.scalars().all()
+
+    async def get_class_stats(self, teacher_id):
+        """Per-student overview for a teacher's whole class in one statement.
+
+        Word counts and the daily user_statistics counters are grouped over the class's students
+        only and the last practice time is an index probe per student, so the cost follows the
+        class size rather than the total practice history.
+        """
+        students = select(TeacherStudent.student_id).where(TeacherStudent.teacher_id == teacher_id)
+
+        words = (
+            select(Word.user_id, func.count().label("words"))
+            .where(Word.user_id.in_(students))
+            .group_by(Word.user_id)
+            .subquery()
+        )
+        practice = (
+            select(
+                UserStatistics.user_id,
+                func.sum(UserStatistics.total_sentences).label("sentences"),
+                func.sum(UserStatistics.correct_sentences).label("correct")
+            )
+            .where(UserStatistics.user_id.in_(students))
+            .group_by(UserStatistics.user_id)
+            .subquery()
+        )
+        # Correlated so each student is one backward probe of ix_practice_sessions_user_id_created_at
+        last_practice = (
+            select(func.max(PracticeSession.created_at))
+            .where(PracticeSession.user_id == User.id)
+            .scalar_subquery()
+        )
+        last_activity = func.greatest(User.last_activity, last_practice)
+
+        result = await self.db.execute(
+            select(
+                User.id,
+                User.username,
+                User.first_name,
+                func.coalesce(words.c.words, 0).label("words"),
+                func.coalesce(practice.c.sentences, 0).label("sentences"),
+                func.coalesce(practice.c.correct, 0).label("correct"),
+                last_activity.label("last_activity")
+            )
+            .join(TeacherStudent, TeacherStudent.student_id == User.id)
+            .outerjoin(words, words.c.user_id == User.id)
+            .outerjoin(practice, practice.c.user_id == User.id)
+            .where(TeacherStudent.teacher_id == teacher_id)
+            .order_by(last_activity.desc().nulls_last(), User.id)
+        )
+        return result.all()
@@ -1,11 +1,35 @@
+from dataclasses import dataclass
+from sqlalchemy import select, update
+from config.config import Config
+from database.cache import LRUCache
 from database.models import User
+from database.unit_of_work import after_commit
+
+
+@dataclass(frozen=True)
+class UserIdentity:
+    id: int
+    telegram_id: int
+    first_name: str
+    username: str | None
+
+
+# telegram_id -> UserIdentity; only committed rows are cached so a rolled back insert can't leak an id,
+# which is why every write to it waits for the commit
+_identity_cache = LRUCache(maxsize=Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL)
+
 
 class UserRepository:
     def __init__(self, db):
         self.db = db
 
-    def get_or_create(self, telegram_user):
-        user = self.db.query(User).filter(User.telegram_id == telegram_user.id).first()
+    async def get_or_create(self, telegram_user) -> UserIdentity:
+        identity = _identity_cache.get(telegram_user.id)
+        if identity:
+            return await self._refresh_profile(identity, telegram_user)
+
+        result = await self.db.execute(select(User).where(User.telegram_id == telegram_user.id))
+        user = result.scalars().first()
         if not user:
             user = User(
                 telegram_id=telegram_user.id,
@@ -15,12 +39,47 @@ class UserRepository:
                 language_code=getattr(telegram_user, 'language_code', 'en')
             )
             self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
-        return user
+            await self.db.flush()
+            return self._to_identity(user)
+
+        identity = await self._refresh_profile(self._to_identity(user), telegram_user)
+        self._cache(identity)
+        return identity
+
+    async def _refresh_profile(self, identity: UserIdentity, telegram_user) -> UserIdentity:
+        if (identity.first_name, identity.username) == (telegram_user.first_name, telegram_user.username):
+            return identity
+
+        await self.db.execute(
+            update(User)
+            .where(User.id == identity.id)
+            .values(first_name=telegram_user.first_name, username=telegram_user.username)
+        )
+        identity = UserIdentity(
+            id=identity.id,
+            telegram_id=identity.telegram_id,
+            first_name=telegram_user.first_name,
+            username=telegram_user.username
+        )
+        self._cache(identity)
+        return identity
+
+    def _cache(self, identity: UserIdentity) -> None:
+        after_commit(self.db, lambda: _identity_cache.set(identity.telegram_id, identity))
+
+    @staticmethod
+    def _to_identity(user: User) -> UserIdentity:
+        return UserIdentity(
+            id=user.id,
+            telegram_id=user.telegram_id,
+            first_name=user.first_name,
+            username=user.username
+        )
 
-    def get(self, user_id):
-        return self.db.query(User).filter(User.id == user_id).first()
+    async def get(self, user_id):
+        result = await self.db.execute(select(User).where(User.id == user_id))
+        return result.scalars().first()
 
-    def get_by_username(self, username):
-        return self.db.query(User).filter(User.username == username).first()
\ No newline at end of file
+    async def get_by_username(self, username):
+        result = await self.db.execute(select(User).where(User.username == username))
+        return result.scalars().first()
\ No newline at end of file
@@ -1,17 +1,19 @@
 import datetime
-from sqlalchemy.orm import Session
-from database.models import UserSettings
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import User, UserSettings
 from typing import List
 import logging
 
 logger = logging.getLogger(__name__)
 
 class UserSettingsRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_or_create_settings(self, user_id: int) -> UserSettings:
-        settings = self.db.query(UserSettings).filter(UserSettings.user_id == user_id).first()
+    async def get_or_create_settings(self, user_id: int) -> UserSettings:
+        result = await self.db.execute(select(UserSettings).where(UserSettings.user_id == user_id))
+        settings = result.scalars().first()
 
         if not settings:
             settings = UserSettings(
@@ -21,21 +23,49 @@ class UserSettingsRepository:
                 last_word_id=None
             )
             self.db.add(settings)
-            self.db.commit()
-            self.db.refresh(settings)
+            await self.db.flush()
             logger.info(f"Created new settings for user {user_id}")
 
         return settings
 
-    def update_last_word(self, user_id: int, word_id: int | None) -> None:
-        settings = self.get_or_create_settings(user_id)
+    async def update_last_word(self, user_id: int, word_id: int | None) -> None:
+        settings = await self.get_or_create_settings(user_id)
         logger.info(f"Updating last_word_id for user {user_id} to {word_id}")
         settings.last_word_id = word_id
-        self.db.commit()
-        self.db.refresh(settings)
-        logger.info(f"Successfully updated last_word_id for user {user_id}: {settings.last_word_id}")
 
-    def get_last_word_id(self, user_id: int) -> int | None:
-        settings = self.get_or_create_settings(user_id)
+    async def get_last_word_id(self, user_id: int) -> int | None:
+        settings = await self.get_or_create_settings(user_id)
         logger.info(f"Fetching last_word_id for user {user_id}: {settings.last_word_id}")
-        return settings.last_word_id
\ No newline at end of file
+        return settings.last_word_id
+
+    async def set_reminder_interval(self, user_id: int, minutes: int) -> UserSettings:
+        settings = await self.get_or_create_settings(user_id)
+        settings.practice_interval = minutes
+        settings.notifications_enabled = minutes > 0
+        if minutes > 0:
+            settings.next_reminder_at = datetime.datetime.utcnow() + datetime.timedelta(minutes=minutes)
+        else:
+            settings.next_reminder_at = None
+        logger.info(f"Reminder interval for user {user_id} set to {minutes} minutes")
+        return settings
+
+    async def claim_due_reminders(self, now: datetime.datetime, limit: int) -> List:
+        """Lock up to `limit` due rows (oldest first); SKIP LOCKED lets several bot processes share the work."""
+        result = await self.db.execute(
+            select(UserSettings.id, UserSettings.user_id, UserSettings.practice_interval, User.telegram_id)
+            .join(User, User.id == UserSettings.user_id)
+            .where(
+                UserSettings.next_reminder_at <= now,
+                UserSettings.notifications_enabled.is_(True),
+                UserSettings.practice_interval > 0
+            )
+            .order_by(UserSettings.next_reminder_at)
+            .limit(limit)
+            .with_for_update(of=UserSettings, skip_locked=True)
+        )
+        return result.all()
+
+    async def bulk_update(self, rows: List[dict]) -> None:
+        """Update many settings rows in one executemany; each dict needs the primary key `id`."""
+        if rows:
+            await self.db.execute(update(UserSettings), rows)
\ No newline at end of file
@@ -1,47 +1,113 @@
 import logging
-from sqlalchemy import func
+from datetime import datetime
+from sqlalchemy import String, Text, column, func, insert, literal, select, tuple_, update, values
 from database.models import Word
 
 logger = logging.getLogger(__name__)
 
+# Listing order is (SORT_KEY, id), matching ix_words_user_id_lower_word
+SORT_KEY = func.lower(Word.word)
+
 class WordRepository:
     def __init__(self, db):
         self.db = db
 
-    def add_word(self, user_id, word_data):
-        try:
-            word = Word(
-                user_id=user_id,
-                word=word_data['word'],
-                translation=word_data['translation'],
-                synonym=word_data.get('synonym'),
-                example_usage=word_data.get('example_usage')
+    # Writes do not catch errors: rolling back here would undo the whole update's unit of work,
+    # so failures propagate to @unit_of_work, which rolls back once
+    async def add_word(self, user_id, word_data):
+        word = Word(
+            user_id=user_id,
+            word=word_data['word'],
+            translation=word_data['translation'],
+            synonym=word_data.get('synonym'),
+            example_usage=word_data.get('example_usage')
+        )
+        self.db.add(word)
+        await self.db.flush()
+        logger.info(f"Word added for user {user_id}: {word.word}")
+        return word
+
+    async def add_new_words(self, user_id, rows):
+        """Insert the rows whose word the user does not have yet; returns how many were added.
+
+        One INSERT ... SELECT FROM (VALUES ...) per call. Existing words are filtered out by a
+        NOT EXISTS probe of ix_words_user_id_lower_word, so the user's vocabulary is never
+        loaded. `rows` are dicts of Word columns and should already be unique among themselves.
+        """
+        if not rows:
+            return 0
+        now = datetime.utcnow()
+        new = values(
+            column("word", String), column("translation", String),
+            column("synonym", String), column("example_usage", Text),
+            name="new",
+        ).data([(row["word"], row["translation"], row.get("synonym"), row.get("example_usage")) for row in rows])
+        existing = select(Word.id).where(Word.user_id == user_id, SORT_KEY == func.lower(new.c.word))
+        result = await self.db.execute(
+            insert(Word).from_select(
+                ["user_id", "word", "translation", "synonym", "example_usage", "added_at", "due_at"],
+                select(
+                    literal(user_id), new.c.word, new.c.translation, new.c.synonym, new.c.example_usage,
+                    literal(now), literal(now),
+                ).where(~existing.exists()),
             )
-            self.db.add(word)
-            self.db.commit()
-            self.db.refresh(word)
-            logger.info(f"Word added for user {user_id}: {word.word}")
-            return word
-        except Exception as e:
-            logger.error(f"Error adding word for user {user_id}: {str(e)}")
-            self.db.rollback()
+        )
+        logger.info(f"Bulk added {result.rowcount} of {len(rows)} words for user {user_id}")
+        return result.rowcount
+
+    async def stream_words(self, user_id, batch_size=1000):
+        """Server-side cursor over the user's words in listing order, as plain rows."""
+        return await self.db.stream(
+            select(Word.word, Word.translation, Word.synonym, Word.example_usage, Word.added_at)
+            .where(Word.user_id == user_id)
+            .order_by(SORT_KEY, Word.id)
+            .execution_options(yield_per=batch_size)
+        )
 
-    def get_user_words(self, user_id):
+    async def get_words_page(self, user_id, limit, after_id=None, before_id=None, from_id=None, letter=None):
+        """One page of (id, word, translation) in (lower(word), id) order using keyset pagination.
+
+        The cursor is a word id; its sort key is resolved inside the same statement, so every
+        page is a single range scan of ix_words_user_id_lower_word reading `limit + 1` rows
+        however deep it is. Returns (rows, has_more) where has_more refers to the direction
+        of travel.
+        """
         try:
-            words = self.db.query(Word).filter(Word.user_id == user_id).order_by(Word.word).all()
-            logger.info(f"Retrieved {len(words)} words for user {user_id}")
-            return words
+            query = select(Word.id, Word.word, Word.translation).where(Word.user_id == user_id)
+            if before_id is not None:
+                query = query.where(tuple_(SORT_KEY, Word.id) < self._cursor(before_id))
+                query = query.order_by(SORT_KEY.desc(), Word.id.desc())
+            else:
+                if after_id is not None:
+                    query = query.where(tuple_(SORT_KEY, Word.id) > self._cursor(after_id))
+                elif from_id is not None:
+                    query = query.where(tuple_(SORT_KEY, Word.id) >= self._cursor(from_id))
+                elif letter:
+                    query = query.where(SORT_KEY >= letter.lower())
+                query = query.order_by(SORT_KEY, Word.id)
+
+            result = await self.db.execute(query.limit(limit + 1))
+            rows = result.all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            if before_id is not None:
+                rows.reverse()
+            return rows, has_more
         except Exception as e:
-            logger.error(f"Error retrieving words for user {user_id}: {str(e)}")
-            return []
+            logger.error(f"Error retrieving words page for user {user_id}: {str(e)}")
+            return [], False
 
+    @staticmethod
+    def _cursor(word_id):
+        return tuple_(select(SORT_KEY).where(Word.id == word_id).scalar_subquery(), literal(word_id))
 
-    def get_word_by_id(self, word_id, user_id=None):
+    async def get_word_by_id(self, word_id, user_id=None):
         try:
-            query = self.db.query(Word).filter(Word.id == word_id)
+            query = select(Word).where(Word.id == word_id)
             if user_id is not None:
-                query = query.filter(Word.user_id == user_id)
-            word = query.first()
+                query = query.where(Word.user_id == user_id)
+            result = await self.db.execute(query)
+            word = result.scalars().first()
             if word:
                 logger.info(f"Retrieved word with id {word_id} for user {user_id}")
             else:
@@ -51,47 +117,71 @@ class WordRepository:
             logger.error(f"Error retrieving word with id {word_id} for user {user_id}: {str(e)}")
             return None
 
-    def get_random_word(self, user_id):
+    async def take_next_due_word(self, user_id, now, defer, exclude_id=None):
+        """Serve the user's most overdue word and push its due time `defer` past max(due_at, now).
+
+        Without the push an unanswered word would stay first in line, so /practice would keep
+        offering it; answering reschedules it properly. `exclude_id` (the word the user was just
+        given) is skipped unless it is their only word. One UPDATE ... RETURNING whose subquery
+        is a single probe of ix_words_user_id_due_at.
+        """
+        word = await self._take_next_due_word(user_id, now, defer, exclude_id)
+        if word is None and exclude_id is not None:
+            word = await self._take_next_due_word(user_id, now, defer, None)
+        if word:
+            logger.info(f"Next due word for user {user_id}: {word.word} (due {word.due_at})")
+        else:
+            logger.warning(f"No words found for user {user_id}")
+        return word
+
+    async def _take_next_due_word(self, user_id, now, defer, exclude_id):
+        candidate = select(Word.id).where(Word.user_id == user_id)
+        if exclude_id is not None:
+            candidate = candidate.where(Word.id != exclude_id)
+        candidate = candidate.order_by(Word.due_at, Word.id).limit(1).scalar_subquery()
+        result = await self.db.execute(
+            update(Word)
+            .where(Word.id == candidate)
+            .values(due_at=func.greatest(Word.due_at, now) + defer)
+            .returning(Word)
+        )
+        return result.scalars().first()
+
+    async def get_next_due_words(self, user_ids):
+        """Next due word for each of `user_ids` in one DISTINCT ON query over ix_words_user_id_due_at."""
+        if not user_ids:
+            return {}
         try:
-            word = self.db.query(Word).filter(Word.user_id == user_id).order_by(func.random()).first()
-            if word:
-                logger.info(f"Random word retrieved for user {user_id}: {word.word}")
-            else:
-                logger.warning(f"No words found for user {user_id}")
-            return word
+            result = await self.db.execute(
+                select(Word.user_id, Word.id, Word.word)
+                .where(Word.user_id.in_(user_ids))
+                .order_by(Word.user_id, Word.due_at, Word.id)
+                .distinct(Word.user_id)
+            )
+            return {row.user_id: row for row in result.all()}
         except Exception as e:
-            logger.error(f"Error retrieving random word for user {user_id}: {str(e)}")
+            logger.error(f"Error retrieving next due words for {len(user_ids)} users: {str(e)}")
+            return {}
+
+    async def update_word(self, word_id, user_id, update_data):
+        word = await self.get_word_by_id(word_id, user_id)
+        if not word:
+            logger.warning(f"Word with id {word_id} not found for user {user_id}")
             return None
 
-    def update_word(self, word_id, user_id, update_data):
-        try:
-            word = self.get_word_by_id(word_id, user_id)
-            if not word:
-                logger.warning(f"Word with id {word_id} not found for user {user_id}")
-                return None
+        for key, value in update_data.items():
+            setattr(word, key, value)
+        await self.db.flush()
+        logger.info(f"Word with id {word_id} updated for user {user_id}")
+        return word
 
-            for key, value in update_data.items():
-                setattr(word, key, value)
-            self.db.commit()
-            self.db.refresh(word)
-            logger.info(f"Word with id {word_id} updated for user {user_id}")
-            return word
-        except Exception as e:
-            logger.error(f"Error updating word with id {word_id} for user {user_id}: {str(e)}")
-            self.db.rollback()
+    async def delete_word(self, word_id, user_id):
+        word = await self.get_word_by_id(word_id, user_id)
+        if not word:
+            logger.warning(f"Word with id {word_id} not found for user {user_id}")
+            return False
 
-    def delete_word(self, word_id, user_id):
-        try:
-            word = self.get_word_by_id(word_id, user_id)
-            if word:
-                self.db.delete(word)
-                self.db.commit()
-                logger.info(f"Word with id {word_id} deleted for user {user_id}")
-                return True
-            else:
-                logger.warning(f"Word with id {word_id} not found for user {user_id}")
-                return False
-        except Exception as e:
-            logger.error(f"Error deleting word with id {word_id} for user {user_id}: {str(e)}")
-            self.db.rollback()
-            return False
\ No newline at end of file
+        await self.db.delete(word)
+        await self.db.flush()
+        logger.info(f"Word with id {word_id} deleted for user {user_id}")
+        return True
\ No newline at end of file
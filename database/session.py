@@ -1,9 +1,24 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from config.config import Config
 
 engine = create_engine(Config.SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Each bot worker process gets its share of the pool, so all of them together stay within the
+# configured connection budget. Divided here rather than in run_worker because spawned workers
+# import this module (through main) before run_worker starts.
+_workers = max(1, Config.BOT_WORKERS)
+async_engine = create_async_engine(
+    Config.SQLALCHEMY_ASYNC_DATABASE_URL,
+    pool_size=max(1, Config.DB_POOL_SIZE // _workers),
+    max_overflow=Config.DB_MAX_OVERFLOW // _workers,
+    pool_pre_ping=True
+)
+# expire_on_commit=False: attributes must stay readable after commit, lazy reloads are not allowed under asyncio
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -11,4 +26,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,137 @@
+import functools
+import logging
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from database.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+_current_uow: ContextVar["UnitOfWork | None"] = ContextVar("current_uow", default=None)
+
+
+# Remember whether a session's transaction has written anything, so release() knows if it can end it
+@event.listens_for(Session, "after_flush")
+def _after_flush(session, flush_context):
+    session.info["written"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["written"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    for callback in session.info.pop("after_commit", ()):
+        try:
+            callback()
+        except Exception as e:
+            logger.error("After-commit callback failed: %s", str(e))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("written", None)
+        # Rolled back or closed without a commit: the state the callbacks describe never existed
+        session.info.pop("after_commit", None)
+
+
+def after_commit(session, callback) -> None:
+    """Run `callback()` once the session's current transaction commits; dropped if it doesn't.
+
+    For in-process caches of database state, which must never hold rows a rollback undid.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+class UnitOfWork:
+    """One AsyncSession per Telegram update (or job run), shared by every service and repository.
+
+    The session is only created on first use and a pooled connection is only checked out
+    on the first statement, so updates that never touch the database cost nothing.
+    """
+
+    def __init__(self):
+        self._session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = AsyncSessionLocal()
+        return self._session
+
+    async def commit(self) -> None:
+        if self._session is None or not self._session.in_transaction():
+            return
+        if not self._session.sync_session.get_transaction().is_active:
+            # A flush failed and the handler reported the error itself; nothing here can be kept
+            await self._session.rollback()
+            return
+        await self._session.commit()
+
+    async def rollback(self) -> None:
+        if self._session is not None and self._session.in_transaction():
+            await self._session.rollback()
+
+    async def release(self) -> None:
+        """Give the pooled connection back before slow external I/O (e.g. OpenAI).
+
+        Only a transaction that has written nothing is ended, and it is closed rather than
+        committed, so the update still commits exactly once at the end and the session checks
+        out a new connection lazily on the next statement. After writes the connection is kept:
+        committing them early would leave them in place if a later step fails. Objects loaded
+        before a release are detached; `add` them back to the session before changing them.
+        """
+        session = self._session
+        if session is None or not session.in_transaction():
+            return
+        if session.info.get("written") or session.new or session.dirty or session.deleted:
+            return
+        await session.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def current_uow() -> UnitOfWork:
+    uow = _current_uow.get()
+    if uow is None:
+        raise RuntimeError("No unit of work is active; wrap the handler with @unit_of_work")
+    return uow
+
+
+def current_session() -> AsyncSession:
+    return current_uow().session
+
+
+def unit_of_work(func):
+    """Run a handler or job callback inside a unit of work.
+
+    Commits once when the callback returns, rolls back if it raises and always closes the
+    session. Nested calls reuse the outer unit of work.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _current_uow.get() is not None:
+            return await func(*args, **kwargs)
+
+        uow = UnitOfWork()
+        token = _current_uow.set(uow)
+        try:
+            result = await func(*args, **kwargs)
+            await uow.commit()
+            return result
+        except Exception:
+            await uow.rollback()
+            raise
+        finally:
+            _current_uow.reset(token)
+            await uow.close()
+
+    return wrapper
@@ -1,8 +1,14 @@
+import asyncio
 import logging
 from telegram.ext import ApplicationBuilder
 from config.config import Config
 from bot.handlers import base, dictionary, practice
 from bot.handlers.teacher_handlers import TeacherHandlers
+from bot.handlers.stats import StatsHandlers
+from bot.handlers.maintenance import MaintenanceHandlers
+from bot.services.message_dispatcher import DispatcherRateLimiter
+from bot.instrumentation import instrument_application, instrument_engine, register_runtime_gauges, start_metrics_server
+from database import async_engine
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -11,29 +17,92 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
+async def on_startup(application):
+    if Config.METRICS_ENABLED:
+        application.bot_data["metrics_server"] = await start_metrics_server()
+
+
+async def on_shutdown(application):
+    metrics_server = application.bot_data.pop("metrics_server", None)
+    if metrics_server is not None:
+        await metrics_server.cleanup()
+
+
+async def run_polling(application):
+    """Application.run_polling, but the dispatcher is drained between stop() and shutdown().
+
+    PTB 20.0 has no hook between the two, and post_shutdown runs after the bot's HTTP client is
+    already closed.
+    """
+    from bot.webhook import start_application, stop_application, wait_for_stop_signal
+
+    await start_application(application)
+    await application.updater.start_polling()
     try:
-        logger.info("🚀 Starting bot initialization...")
+        await wait_for_stop_signal()
+    finally:
+        if application.updater.running:
+            await application.updater.stop()
+        await stop_application(application)
+
 
-        application = (
-            ApplicationBuilder()
-            .token(Config.TELEGRAM_BOT_TOKEN)
-            .concurrent_updates(True)
-            .build()
-        )
+def build_application(request=None):
+    builder = (
+        ApplicationBuilder()
+        .token(Config.TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)
+        # Every message the bot sends or edits goes through the MessageDispatcher
+        .rate_limiter(DispatcherRateLimiter())
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+    )
+    if request is not None:
+        # Custom Bot API transport, e.g. the offline one used by benchmarks.loadtest
+        builder = builder.request(request)
+    application = builder.build()
 
-        logger.info("✅ Application built successfully")
+    logger.info("✅ Application built successfully")
 
-        base.BaseHandlers.register_handlers(application)
-        dictionary.DictionaryHandlers.register_handlers(application)
+    base.BaseHandlers.register_handlers(application)
+    dictionary.DictionaryHandlers.register_handlers(application)
+
+    TeacherHandlers.register_handlers(application)
+    StatsHandlers.register_handlers(application)
+    MaintenanceHandlers.register_handlers(application)
+
+    practice_handler = practice.PracticeHandlers(application)
+    practice_handler.register_handlers()
+
+    if Config.METRICS_ENABLED or Config.SQL_PROFILING:
+        instrument_application(application)
+    if Config.METRICS_ENABLED:
+        instrument_engine(async_engine.sync_engine)
+        register_runtime_gauges()
+    if Config.SQL_PROFILING:
+        from bot.profiler import SQLProfiler
+        SQLProfiler(async_engine).install()
+
+    return application
+
+
+def main():
+    try:
+        logger.info("🚀 Starting bot initialization...")
 
-        TeacherHandlers.register_handlers(application)
+        if Config.BOT_WORKERS > 1:
+            from bot.supervisor import ShardSupervisor
+            logger.info("🤖 Supervising %d workers (%s mode)", Config.BOT_WORKERS, Config.BOT_MODE)
+            asyncio.run(ShardSupervisor().serve())
+            return
 
-        practice_handler = practice.PracticeHandlers(application)
-        practice_handler.register_handlers()
+        application = build_application()
 
-        logger.info("🤖 Bot is ready and running")
-        application.run_polling()
+        logger.info("🤖 Bot is ready and running (%s mode)", Config.BOT_MODE)
+        if Config.BOT_MODE == "webhook":
+            from bot.webhook import WebhookServer
+            asyncio.run(WebhookServer(application).serve())
+        else:
+            asyncio.run(run_polling(application))
 
     except Exception as e:
         logger.error(f"🔥 Critical error: {e}")
@@ -42,4 +111,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import pytest
+from bot.services.ai_batcher import CorrectionBatcher
+
+
+class FakeCompletions:
+    """Stands in for AIService's single and batched completion calls."""
+
+    def __init__(self, batch_response=None):
+        self.batch_response = batch_response
+        self.batches = []
+        self.singles = []
+
+    async def single_call(self, word, sentence, priority=0, on_queued=None):
+        self.singles.append(sentence)
+        return json.dumps({"is_correct": True, "correction": sentence, "explanation": "single"})
+
+    async def batch_call(self, items, priority=0, on_queued=None):
+        self.batches.append([item["sentence"] for item in items])
+        if self.batch_response is not None:
+            return self.batch_response(items)
+        return json.dumps({"results": [
+            {"id": item["id"], "is_correct": False, "correction": item["sentence"].upper(), "explanation": "batch"}
+            for item in reversed(items)
+        ]})
+
+
+def submit_all(completions, sentences, **options):
+    async def scenario():
+        batcher = CorrectionBatcher(completions.single_call, completions.batch_call, **options)
+        return await asyncio.gather(*(batcher.submit("word", sentence) for sentence in sentences))
+
+    return [json.loads(response) for response in asyncio.run(scenario())]
+
+
+def test_requests_within_the_window_share_one_call():
+    completions = FakeCompletions()
+    results = submit_all(completions, ["a", "b", "c"], window=0.01, max_items=10)
+    assert completions.batches == [["a", "b", "c"]]
+    assert [result["correction"] for result in results] == ["A", "B", "C"]
+    assert all(result["explanation"] == "batch" for result in results)
+    assert completions.singles == []
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window():
+    completions = FakeCompletions()
+
+    async def scenario():
+        batcher = CorrectionBatcher(completions.single_call, completions.batch_call, window=60, max_items=2)
+        return await asyncio.wait_for(asyncio.gather(batcher.submit("w", "a"), batcher.submit("w", "b")), 1)
+
+    asyncio.run(scenario())
+    assert completions.batches == [["a", "b"]]
+
+
+def test_batches_are_split_by_size():
+    completions = FakeCompletions()
+    submit_all(completions, ["a", "b", "c", "d", "e"], window=0.01, max_items=2)
+    assert completions.batches == [["a", "b"], ["c", "d"]]
+    # The remainder is alone once the window closes, so it goes out as a single request
+    assert completions.singles == ["e"]
+
+
+def test_requests_in_separate_windows_are_not_batched():
+    completions = FakeCompletions()
+
+    async def scenario():
+        batcher = CorrectionBatcher(completions.single_call, completions.batch_call, window=0.01)
+        first = await batcher.submit("w", "a")
+        second = await batcher.submit("w", "b")
+        return first, second
+
+    asyncio.run(scenario())
+    assert completions.batches == []
+    assert completions.singles == ["a", "b"]
+
+
+@pytest.mark.parametrize("response", [
+    lambda items: "not json",
+    lambda items: json.dumps({"results": "nope"}),
+    lambda items: json.dumps({"results": []}),
+])
+def test_unusable_batch_response_falls_back_to_single_calls(response):
+    completions = FakeCompletions(batch_response=response)
+    results = submit_all(completions, ["a", "b"])
+    assert sorted(completions.singles) == ["a", "b"]
+    assert [result["correction"] for result in results] == ["a", "b"]
+
+
+def test_only_missing_or_mangled_items_are_retried():
+    def response(items):
+        return json.dumps([
+            {"id": 0, "correction": "A!", "is_correct": True},
+            {"id": 1, "explanation": "no correction field"},
+            {"id": 0, "correction": "duplicate"},
+            {"id": 7, "correction": "out of range"},
+        ])
+
+    completions = FakeCompletions(batch_response=response)
+    results = submit_all(completions, ["a", "b", "c"])
+    assert results[0] == {"is_correct": True, "correction": "A!", "explanation": "No feedback"}
+    assert sorted(completions.singles) == ["b", "c"]
+    assert [result["explanation"] for result in results[1:]] == ["single", "single"]
+
+
+def test_failed_batch_call_falls_back_and_single_errors_reach_the_caller():
+    async def failing_batch(items, priority=0, on_queued=None):
+        raise RuntimeError("upstream down")
+
+    async def failing_single(word, sentence, priority=0, on_queued=None):
+        raise RuntimeError(f"failed {sentence}")
+
+    async def scenario():
+        batcher = CorrectionBatcher(failing_single, failing_batch, window=0.01)
+        return await asyncio.gather(batcher.submit("w", "a"), batcher.submit("w", "b"), return_exceptions=True)
+
+    errors = asyncio.run(scenario())
+    assert [str(error) for error in errors] == ["failed a", "failed b"]
+
+
+def test_batch_uses_the_most_urgent_priority_and_notifies_every_caller():
+    seen = {}
+    notified = []
+
+    async def batch_call(items, priority=0, on_queued=None):
+        seen["priority"] = priority
+        await on_queued()
+        return json.dumps([{"id": item["id"], "correction": item["sentence"]} for item in items])
+
+    async def single_call(word, sentence, priority=0, on_queued=None):
+        raise AssertionError("not expected")
+
+    def notify(name):
+        async def callback():
+            notified.append(name)
+        return callback
+
+    async def scenario():
+        batcher = CorrectionBatcher(single_call, batch_call, window=0.01)
+        await asyncio.gather(
+            batcher.submit("w", "a", priority=10, on_queued=notify("a")),
+            batcher.submit("w", "b", priority=0, on_queued=notify("b")),
+        )
+
+    asyncio.run(scenario())
+    assert seen["priority"] == 0
+    assert sorted(notified) == ["a", "b"]
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from bot.services import ai_cache
+from bot.services.ai_cache import CorrectionCache
+from config.config import Config
+from database import cache
+
+RESULT = {"is_correct": True, "correction": "I like apples.", "feedback": "Good."}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(ai_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def make_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "AI_CACHE_PATH", str(tmp_path / "ai_cache.sqlite3"))
+    monkeypatch.setattr(Config, "AI_CACHE_TTL", 60)
+    monkeypatch.setattr(Config, "AI_CACHE_PERSISTENT_TTL", 3600)
+    return lambda model="gpt", prompt_version="1": CorrectionCache(model, prompt_version)
+
+
+def test_key_ignores_word_case_and_extra_whitespace(make_cache):
+    correction_cache = make_cache()
+    key = correction_cache.make_key("Look  After", "I  look after\tmy sister.")
+    assert key == correction_cache.make_key("look after", "I look after my sister.")
+    # Sentence case is part of what gets corrected
+    assert key != correction_cache.make_key("look after", "i look after my sister.")
+
+
+def test_key_depends_on_model_and_prompt_version(make_cache):
+    key = make_cache().make_key("apple", "I like apples.")
+    assert key != make_cache(model="other").make_key("apple", "I like apples.")
+    assert key != make_cache(prompt_version="2").make_key("apple", "I like apples.")
+
+
+def test_persistent_hit_is_promoted_to_memory(make_cache, clock):
+    async def scenario():
+        await make_cache().set("apple", "I like apples.", RESULT)
+        # A fresh cache (as after a restart) only has the SQLite tier
+        restarted = make_cache()
+        first = await restarted.get("apple", "I like apples.")
+        second = await restarted.get("apple", "I like apples.")
+        return restarted, first, second
+
+    restarted, first, second = asyncio.run(scenario())
+    assert first == second == RESULT
+    assert restarted.persistent.stats() == {"hits": 1, "misses": 0}
+    assert restarted.memory.stats()["hits"] == 1
+
+
+def test_returned_results_are_copies(make_cache, clock):
+    async def scenario():
+        await make_cache().set("apple", "I like apples.", RESULT)
+        restarted = make_cache()
+        (await restarted.get("apple", "I like apples."))["prechecked"] = True
+        (await restarted.get("apple", "I like apples."))["prechecked"] = True
+        return await restarted.get("apple", "I like apples.")
+
+    assert asyncio.run(scenario()) == RESULT
+
+
+def test_entries_expire_per_tier(make_cache, clock):
+    async def scenario():
+        correction_cache = make_cache()
+        await correction_cache.set("apple", "I like apples.", RESULT)
+        clock[0] += 61
+        # Gone from memory, still in SQLite
+        assert correction_cache.memory.get(correction_cache.make_key("apple", "I like apples.")) is None
+        assert await correction_cache.get("apple", "I like apples.") == RESULT
+        clock[0] += 3600
+        return await make_cache().get("apple", "I like apples.")
+
+    assert asyncio.run(scenario()) is None
@@ -0,0 +1,185 @@
+import asyncio
+import httpx
+import openai
+import pytest
+from bot.services.ai_limiter import AdaptiveConcurrency, AILimiter, estimate_tokens
+
+
+def rate_limit_error(retry_after: str | None = "0") -> openai.RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "https://api.openai.com/v1"))
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_fast_successes_grow_the_cap_additively():
+    concurrency = AdaptiveConcurrency(initial=4, minimum=1, maximum=64, latency_target=1.0)
+    for _ in range(4):
+        concurrency.on_success(0.1)
+    assert concurrency.cap == 4
+    for _ in range(2):
+        concurrency.on_success(0.1)
+    assert concurrency.cap == 5
+
+
+def test_rate_limit_halves_the_cap():
+    concurrency = AdaptiveConcurrency(initial=16, minimum=2, maximum=64, latency_target=1.0)
+    concurrency.on_rate_limited()
+    assert concurrency.cap == 8
+    for _ in range(10):
+        concurrency.on_rate_limited()
+    assert concurrency.cap == 2
+
+
+def test_slow_responses_shrink_the_cap():
+    concurrency = AdaptiveConcurrency(initial=10, minimum=1, maximum=64, latency_target=1.0)
+    concurrency.on_success(5.0)
+    assert concurrency.limit == pytest.approx(9.0)
+
+
+def test_cap_stays_within_bounds():
+    concurrency = AdaptiveConcurrency(initial=3, minimum=1, maximum=3, latency_target=1.0)
+    for _ in range(100):
+        concurrency.on_success(0.1)
+    assert concurrency.cap == 3
+
+
+def test_waiters_are_admitted_by_priority_then_arrival():
+    async def scenario():
+        limiter = AILimiter(6000, 10 ** 6, initial_concurrency=1, max_concurrency=1)
+        gate = asyncio.Event()
+        order = []
+
+        async def blocker():
+            await gate.wait()
+            return "first"
+
+        def call(name):
+            async def run():
+                order.append(name)
+                return name
+            return run
+
+        first = asyncio.create_task(limiter.run(blocker))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(limiter.run(call("low-1"), priority=10)),
+            asyncio.create_task(limiter.run(call("high"), priority=0)),
+            asyncio.create_task(limiter.run(call("low-2"), priority=10)),
+        ]
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 3
+
+        gate.set()
+        await asyncio.gather(first, *waiters)
+        return order, limiter.in_flight
+
+    order, in_flight = asyncio.run(scenario())
+    assert order == ["high", "low-1", "low-2"]
+    assert in_flight == 0
+
+
+def test_on_queued_is_called_once_when_waiting():
+    async def scenario():
+        limiter = AILimiter(6000, 10 ** 6, initial_concurrency=1, max_concurrency=1)
+        gate = asyncio.Event()
+        notified = []
+
+        async def blocker():
+            await gate.wait()
+
+        async def notify():
+            notified.append(True)
+
+        async def call():
+            return "ok"
+
+        first = asyncio.create_task(limiter.run(blocker, on_queued=notify))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(limiter.run(call, on_queued=notify))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(first, second)
+        return notified
+
+    assert asyncio.run(scenario()) == [True]
+
+
+def test_rate_limited_call_is_retried_and_cap_reduced():
+    async def scenario():
+        limiter = AILimiter(6000, 10 ** 6, initial_concurrency=8, max_concurrency=8)
+        attempts = []
+
+        async def call():
+            attempts.append(True)
+            if len(attempts) == 1:
+                raise rate_limit_error("0")
+            return "ok"
+
+        result = await limiter.run(call)
+        return result, attempts, limiter
+
+    result, attempts, limiter = asyncio.run(scenario())
+    assert result == "ok"
+    assert len(attempts) == 2
+    assert limiter.rate_limited == 1
+    assert limiter.concurrency.cap == 4
+    assert limiter.in_flight == 0
+
+
+def test_gives_up_after_max_retries():
+    async def scenario():
+        limiter = AILimiter(6000, 10 ** 6, max_retries=1)
+
+        async def call():
+            raise rate_limit_error("0")
+
+        with pytest.raises(openai.RateLimitError):
+            await limiter.run(call)
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.rate_limited == 2
+    assert limiter.in_flight == 0
+
+
+def test_retry_after_falls_back_to_exponential_backoff():
+    assert AILimiter._retry_after(rate_limit_error("7"), attempt=0) == 7.0
+    assert AILimiter._retry_after(rate_limit_error(None), attempt=3) == 8.0
+    assert AILimiter._retry_after(rate_limit_error(None), attempt=10) == 30.0
+
+
+def test_estimate_tokens():
+    messages = [{"role": "system", "content": "x" * 40}, {"role": "user", "content": "y" * 80}]
+    assert estimate_tokens(messages, max_tokens=100) == 130
+
+
+def test_cancelled_during_on_queued_does_not_leak_a_slot():
+    async def scenario():
+        limiter = AILimiter(6000, 10 ** 6, initial_concurrency=1, max_concurrency=1)
+        gate = asyncio.Event()
+        notifying = asyncio.Event()
+
+        async def blocker():
+            await gate.wait()
+
+        async def slow_notify():
+            notifying.set()
+            await asyncio.sleep(10)
+
+        async def call():
+            return "ok"
+
+        first = asyncio.create_task(limiter.run(blocker))
+        await asyncio.sleep(0)
+        leaving = asyncio.create_task(limiter.run(call, on_queued=slow_notify))
+        await notifying.wait()
+        leaving.cancel()
+        await asyncio.gather(leaving, return_exceptions=True)
+
+        gate.set()
+        await first
+        # The abandoned waiter must not hold the only slot
+        result = await asyncio.wait_for(limiter.run(call), timeout=1)
+        return result, limiter.in_flight, limiter.queue_depth
+
+    assert asyncio.run(scenario()) == ("ok", 0, 0)
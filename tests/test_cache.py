@@ -0,0 +1,78 @@
+import pytest
+from database import cache
+from database.cache import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_default_on_miss():
+    lru = LRUCache(maxsize=2)
+    assert lru.get("missing") is None
+    assert lru.get("missing", 0) == 0
+    assert lru.stats() == {"size": 0, "hits": 0, "misses": 2}
+
+
+def test_evicts_least_recently_used():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1  # "b" is now the oldest
+    lru.set("c", 3)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == 1
+    assert lru.get("c") == 3
+    assert len(lru) == 2
+
+
+def test_set_replaces_and_refreshes_entry():
+    lru = LRUCache(maxsize=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.set("a", 10)
+    lru.set("c", 3)
+
+    assert lru.get("a") == 10
+    assert lru.get("b") is None
+
+
+def test_entries_expire_after_ttl(clock):
+    lru = LRUCache(maxsize=10, ttl=60)
+    lru.set("a", 1)
+
+    clock[0] += 59
+    assert lru.get("a") == 1
+    clock[0] += 2
+    assert lru.get("a") is None
+    assert len(lru) == 0
+
+
+def test_set_restarts_ttl(clock):
+    lru = LRUCache(maxsize=10, ttl=60)
+    lru.set("a", 1)
+    clock[0] += 50
+    lru.set("a", 2)
+    clock[0] += 50
+    assert lru.get("a") == 2
+
+
+def test_pop_and_clear():
+    lru = LRUCache()
+    lru.set("a", 1)
+    lru.set("b", 2)
+
+    assert lru.pop("a") == 1
+    assert lru.pop("a", "gone") == "gone"
+    lru.clear()
+    assert len(lru) == 0
+
+
+def test_falsy_values_are_cached():
+    lru = LRUCache()
+    lru.set("zero", 0)
+    assert lru.get("zero", "default") == 0
@@ -0,0 +1,235 @@
+import asyncio
+import time
+from telegram.error import Forbidden, RetryAfter
+import pytest
+from bot.services.message_dispatcher import PRIORITY_BULK, PRIORITY_INTERACTIVE, MessageDispatcher
+from bot.utils.rate_limit import TokenBucket
+
+
+def fast_dispatcher(**kwargs) -> MessageDispatcher:
+    options = {"global_rate": 1000, "private_chat_rate": 1000, "group_chat_rate": 1000}
+    return MessageDispatcher(**{**options, **kwargs})
+
+
+def test_one_send_in_flight_per_chat_in_fifo_order():
+    async def scenario():
+        dispatcher = fast_dispatcher()
+        active = {"now": 0, "max": 0}
+        delivered = []
+
+        def call(n):
+            async def run():
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+                # Later messages are faster, so concurrent sends would arrive out of order
+                await asyncio.sleep(0.01 * (5 - n))
+                active["now"] -= 1
+                delivered.append(n)
+                return n
+            return run
+
+        results = await asyncio.gather(*(dispatcher.send(call(n), chat_id=1) for n in range(5)))
+        await dispatcher.aclose()
+        return results, delivered, active["max"]
+
+    results, delivered, max_active = asyncio.run(scenario())
+    assert results == [0, 1, 2, 3, 4]
+    assert delivered == [0, 1, 2, 3, 4]
+    assert max_active == 1
+
+
+def test_different_chats_send_concurrently():
+    async def scenario():
+        dispatcher = fast_dispatcher()
+        active = {"now": 0, "max": 0}
+
+        def call():
+            async def run():
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+                await asyncio.sleep(0.02)
+                active["now"] -= 1
+            return run
+
+        await asyncio.gather(*(dispatcher.send(call(), chat_id=chat_id) for chat_id in range(1, 6)))
+        await dispatcher.aclose()
+        return active["max"]
+
+    assert asyncio.run(scenario()) > 1
+
+
+def test_retry_after_keeps_chat_order():
+    async def scenario():
+        dispatcher = fast_dispatcher()
+        delivered = []
+        failed_once = []
+
+        def call(n):
+            async def run():
+                if n == 0 and not failed_once:
+                    failed_once.append(True)
+                    raise RetryAfter(0.05)
+                delivered.append(n)
+                return n
+            return run
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(dispatcher.send(call(n), chat_id=7) for n in range(3)))
+        elapsed = time.monotonic() - start
+        await dispatcher.aclose()
+        return results, delivered, elapsed, dispatcher
+
+    results, delivered, elapsed, dispatcher = asyncio.run(scenario())
+    assert results == [0, 1, 2]
+    assert delivered == [0, 1, 2]
+    assert elapsed >= 0.04
+    assert dispatcher.flood_waits == 1
+    assert dispatcher.retried == 1
+
+
+def test_pause_survives_bucket_eviction():
+    async def scenario():
+        dispatcher = fast_dispatcher()
+        dispatcher._chat_buckets.maxsize = 1
+        attempts = []
+
+        async def flood():
+            attempts.append(time.monotonic())
+            raise RetryAfter(1)
+
+        async def ok():
+            return "ok"
+
+        failing = asyncio.create_task(dispatcher.send(flood, chat_id=1))
+        await asyncio.sleep(0.05)
+        # Touch another chat so chat 1's bucket is evicted from the LRU
+        await dispatcher.send(ok, chat_id=2)
+        delay = dispatcher._chat_bucket(1).delay()
+        failing.cancel()
+        await dispatcher.aclose(timeout=0)
+        return delay
+
+    assert asyncio.run(scenario()) > 0.5
+
+
+def test_interactive_replies_go_before_bulk():
+    async def scenario():
+        dispatcher = fast_dispatcher()
+        dispatcher.global_bucket = TokenBucket(rate=50, capacity=1)
+        order = []
+
+        def call(name):
+            async def run():
+                order.append(name)
+            return run
+
+        # The first send takes the global bucket's only token; the rest queue up behind it
+        sends = [asyncio.create_task(dispatcher.send(call("first"), chat_id=1))]
+        await asyncio.sleep(0)
+        sends += [
+            asyncio.create_task(dispatcher.send(call(f"bulk-{n}"), chat_id=10 + n, priority=PRIORITY_BULK))
+            for n in range(2)
+        ]
+        sends.append(asyncio.create_task(dispatcher.send(call("reply"), chat_id=99, priority=PRIORITY_INTERACTIVE)))
+        await asyncio.gather(*sends)
+        await dispatcher.aclose()
+        return order
+
+    order = asyncio.run(scenario())
+    assert order[0] == "first"
+    assert order[1] == "reply"
+
+
+def test_permanent_errors_fail_without_retry():
+    async def scenario():
+        dispatcher = fast_dispatcher()
+        attempts = []
+
+        async def blocked():
+            attempts.append(True)
+            raise Forbidden("bot was blocked by the user")
+
+        with pytest.raises(Forbidden):
+            await dispatcher.send(blocked, chat_id=3)
+        await dispatcher.aclose()
+        return attempts, dispatcher
+
+    attempts, dispatcher = asyncio.run(scenario())
+    assert len(attempts) == 1
+    assert dispatcher.failed == 1
+    assert dispatcher.queue_depth == 0
+
+
+def test_rate_limiter_routes_bot_sends_through_the_dispatcher(monkeypatch):
+    from telegram.ext import ExtBot
+    from benchmarks.fake_telegram import FakeTelegramRequest
+    from bot.services import message_dispatcher
+    from bot.services.message_dispatcher import DispatcherRateLimiter, get_dispatcher
+
+    monkeypatch.setattr(message_dispatcher, "_dispatcher", fast_dispatcher())
+
+    async def scenario():
+        telegram = FakeTelegramRequest()
+        bot = ExtBot("123:test", request=telegram, get_updates_request=FakeTelegramRequest(),
+                     rate_limiter=DispatcherRateLimiter())
+        await bot.initialize()
+        message = await bot.send_message(chat_id=5, text="hello")
+        await message.edit_text("hello again")
+        await get_dispatcher().send_message(bot, 5, "reminder")
+        await bot.answer_callback_query("query-id")
+        await get_dispatcher().aclose()
+        return telegram
+
+    telegram = asyncio.run(scenario())
+    dispatcher = message_dispatcher._dispatcher
+    # getMe and answerCallbackQuery bypass it; the explicit send is not dispatched twice
+    assert dispatcher.sent == 3
+    assert telegram.calls["sendMessage"] == 2
+    assert list(telegram.sent[5]) == ["hello", "hello again", "reminder"]
+
+
+def test_queued_messages_are_sent_before_the_application_shuts_down(monkeypatch):
+    from telegram.ext import ApplicationBuilder
+    from benchmarks.fake_telegram import FakeTelegramRequest
+    from bot.services import message_dispatcher
+    from bot.services.message_dispatcher import DispatcherRateLimiter
+    from bot.webhook import start_application, stop_application
+
+    class ClosingTelegramRequest(FakeTelegramRequest):
+        """Fails after shutdown, like the HTTPX client behind a real bot."""
+
+        closed = False
+
+        async def shutdown(self) -> None:
+            self.closed = True
+
+        async def do_request(self, url, method, request_data=None, **kwargs):
+            if self.closed:
+                raise RuntimeError("This HTTPXRequest is not initialized!")
+            return await super().do_request(url, method, request_data, **kwargs)
+
+    dispatcher = fast_dispatcher()
+    # One message every 20 ms, so most of them are still queued when shutdown starts
+    dispatcher.global_bucket = TokenBucket(rate=50, capacity=1)
+    monkeypatch.setattr(message_dispatcher, "_dispatcher", dispatcher)
+
+    async def scenario():
+        telegram = ClosingTelegramRequest()
+        application = (
+            ApplicationBuilder().token("123:test").request(telegram)
+            .get_updates_request(FakeTelegramRequest()).rate_limiter(DispatcherRateLimiter()).build()
+        )
+        await start_application(application)
+        sends = [
+            asyncio.create_task(application.bot.send_message(chat_id=chat_id, text=f"bye {chat_id}"))
+            for chat_id in range(1, 6)
+        ]
+        await asyncio.sleep(0)
+        await stop_application(application)
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        return telegram, results
+
+    telegram, results = asyncio.run(scenario())
+    assert not [result for result in results if isinstance(result, Exception)]
+    assert telegram.calls["sendMessage"] == 5
+    assert dispatcher.queue_depth == 0
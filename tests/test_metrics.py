@@ -0,0 +1,60 @@
+from bot.utils.metrics import Registry
+
+
+def test_counter_renders_help_type_and_labelled_samples():
+    registry = Registry()
+    updates = registry.counter("bot_updates_total", "Updates handled", ("handler",))
+    updates.inc(handler="start")
+    updates.inc(2, handler="start")
+    updates.inc(handler='say "hi"\n')
+    assert registry.render() == (
+        "# HELP bot_updates_total Updates handled\n"
+        "# TYPE bot_updates_total counter\n"
+        'bot_updates_total{handler="start"} 3\n'
+        'bot_updates_total{handler="say \\"hi\\"\\n"} 1\n'
+    )
+
+
+def test_gauge_without_labels_and_fractional_values():
+    registry = Registry()
+    gauge = registry.gauge("queue_depth", "Queued messages")
+    gauge.set(4)
+    gauge.dec(1.5)
+    assert registry.render().splitlines()[-1] == "queue_depth 2.5"
+
+
+def test_gauge_function_is_read_at_scrape_time():
+    registry = Registry()
+    values = {("a",): 1}
+    registry.gauge("shard_size", "Items per shard", ("shard",), function=lambda: values)
+    values[("b",)] = 2
+    assert registry.render().splitlines()[2:] == ['shard_size{shard="a"} 1', 'shard_size{shard="b"} 2']
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.7, 3):
+        latency.observe(value, route="x")
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{route="x",le="0.1"} 1',
+        'latency_seconds_bucket{route="x",le="1"} 3',
+        'latency_seconds_bucket{route="x",le="+Inf"} 4',
+        'latency_seconds_sum{route="x"} 4.25',
+        'latency_seconds_count{route="x"} 4',
+    ]
+
+
+def test_registering_a_name_twice_returns_the_first_metric():
+    registry = Registry()
+    first = registry.counter("events_total", "Events")
+    assert registry.counter("events_total", "Events") is first
+
+
+def test_failing_metric_does_not_break_the_scrape():
+    registry = Registry()
+    registry.gauge("broken", "Broken", function=lambda: 1 / 0)
+    registry.counter("ok_total", "Ok").inc()
+    text = registry.render()
+    assert "# broken failed: division by zero" in text
+    assert "ok_total 1" in text
@@ -0,0 +1,64 @@
+import json
+import pytest
+from bot.utils.partial_json import parse_partial_json
+
+COMPLETE = json.dumps({
+    "is_correct": False,
+    "correction": 'She said "hi" \\ left\nearly',
+    "feedback": "Use the past tense – “went”, not “go” 😀",
+    "example": None,
+    "done": True,
+}, ensure_ascii=False)
+
+
+def grows(before: dict, after: dict) -> bool:
+    for key, value in before.items():
+        if key not in after:
+            return False
+        if isinstance(value, str) and isinstance(after[key], str):
+            if not after[key].startswith(value):
+                return False
+        elif after[key] != value:
+            return False
+    return True
+
+
+def test_complete_object():
+    assert parse_partial_json(COMPLETE) == json.loads(COMPLETE)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", {}),
+    ("Sure! ", {}),
+    ('{"correction": "She ', {"correction": "She "}),
+    ('{"is_correct": tr', {}),
+    ('{"is_correct": true, "feed', {"is_correct": True}),
+    ('{"is_correct": true, "feedback"', {"is_correct": True}),
+    ('{"is_correct": true, "feedback":', {"is_correct": True}),
+    ('{"feedback": "a\\', {"feedback": "a"}),
+    ('{"feedback": "a\\u00', {"feedback": "a"}),
+    ('{"feedback": "a\\u00e9', {"feedback": "aé"}),
+    ('{"feedback": "a\\ud83d', {"feedback": "a"}),
+    ('{"feedback": "a\\ud83d\\ude00', {"feedback": "a😀"}),
+])
+def test_prefixes(text, expected):
+    assert parse_partial_json(text) == expected
+
+
+def test_leading_text_before_the_object_is_ignored():
+    assert parse_partial_json('```json\n{"example": null}') == {"example": None}
+
+
+def test_stops_at_nested_or_numeric_values():
+    assert parse_partial_json('{"a": "x", "score": 7, "b": "y"}') == {"a": "x"}
+    assert parse_partial_json('{"a": "x", "tags": ["p"], "b": "y"}') == {"a": "x"}
+
+
+@pytest.mark.parametrize("text", [COMPLETE, json.dumps(json.loads(COMPLETE))])
+def test_result_only_grows_as_text_arrives(text):
+    previous = {}
+    for end in range(len(text) + 1):
+        current = parse_partial_json(text[:end])
+        assert grows(previous, current), text[:end]
+        previous = current
+    assert previous == json.loads(text)
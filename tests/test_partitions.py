@@ -0,0 +1,53 @@
+import asyncio
+from datetime import date
+from bot.services.partitions import HISTORY, PracticePartitionMaintenance, add_months, partition_name
+
+
+def test_add_months_and_partition_name():
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert partition_name(date(2024, 3, 1)) == "practice_sessions_p2024_03"
+
+
+def run_maintenance(partitions, history_end, archive_mode="file", today=date(2024, 6, 15)):
+    maintenance = PracticePartitionMaintenance(months_ahead=1, retention_months=2, archive_mode=archive_mode)
+    archived = []
+
+    async def create_partitions(today):
+        return []
+
+    async def list_partitions():
+        return partitions
+
+    async def newest_history_month():
+        return history_end
+
+    async def archive_partition(name, attached):
+        archived.append(name)
+        return True
+
+    maintenance.create_partitions = create_partitions
+    maintenance.list_partitions = list_partitions
+    maintenance._history_end = newest_history_month
+    maintenance.archive_partition = archive_partition
+    asyncio.run(maintenance.run(today))
+    return archived
+
+
+def test_only_partitions_past_retention_are_archived():
+    partitions = [(partition_name(date(2024, month, 1)), True) for month in range(1, 8)]
+    assert run_maintenance(partitions, date.min) == [
+        "practice_sessions_p2024_01", "practice_sessions_p2024_02", "practice_sessions_p2024_03",
+    ]
+
+
+def test_history_partition_is_archived_once_its_newest_row_expires():
+    partitions = [(HISTORY, True)]
+    assert run_maintenance(partitions, history_end=date(2024, 5, 1)) == []
+    assert run_maintenance(partitions, history_end=date(2024, 4, 1)) == [HISTORY]
+
+
+def test_detach_mode_leaves_detached_tables_alone():
+    partitions = [(HISTORY, False), ("practice_sessions_p2024_01", False)]
+    assert run_maintenance(partitions, date.min, archive_mode="detach") == []
+    assert run_maintenance(partitions, date.min, archive_mode="file") == [HISTORY, "practice_sessions_p2024_01"]
@@ -0,0 +1,20 @@
+from bot.handlers.practice import format_partial_feedback, format_result
+
+
+def test_correction_is_escaped_for_markdown():
+    text = format_result({"is_correct": False, "correction": "my_var is *so* `odd`", "feedback": "Fine."})
+    assert "my\\_var is \\*so\\* \\`odd\\`" in text
+    assert text.startswith("📝 *Suggestion:*")
+
+
+def test_correct_result_keeps_feedback():
+    assert format_result({"is_correct": True, "correction": "x", "feedback": "Well done."}) == (
+        "✅ *Correct!*\n\nWell done."
+    )
+
+
+def test_partial_feedback_is_plain_text():
+    assert format_partial_feedback({}) == "🤔 Checking your sentence..."
+    assert format_partial_feedback({"is_correct": False, "correction": "my_var", "explanation": "Use"}) == (
+        "📝 Suggestion:\n\nmy_var\n\nExplanation: Use"
+    )
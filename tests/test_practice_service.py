@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from bot.services import practice
+from bot.services.practice import PracticeService
+
+WORD = SimpleNamespace(id=3, word="apple", example_usage=None, repetitions=0, interval_days=0, ease=2.5,
+                       due_at=datetime(2024, 1, 1), last_practiced=None)
+
+
+class FakeSession:
+    def __init__(self):
+        self.added = []
+
+    def add(self, instance):
+        self.added.append(instance)
+
+
+class FakeWordRepository:
+    def __init__(self, db):
+        pass
+
+    async def get_word_by_id(self, word_id):
+        return WORD
+
+
+class FakeStatisticsRepository:
+    recorded = []
+
+    def __init__(self, db):
+        pass
+
+    async def get_daily_total(self, user_id, day):
+        return 0
+
+    async def record_sentence(self, user_id, is_correct, day):
+        self.recorded.append((user_id, is_correct))
+        return len(self.recorded)
+
+
+class FakeUnitOfWork:
+    async def release(self):
+        pass
+
+
+@pytest.fixture
+def service(monkeypatch):
+    db = FakeSession()
+    FakeStatisticsRepository.recorded = []
+    monkeypatch.setattr(practice, "AIService", lambda: SimpleNamespace(check_sentence=None))
+    monkeypatch.setattr(practice, "current_session", lambda: db)
+    monkeypatch.setattr(practice, "current_uow", FakeUnitOfWork)
+    monkeypatch.setattr(practice, "after_commit", lambda session, callback: callback())
+    monkeypatch.setattr(practice, "WordRepository", FakeWordRepository)
+    monkeypatch.setattr(practice, "StatisticsRepository", FakeStatisticsRepository)
+    service = PracticeService()
+    service.db = db
+    return service
+
+
+def use_ai_result(service, result):
+    async def check_sentence(word, sentence, **kwargs):
+        return result
+    service.ai_service.check_sentence = check_sentence
+
+
+def test_checked_sentence_is_recorded_and_counted(service):
+    use_ai_result(service, {"is_correct": True, "feedback": "Good.", "correction": "I like apples."})
+    result = asyncio.run(service.evaluate_sentence(1, WORD.id, "I like apples."))
+
+    assert result["is_correct"] is True
+    assert [type(instance).__name__ for instance in service.db.added] == ["PracticeSession", "SimpleNamespace"]
+    assert FakeStatisticsRepository.recorded == [(1, True)]
+    assert service._daily_counts.get((1, datetime.utcnow().date())) == 1
+
+
+def test_ai_error_is_not_recorded_or_counted(service):
+    error = {"is_correct": False, "feedback": "Service unavailable", "correction": "I like apples.", "error": True}
+    use_ai_result(service, error)
+    result = asyncio.run(service.evaluate_sentence(1, WORD.id, "I like apples."))
+
+    assert result is error
+    assert service.db.added == []
+    assert FakeStatisticsRepository.recorded == []
+    # Only the lookup from the limit check is cached; the failed attempt did not add to it
+    assert service._daily_counts.get((1, datetime.utcnow().date())) == 0
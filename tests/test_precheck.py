@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+import pytest
+from bot.services.precheck import (
+    SentencePrechecker,
+    check_characters,
+    check_contains_word,
+    check_length,
+    check_not_example,
+    contains_word,
+    inflections,
+)
+
+
+def word(text: str, example: str | None = None):
+    return SimpleNamespace(word=text, example_usage=example)
+
+
+@pytest.mark.parametrize("base, form", [
+    ("walk", "walked"),
+    ("walk", "walking"),
+    ("study", "studies"),
+    ("study", "studied"),
+    ("make", "making"),
+    ("stop", "stopped"),
+    ("lie", "lying"),
+    ("go", "went"),
+    ("child", "children"),
+])
+def test_inflections_cover_regular_and_irregular_forms(base, form):
+    assert form in inflections(base)
+
+
+@pytest.mark.parametrize("target, sentence", [
+    ("apple", "I ate two apples yesterday."),
+    ("Run", "She ran to the station."),
+    ("cost-efficient", "We need a cost-efficient solution."),
+    ("look after", "He looks after his little brother."),
+])
+def test_contains_word_accepts_inflected_use(target, sentence):
+    assert contains_word(target, sentence)
+
+
+@pytest.mark.parametrize("target, sentence", [
+    ("apple", "I ate a banana yesterday."),
+    ("look after", "He looks at his little brother."),
+])
+def test_contains_word_rejects_missing_word(target, sentence):
+    assert not contains_word(target, sentence)
+
+
+def test_length_rule():
+    assert check_length(word("apple"), "Apple") is not None
+    assert check_length(word("apple"), "An apple " * 60) is not None
+    assert check_length(word("apple"), "I like apples.") is None
+
+
+@pytest.mark.parametrize("sentence", [
+    "12345 !!! ???",
+    "Я люблю яблука дуже сильно",
+    "I loooooove apples",
+    "xkcdq brrrzt apple",
+])
+def test_character_rule_rejects_unreadable_text(sentence):
+    assert check_characters(word("apple"), sentence) is not None
+
+
+def test_character_rule_accepts_normal_sentence():
+    assert check_characters(word("apple"), "I bought three apples at the market.") is None
+
+
+def test_contains_word_feedback_escapes_markdown():
+    feedback = check_contains_word(word("snake_case"), "I like camels.")
+    assert "snake\\_case" in feedback
+    assert check_contains_word(word("snake_case"), "I write snake_case names.") is None
+
+
+def test_example_rule_ignores_case_and_punctuation():
+    practice = word("apple", example="An apple a day keeps the doctor away.")
+    assert check_not_example(practice, "an apple a day keeps the doctor away") is not None
+    assert check_not_example(practice, "An apple a day is plenty.") is None
+    assert check_not_example(word("apple"), "An apple a day.") is None
+
+
+def test_prechecker_returns_first_failing_rule():
+    prechecker = SentencePrechecker()
+    result = prechecker.check(word("apple"), "Hi")
+    assert result["prechecked"] is True
+    assert result["is_correct"] is False
+    assert result["correction"] == "Hi"
+    assert "too short" in result["feedback"]
+
+    assert prechecker.check(word("apple"), "I ate an apple for lunch.") is None
+
+
+def test_custom_rules_run_after_defaults():
+    prechecker = SentencePrechecker()
+    prechecker.add_rule(lambda practice, sentence: "No lunch talk." if "lunch" in sentence else None)
+    assert prechecker.check(word("apple"), "I ate an apple for lunch.")["feedback"] == "No lunch talk."
+    assert SentencePrechecker(rules=[]).check(word("apple"), "x") is None
@@ -0,0 +1,38 @@
+import json
+import pytest
+from bot.instrumentation import QueryStats
+from bot.profiler import SQLProfiler, statement_shape
+
+
+@pytest.mark.parametrize("statement, shape", [
+    ("SELECT * FROM words WHERE id = $1::INTEGER", "SELECT * FROM words WHERE id = ?"),
+    ("SELECT * FROM words WHERE user_id = %(user_id_1)s LIMIT %(param_1)s",
+     "SELECT * FROM words WHERE user_id = ? LIMIT ?"),
+    ("UPDATE users SET name = %s WHERE id = %s", "UPDATE users SET name = ? WHERE id = ?"),
+    ("SELECT id\n  FROM words\n\tWHERE id = $1 ", "SELECT id FROM words WHERE id = ?"),
+    ("SELECT * FROM words LIMIT 10", "SELECT * FROM words LIMIT 10"),
+])
+def test_statement_shape_folds_placeholders_and_whitespace(statement, shape):
+    assert statement_shape(statement) == shape
+
+
+def test_in_lists_of_any_length_share_a_shape():
+    short = "SELECT * FROM words WHERE id IN ($1::INTEGER, $2::INTEGER)"
+    long = "SELECT * FROM words WHERE id IN ($1::INTEGER, $2::INTEGER, $3::INTEGER, $4::INTEGER)"
+    assert statement_shape(short) == statement_shape(long) == "SELECT * FROM words WHERE id IN (?)"
+
+
+def test_finish_writes_profile_and_flags_repeats(tmp_path):
+    path = tmp_path / "profile.jsonl"
+    profiler = SQLProfiler(engine=None, repeat_threshold=3, path=str(path))
+    stats = QueryStats("practice", update_id=42, record=True)
+    stats.statements = [(f"SELECT * FROM words WHERE id = ${n}", 0.002) for n in range(3)]
+    stats.statements.append(("SELECT 1", 0.001))
+
+    profiler.finish(stats)
+
+    record = json.loads(path.read_text(encoding="utf-8"))
+    assert record["handler"] == "practice"
+    assert record["queries"] == 4
+    assert record["db_ms"] == pytest.approx(7.0)
+    assert record["repeated"] == [{"sql": "SELECT * FROM words WHERE id = ?", "count": 3}]
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from bot.utils import rate_limit
+from bot.utils.rate_limit import TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_starts_full_and_refills_at_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=4)
+    assert all(bucket.try_acquire() for _ in range(4))
+    assert not bucket.try_acquire()
+
+    clock[0] += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=3)
+    bucket.try_acquire(3)
+    clock[0] += 60
+    assert bucket.available == 3
+
+
+def test_delay_reports_time_until_tokens(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket.delay() == 0
+    bucket.try_acquire(2)
+    assert bucket.delay() == pytest.approx(0.5)
+    assert bucket.delay(2) == pytest.approx(1.0)
+
+
+def test_requests_larger_than_capacity_take_the_whole_bucket(clock):
+    bucket = TokenBucket(rate=1, capacity=5)
+    assert bucket.try_acquire(50)
+    assert bucket.available == 0
+
+
+def test_adjust_can_leave_debt(clock):
+    bucket = TokenBucket(rate=1, capacity=10)
+    bucket.try_acquire(10)
+    bucket.adjust(-5)
+    assert bucket.available == -5
+    assert bucket.delay() == pytest.approx(6)
+
+    bucket.adjust(100)
+    assert bucket.available == 10
+
+
+def test_pause_blocks_for_roughly_the_given_time(clock):
+    bucket = TokenBucket(rate=1, capacity=3)
+    bucket.pause(5)
+    assert not bucket.try_acquire()
+    assert bucket.delay() == pytest.approx(6)
+
+    clock[0] += 6
+    assert bucket.try_acquire()
+
+
+def test_acquire_waits_for_refill():
+    async def scenario():
+        bucket = TokenBucket(rate=100, capacity=1)
+        await bucket.acquire()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await bucket.acquire()
+        return loop.time() - start
+
+    assert asyncio.run(scenario()) >= 0.005
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from bot.services.spaced_repetition import MIN_EASE, RELEARN_DELAY, quality_from_result, schedule_review
+
+NOW = datetime(2024, 3, 1, 12, 0)
+
+
+def new_word(**columns):
+    defaults = {"repetitions": 0, "interval_days": 0, "ease": 2.5, "due_at": NOW, "last_practiced": None}
+    return SimpleNamespace(**{**defaults, **columns})
+
+
+def test_quality_from_result():
+    assert quality_from_result({"is_correct": True}) == 4
+    assert quality_from_result({"is_correct": False}) == 2
+    assert quality_from_result({}) == 2
+
+
+def test_first_correct_answers_follow_sm2_intervals():
+    word = new_word()
+    schedule_review(word, 4, NOW)
+    assert (word.repetitions, word.interval_days) == (1, 1)
+    assert word.due_at == NOW + timedelta(days=1)
+
+    schedule_review(word, 4, NOW)
+    assert (word.repetitions, word.interval_days) == (2, 6)
+    assert word.due_at == NOW + timedelta(days=6)
+    assert word.last_practiced == NOW
+
+
+def test_later_intervals_grow_by_ease():
+    word = new_word(repetitions=2, interval_days=6, ease=2.5)
+    schedule_review(word, 4, NOW)
+    assert word.repetitions == 3
+    assert word.interval_days == pytest.approx(15)
+    assert word.due_at == NOW + timedelta(days=15)
+
+
+def test_quality_changes_ease():
+    word = new_word(ease=2.5)
+    schedule_review(word, 5, NOW)
+    assert word.ease == pytest.approx(2.6)
+
+    word = new_word(ease=2.5)
+    schedule_review(word, 4, NOW)
+    assert word.ease == pytest.approx(2.5)
+
+    word = new_word(ease=2.5)
+    schedule_review(word, 2, NOW)
+    assert word.ease == pytest.approx(2.18)
+
+
+def test_failed_answer_resets_and_relearns_soon():
+    word = new_word(repetitions=5, interval_days=40, ease=2.5)
+    schedule_review(word, 2, NOW)
+    assert (word.repetitions, word.interval_days) == (0, 0)
+    assert word.due_at == NOW + RELEARN_DELAY
+
+
+def test_ease_never_drops_below_minimum():
+    word = new_word(ease=MIN_EASE)
+    for _ in range(5):
+        schedule_review(word, 0, NOW)
+    assert word.ease == MIN_EASE
+
+
+def test_missing_columns_use_defaults():
+    word = new_word(repetitions=None, interval_days=None, ease=None)
+    schedule_review(word, 4, NOW)
+    assert (word.repetitions, word.interval_days) == (1, 1)
+    assert word.ease == pytest.approx(2.5)
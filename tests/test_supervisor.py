@@ -0,0 +1,131 @@
+import asyncio
+import queue
+import pytest
+from bot.supervisor import ShardSupervisor, chat_key, jump_hash, shard_for
+
+
+@pytest.mark.parametrize("data, key", [
+    ({"update_id": 1, "message": {"chat": {"id": -100}, "from": {"id": 5}}}, -100),
+    ({"update_id": 2, "edited_message": {"chat": {"id": 7}}}, 7),
+    ({"update_id": 3, "callback_query": {"from": {"id": 5}, "message": {"chat": {"id": 42}}}}, 42),
+    ({"update_id": 4, "callback_query": {"from": {"id": 5}, "inline_message_id": "x"}}, 5),
+    ({"update_id": 5, "inline_query": {"from": {"id": 9}}}, 9),
+    ({"update_id": 6, "poll_answer": {"user": {"id": 11}}}, 11),
+    ({"update_id": 7, "poll": {"id": "p"}}, 7),
+])
+def test_chat_key(data, key):
+    assert chat_key(data) == key
+
+
+def test_jump_hash_stays_in_range_and_is_stable():
+    for key in (-100123, 0, 1, 2 ** 40, 987654321):
+        assert 0 <= jump_hash(key, 7) < 7
+        assert jump_hash(key, 7) == jump_hash(key, 7)
+    assert all(jump_hash(key, 1) == 0 for key in range(100))
+
+
+def test_jump_hash_spreads_keys_evenly():
+    counts = [0] * 4
+    for key in range(10000):
+        counts[jump_hash(key, 4)] += 1
+    assert all(2200 < count < 2800 for count in counts)
+
+
+def test_jump_hash_growing_moves_only_keys_to_the_new_bucket():
+    moved = 0
+    for key in range(10000):
+        before, after = jump_hash(key, 4), jump_hash(key, 5)
+        if before != after:
+            assert after == 4
+            moved += 1
+    assert 1600 < moved < 2400
+
+
+def test_updates_of_one_chat_go_to_one_shard():
+    updates = [{"update_id": n, "message": {"chat": {"id": 12345}}} for n in range(20)]
+    assert len({shard_for(data, 8) for data in updates}) == 1
+
+
+class FakeProcess:
+    exitcode = 1
+
+    def __init__(self, alive: bool):
+        self.alive = alive
+        self.terminated = False
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def terminate(self) -> None:
+        self.terminated = True
+        self.alive = False
+
+    def join(self, timeout=None) -> None:
+        pass
+
+
+def test_drain_terminates_worker_whose_queue_stays_full():
+    supervisor = ShardSupervisor(workers=2, queue_size=1, drain_timeout=0.2)
+    supervisor.queues[1].put("update")
+    supervisor.processes = [FakeProcess(alive=False), FakeProcess(alive=True)]
+
+    asyncio.run(asyncio.wait_for(supervisor._drain(), timeout=5))
+
+    assert supervisor.queues[0].get(timeout=1) is None
+    assert supervisor.processes[1].terminated
+    assert not supervisor.processes[0].terminated
+    with pytest.raises(queue.Empty):
+        supervisor.queues[0].get_nowait()
+
+
+class RestartingSupervisor(ShardSupervisor):
+    """Records restarts instead of spawning processes."""
+
+    def __init__(self, workers: int):
+        super().__init__(workers=workers, queue_size=1)
+        self.processes = [FakeProcess(alive=True) for _ in range(workers)]
+        self.started_at = []
+
+    def _start_worker(self, index: int) -> None:
+        self.processes[index] = FakeProcess(alive=True)
+        self._started[index] = self.now
+        self.started_at.append((index, self.now))
+
+    def check(self, now: float) -> None:
+        self.now = now
+        self._check_workers(now)
+
+
+def test_one_workers_backoff_does_not_delay_another():
+    supervisor = RestartingSupervisor(workers=2)
+    # Worker 0 has been crash-looping and dies again 10 s after its last start: 30 s backoff
+    supervisor.restarts[0] = 5
+    supervisor._started[0] = 90
+    supervisor.processes[0].alive = False
+    supervisor.check(100)
+    supervisor.processes[1].alive = False
+    supervisor.check(101)
+
+    supervisor.check(102)
+    assert supervisor.started_at == [(1, 102)]
+    supervisor.check(130)
+    assert supervisor.started_at == [(1, 102), (0, 130)]
+
+
+def test_backoff_grows_until_a_worker_stays_up():
+    supervisor = RestartingSupervisor(workers=1)
+    supervisor.check(0)
+    now = 10
+    for expected_delay in (1, 2, 4):
+        supervisor.processes[0].alive = False
+        supervisor.check(now)
+        supervisor.check(now + expected_delay - 0.5)
+        assert supervisor.processes[0].alive is False
+        supervisor.check(now + expected_delay)
+        assert supervisor.processes[0].alive is True
+        now += expected_delay + 5
+
+    # Up for more than a minute since its last start: the next crash restarts quickly again
+    supervisor.processes[0].alive = False
+    supervisor.check(now + 60)
+    assert supervisor.restarts[0] == 1
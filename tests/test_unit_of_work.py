@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import Column, Integer, create_engine, select, text
+from sqlalchemy.orm import Session, declarative_base
+from database.unit_of_work import after_commit
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_after_commit_runs_on_commit(session):
+    calls = []
+    session.execute(select(Item))
+    after_commit(session, lambda: calls.append("cached"))
+    assert calls == []
+
+    session.commit()
+    assert calls == ["cached"]
+
+    session.execute(select(Item))
+    session.commit()
+    assert calls == ["cached"]
+
+
+def test_after_commit_is_dropped_on_rollback(session):
+    calls = []
+    session.add(Item())
+    session.flush()
+    after_commit(session, lambda: calls.append("cached"))
+    session.rollback()
+
+    session.add(Item())
+    session.commit()
+    assert calls == []
+
+
+def test_after_commit_is_dropped_on_close(session):
+    calls = []
+    session.execute(select(Item))
+    after_commit(session, lambda: calls.append("cached"))
+    session.close()
+
+    session.execute(select(Item))
+    session.commit()
+    assert calls == []
+
+
+def test_failing_callback_does_not_break_commit(session):
+    calls = []
+    session.execute(select(Item))
+    after_commit(session, lambda: 1 / 0)
+    after_commit(session, lambda: calls.append("cached"))
+    session.commit()
+    assert calls == ["cached"]
+
+
+def test_writes_are_tracked_per_transaction(session):
+    session.execute(select(Item))
+    assert not session.info.get("written")
+
+    session.add(Item())
+    session.flush()
+    assert session.info.get("written")
+    session.commit()
+    assert not session.info.get("written")
+
+    session.execute(text("DELETE FROM items"))
+    assert session.info.get("written")
+    session.close()
+    assert not session.info.get("written")
@@ -0,0 +1,44 @@
+import asyncio
+from aiohttp.test_utils import TestClient, TestServer
+from bot.webhook import SECRET_HEADER, WebhookEndpoint
+
+
+def post(payloads, accept=lambda data: True, secret="s3cret", headers=None):
+    endpoint = WebhookEndpoint(accept, ready=lambda: True, stats=dict, path="/hook", secret=secret)
+    headers = {SECRET_HEADER: secret, **(headers or {})}
+
+    async def scenario():
+        async with TestClient(TestServer(endpoint.build_app())) as client:
+            statuses = []
+            for payload in payloads:
+                response = await client.post("/hook", data=payload, headers=headers)
+                statuses.append(response.status)
+            return statuses
+
+    return asyncio.run(scenario()), endpoint
+
+
+def test_accepts_update_objects():
+    accepted = []
+    statuses, endpoint = post(['{"update_id": 1}'], accept=lambda data: accepted.append(data) or True)
+    assert statuses == [200]
+    assert accepted == [{"update_id": 1}]
+    assert endpoint.received == 1
+
+
+def test_rejects_malformed_and_non_object_json():
+    statuses, endpoint = post(["not json", "[1, 2]", "42", "null", '"update"'])
+    assert statuses == [400] * 5
+    assert endpoint.rejected == 5
+    assert endpoint.received == 0
+
+
+def test_rejects_wrong_secret():
+    statuses, endpoint = post(['{"update_id": 1}'], headers={SECRET_HEADER: "wrong"})
+    assert statuses == [403]
+
+
+def test_full_queue_asks_telegram_to_retry():
+    statuses, endpoint = post(['{"update_id": 1}'], accept=lambda data: False)
+    assert statuses == [503]
+    assert endpoint.dropped == 1
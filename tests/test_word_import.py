@@ -0,0 +1,89 @@
+import asyncio
+import io
+from bot.services.word_import import ImportResult, MAX_REPORTED_ERRORS, WordImportService, iter_rows, validate_row
+
+
+def rows(text: str, filename: str | None = None):
+    return list(iter_rows(io.StringIO(text), filename))
+
+
+def test_positional_csv_columns():
+    parsed = rows("apple,яблуко,fruit,I ate an apple\nrun,бігти\n")
+    assert parsed[0] == (1, {
+        "word": "apple", "translation": "яблуко", "synonym": "fruit", "example_usage": "I ate an apple",
+    }, None)
+    assert parsed[1][1] == {"word": "run", "translation": "бігти", "synonym": None, "example_usage": None}
+
+
+def test_header_maps_columns_by_name():
+    parsed = rows("Translation;English;Example\nяблуко;apple;An apple a day\nкіт;cat;A cat\n")
+    assert [line for line, _, _ in parsed] == [2, 3]
+    assert parsed[0][1] == {"translation": "яблуко", "word": "apple", "example_usage": "An apple a day"}
+
+
+def test_tab_separated_file():
+    parsed = rows("word\ttranslation\nlook after\tдоглядати\n", "words.tsv")
+    assert parsed == [(2, {"word": "look after", "translation": "доглядати"}, None)]
+
+
+def test_quoted_cells_may_contain_delimiters():
+    parsed = rows('apple,яблуко,,"An apple, a pear"\n')
+    assert parsed[0][1]["example_usage"] == "An apple, a pear"
+    assert parsed[0][1]["synonym"] is None
+
+
+def test_blank_lines_are_skipped_and_line_numbers_kept():
+    parsed = rows("apple,яблуко\n\n , \ncat,кіт\n")
+    assert [line for line, _, _ in parsed] == [1, 4]
+
+
+def test_invalid_rows_carry_an_error():
+    parsed = rows("apple,\n,кіт\n" + "x" * 101 + ",long\n")
+    assert [error for _, _, error in parsed] == [
+        "missing translation", "missing word", "word longer than 100 characters",
+    ]
+
+
+def test_validate_row_accepts_complete_row():
+    assert validate_row({"word": "apple", "translation": "яблуко", "synonym": None}) is None
+
+
+def test_import_result_caps_reported_errors():
+    result = ImportResult()
+    for line in range(MAX_REPORTED_ERRORS + 3):
+        result.add_error(line, "missing word")
+    assert result.invalid == MAX_REPORTED_ERRORS + 3
+    assert len(result.errors) == MAX_REPORTED_ERRORS
+
+
+class FakeWordRepository:
+    def __init__(self, existing=()):
+        self.words = {word.lower() for word in existing}
+        self.batches = []
+
+    async def add_new_words(self, user_id, rows):
+        self.batches.append([row["word"] for row in rows])
+        new = [row["word"].lower() for row in rows if row["word"].lower() not in self.words]
+        self.words.update(new)
+        return len(new)
+
+
+def run_import(text: str, existing=(), **options):
+    service = WordImportService(db=None, **options)
+    service.word_repo = FakeWordRepository(existing)
+    return asyncio.run(service.import_words(1, io.StringIO(text))), service.word_repo
+
+
+def test_import_counts_duplicates_within_and_across_batches():
+    text = "apple,a\nApple,a\ncat,b\ndog,c\nCAT,b\nemu,d\n,x\n"
+    result, repo = run_import(text, existing=["dog"], batch_size=2)
+    assert result.imported == 3
+    assert result.duplicates == 3
+    assert result.invalid == 1
+    assert repo.batches == [["apple", "cat"], ["dog", "CAT"], ["emu"]]
+
+
+def test_import_stops_at_max_rows():
+    result, _ = run_import("a,1\nb,2\nc,3\n", max_rows=2)
+    assert result.truncated
+    assert result.imported == 2
@@ -0,0 +1,33 @@
+import asyncio
+import pytest
+from telegram.error import BadRequest
+from bot.handlers.word_pager import WordPager
+
+
+class FakeQuery:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.edits = []
+
+    async def edit_message_text(self, text, **kwargs):
+        if self.error is not None:
+            raise self.error
+        self.edits.append(text)
+
+
+def test_edit_updates_the_message():
+    query = FakeQuery()
+    asyncio.run(WordPager._edit(query, "page 2", parse_mode="Markdown"))
+    assert query.edits == ["page 2"]
+
+
+def test_unchanged_page_is_not_an_error():
+    query = FakeQuery(BadRequest("Message is not modified: specified new message content and reply markup "
+                                 "are exactly the same as a current content and reply markup of the message"))
+    asyncio.run(WordPager._edit(query, "page 1"))
+
+
+def test_other_bad_requests_propagate():
+    query = FakeQuery(BadRequest("Can't parse entities"))
+    with pytest.raises(BadRequest):
+        asyncio.run(WordPager._edit(query, "page 1"))